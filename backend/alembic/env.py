@@ -16,7 +16,9 @@ from app.core.config import settings  # noqa: E402
 import app.models  # noqa: F401,E402 - ensure model metadata is loaded
 
 config = context.config
-fileConfig(config.config_file_name)
+# The app runs migrations in-process at boot; keep its logging configuration then
+if config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
 
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
@@ -45,6 +47,11 @@ def do_run_migrations(connection):
 
 def run_migrations_online():
     """Run migrations in 'online' mode."""
+    connection = config.attributes.get("connection")
+    if connection is not None:  # in-process upgrade on the app's own engine
+        do_run_migrations(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",
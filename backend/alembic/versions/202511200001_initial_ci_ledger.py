@@ -2,6 +2,11 @@
 from alembic import op
 import sqlalchemy as sa
 
+revision = "202511200001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
 
 def upgrade():
     # Users and auth
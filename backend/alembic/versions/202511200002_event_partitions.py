@@ -0,0 +1,149 @@
+"""partition events and link tables by month
+
+Adds ``partition_month`` (YYYYMM of the event timestamp) to ``events`` and its
+link tables and backfills it. On PostgreSQL the four tables are then rebuilt
+as native ``PARTITION BY RANGE (partition_month)`` tables with one partition
+per existing month plus a default partition; other backends keep plain tables
+and prune on the ``partition_month`` indexes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202511200002"
+down_revision = "202511200001"
+branch_labels = None
+depends_on = None
+
+LINK_TABLES = {
+    # table: (other foreign key column, referenced table, unique constraint)
+    "event_agents": ("agent_id", "agents", "uq_event_agent"),
+    "event_tools": ("tool_id", "tools", "uq_event_tool"),
+    "event_tags": ("tag_id", "tags", "uq_event_tag"),
+}
+
+
+def _month_expr(dialect: str, column: str) -> str:
+    if dialect == "sqlite":
+        return f"CAST(strftime('%Y%m', {column}) AS INTEGER)"
+    return f"CAST(EXTRACT(YEAR FROM {column}) * 100 + EXTRACT(MONTH FROM {column}) AS INTEGER)"
+
+
+def _next_month(key: int) -> int:
+    return key + 89 if key % 100 == 12 else key + 1
+
+
+def _partition_postgres(bind) -> None:
+    months = [row[0] for row in bind.execute(sa.text("SELECT DISTINCT partition_month FROM events"))]
+
+    def partition(table: str) -> None:
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        for month in months:
+            op.execute(
+                f"CREATE TABLE {table}_p{month} PARTITION OF {table} "
+                f"FOR VALUES FROM ({month}) TO ({_next_month(month)})"
+            )
+
+    # Move the old tables aside, freeing their index and constraint names
+    for table in ("events", *LINK_TABLES):
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+        op.execute(f"ALTER TABLE {table}_unpartitioned RENAME CONSTRAINT {table}_pkey TO {table}_unpartitioned_pkey")
+    for column in ("timestamp", "event_type", "severity", "source"):
+        op.execute(f"DROP INDEX ix_events_{column}")
+    for table, (column, _target, unique) in LINK_TABLES.items():
+        op.execute(f"ALTER TABLE {table}_unpartitioned DROP CONSTRAINT {unique}")
+        op.execute(f"DROP INDEX ix_{table}_event")
+        op.execute(f"DROP INDEX ix_{table}_{column[:-3]}")
+
+    op.execute(
+        "CREATE TABLE events (LIKE events_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (partition_month)"
+    )
+    op.execute("ALTER TABLE events ADD PRIMARY KEY (id, partition_month)")
+    op.execute("ALTER SEQUENCE events_id_seq OWNED BY events.id")
+    partition("events")
+    op.execute("INSERT INTO events SELECT * FROM events_unpartitioned")
+    for column in ("timestamp", "event_type", "severity", "source", "partition_month"):
+        op.create_index(f"ix_events_{column}", "events", [column])
+    op.create_index("ix_events_partition_month_timestamp", "events", ["partition_month", "timestamp"])
+
+    for table, (column, target, unique) in LINK_TABLES.items():
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {table}_unpartitioned INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (partition_month)"
+        )
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, partition_month)")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        op.execute(
+            f"ALTER TABLE {table} ADD FOREIGN KEY (event_id, partition_month) "
+            "REFERENCES events (id, partition_month) ON DELETE CASCADE ON UPDATE CASCADE"
+        )
+        op.execute(f"ALTER TABLE {table} ADD FOREIGN KEY ({column}) REFERENCES {target} (id) ON DELETE CASCADE")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {unique} UNIQUE (event_id, {column}, partition_month)")
+        partition(table)
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_unpartitioned")
+        op.create_index(f"ix_{table}_event", table, ["event_id"])
+        op.create_index(f"ix_{table}_{column[:-3]}", table, [column])
+        op.create_index(f"ix_{table}_partition_month", table, ["partition_month"])
+
+    for table in (*LINK_TABLES, "events"):
+        op.execute(f"DROP TABLE {table}_unpartitioned")
+
+
+def upgrade():
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+
+    for table in ("events", *LINK_TABLES):
+        op.add_column(table, sa.Column("partition_month", sa.Integer(), nullable=True))
+    op.execute(f"UPDATE events SET partition_month = {_month_expr(dialect, 'timestamp')}")
+    for table in LINK_TABLES:
+        op.execute(
+            f"UPDATE {table} SET partition_month = "
+            f"(SELECT events.partition_month FROM events WHERE events.id = {table}.event_id)"
+        )
+
+    if dialect == "postgresql":
+        for table in ("events", *LINK_TABLES):
+            op.alter_column(table, "partition_month", nullable=False)
+        _partition_postgres(bind)
+        return
+
+    op.create_index("ix_events_partition_month", "events", ["partition_month"])
+    op.create_index("ix_events_partition_month_timestamp", "events", ["partition_month", "timestamp"])
+    for table in LINK_TABLES:
+        op.create_index(f"ix_{table}_partition_month", table, ["partition_month"])
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # Collapse the partitioned tables back into plain ones
+        for table in (*LINK_TABLES, "events"):
+            op.execute(f"CREATE TABLE {table}_plain AS SELECT * FROM {table}")
+            op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+            op.execute(f"DROP TABLE {table}")
+            op.execute(f"ALTER TABLE {table}_plain RENAME TO {table}")
+            op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+            op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        for column in ("timestamp", "event_type", "severity", "source"):
+            op.create_index(f"ix_events_{column}", "events", [column])
+        for table, (column, target, unique) in LINK_TABLES.items():
+            op.create_foreign_key(None, table, "events", ["event_id"], ["id"], ondelete="CASCADE")
+            op.create_foreign_key(None, table, target, [column], ["id"], ondelete="CASCADE")
+            op.create_unique_constraint(unique, table, ["event_id", column])
+            op.create_index(f"ix_{table}_event", table, ["event_id"])
+            op.create_index(f"ix_{table}_{column[:-3]}", table, [column])
+        for table in ("events", *LINK_TABLES):
+            op.drop_column(table, "partition_month")
+        return
+
+    op.drop_index("ix_events_partition_month_timestamp", table_name="events")
+    op.drop_index("ix_events_partition_month", table_name="events")
+    for table in LINK_TABLES:
+        op.drop_index(f"ix_{table}_partition_month", table_name=table)
+    with op.batch_alter_table("events") as batch:
+        batch.drop_column("partition_month")
+    for table in LINK_TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("partition_month")
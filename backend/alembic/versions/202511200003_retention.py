@@ -0,0 +1,37 @@
+"""retention policies and event archive manifest"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202511200003"
+down_revision = "202511200002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "retention_policies",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("event_type", sa.String(length=50), nullable=True),
+        sa.Column("severity", sa.String(length=50), nullable=True),
+        sa.Column("source", sa.String(length=50), nullable=True),
+        sa.Column("keep_days", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+
+    op.create_table(
+        "event_archives",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("path", sa.String(length=1024), nullable=False),
+        sa.Column("start", sa.DateTime(), nullable=False),
+        sa.Column("end", sa.DateTime(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_event_archives_start", "event_archives", ["start"])
+    op.create_index("ix_event_archives_end", "event_archives", ["end"])
+
+
+def downgrade():
+    op.drop_table("event_archives")
+    op.drop_table("retention_policies")
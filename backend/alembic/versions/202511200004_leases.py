@@ -0,0 +1,22 @@
+"""leader election leases"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202511200004"
+down_revision = "202511200003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "leases",
+        sa.Column("name", sa.String(length=100), primary_key=True),
+        sa.Column("holder", sa.String(length=255), nullable=False),
+        sa.Column("acquired_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("leases")
@@ -0,0 +1,45 @@
+"""agent_tool_state: current tool version per agent, backfilled from event history"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202511200005"
+down_revision = "202511200004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "agent_tool_state",
+        sa.Column("agent_id", sa.Integer(), sa.ForeignKey("agents.id"), primary_key=True),
+        sa.Column("tool_id", sa.Integer(), sa.ForeignKey("tools.id"), primary_key=True),
+        sa.Column("version", sa.String(length=100), nullable=False),
+        sa.Column("since", sa.DateTime(), nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_agent_tool_state_tool_id", "agent_tool_state", ["tool_id"])
+    op.create_index("ix_agent_tool_state_event_id", "agent_tool_state", ["event_id"])
+
+    # Latest versioned link per (agent, tool); ties on timestamp go to the newer event/link
+    op.execute(
+        """
+        INSERT INTO agent_tool_state (agent_id, tool_id, version, since, event_id)
+        SELECT agent_id, tool_id, version, since, event_id FROM (
+            SELECT ea.agent_id AS agent_id, et.tool_id AS tool_id, et.version_to AS version,
+                   e.timestamp AS since, e.id AS event_id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY ea.agent_id, et.tool_id
+                       ORDER BY e.timestamp DESC, e.id DESC, et.id DESC
+                   ) AS rank
+            FROM event_agents ea
+            JOIN event_tools et ON et.event_id = ea.event_id
+            JOIN events e ON e.id = ea.event_id
+            WHERE et.version_to IS NOT NULL
+        ) ranked
+        WHERE rank = 1
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("agent_tool_state")
@@ -0,0 +1,26 @@
+"""tool_state_checkpoints: periodic fleet snapshots for point-in-time tool state"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202511200006"
+down_revision = "202511200005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tool_state_checkpoints",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("taken_at", sa.DateTime(), nullable=False),
+        sa.Column("agent_id", sa.Integer(), nullable=False),
+        sa.Column("tool_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.String(length=100), nullable=False),
+        sa.Column("since", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_tool_state_checkpoints_taken_at", "tool_state_checkpoints", ["taken_at"])
+    op.create_index("ix_tool_state_checkpoints_agent_id", "tool_state_checkpoints", ["agent_id"])
+
+
+def downgrade():
+    op.drop_table("tool_state_checkpoints")
@@ -0,0 +1,71 @@
+"""outages: job outage intervals paired from build results, backfilled from webhook events"""
+from datetime import datetime
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202511200007"
+down_revision = "202511200006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    outages = op.create_table(
+        "outages",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_name", sa.String(length=255), nullable=False),
+        sa.Column("agent_id", sa.Integer(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("resolved_at", sa.DateTime(), nullable=True),
+        sa.Column("duration_seconds", sa.Float(), nullable=True),
+        sa.Column("failures", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("failure_event_id", sa.Integer(), nullable=False),
+        sa.Column("recovery_event_id", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_outages_job_name", "outages", ["job_name"])
+    op.create_index("ix_outages_agent_id", "outages", ["agent_id"])
+    op.create_index("ix_outages_started_at", "outages", ["started_at"])
+    op.create_index("ix_outages_failure_event_id", "outages", ["failure_event_id"])
+
+    # One pass over existing Jenkins events in time order, pairing like app.crud.outage.record_build
+    rows = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT e.id, e.timestamp, e.event_type, e.metadata,
+                   (SELECT MIN(ea.agent_id) FROM event_agents ea WHERE ea.event_id = e.id) AS agent_id
+            FROM events e
+            WHERE e.source = 'WEBHOOK' AND e.event_type IN ('OUTAGE', 'ROLLOUT')
+            ORDER BY e.timestamp, e.id
+            """
+        )
+    )
+    open_by_job, intervals = {}, []
+    for event_id, timestamp, event_type, details, agent_id in rows:
+        if isinstance(timestamp, str):  # SQLite returns text from a raw query
+            timestamp = datetime.fromisoformat(timestamp)
+        try:
+            job_name = json.loads(details or "{}")["jenkins"]["job_name"]
+        except (ValueError, KeyError, TypeError):
+            continue
+        current = open_by_job.get(job_name)
+        if event_type == "OUTAGE":
+            if current is None:
+                current = open_by_job[job_name] = {
+                    "job_name": job_name, "agent_id": agent_id, "started_at": timestamp, "resolved_at": None,
+                    "duration_seconds": None, "failures": 0, "failure_event_id": event_id, "recovery_event_id": None,
+                }
+                intervals.append(current)
+            current["failures"] += 1
+        elif current is not None:
+            current["resolved_at"] = timestamp
+            current["duration_seconds"] = (timestamp - current["started_at"]).total_seconds()
+            current["recovery_event_id"] = event_id
+            open_by_job.pop(job_name)
+    if intervals:
+        op.bulk_insert(outages, intervals)
+
+
+def downgrade():
+    op.drop_table("outages")
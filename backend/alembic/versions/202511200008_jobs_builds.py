@@ -0,0 +1,93 @@
+"""jobs and builds: CI entities extracted from webhook payloads, backfilled from events.metadata"""
+from datetime import datetime
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202511200008"
+down_revision = "202511200007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    jobs = op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_jobs_name", "jobs", ["name"], unique=True)
+    builds = op.create_table(
+        "builds",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id"), nullable=False),
+        sa.Column("number", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("url", sa.String(length=1000), nullable=True),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("job_id", "number", name="uq_builds_job_id_number"),
+    )
+    op.create_index("ix_builds_job_id", "builds", ["job_id"])
+    op.create_index("ix_builds_timestamp", "builds", ["timestamp"])
+    if op.get_context().dialect.name == "sqlite":
+        # SQLite cannot add a foreign key column in place: rebuild the table (batch mode wants a named key)
+        with op.batch_alter_table("events", recreate="always") as batch:
+            batch.add_column(sa.Column(
+                "build_id", sa.Integer(), sa.ForeignKey("builds.id", name="fk_events_build_id"), nullable=True
+            ))
+    else:
+        op.add_column("events", sa.Column("build_id", sa.Integer(), sa.ForeignKey("builds.id"), nullable=True))
+    op.create_index("ix_events_build_id", "events", ["build_id"])
+
+    # Parse the Jenkins payload kept in events.metadata; the latest report per build sets its status
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text("SELECT id, timestamp, metadata FROM events WHERE source = 'WEBHOOK' ORDER BY timestamp, id")
+    )
+    found = {}
+    for event_id, timestamp, details in rows:
+        try:
+            jenkins = json.loads(details or "{}")["jenkins"]
+            key = (jenkins["job_name"], int(jenkins["build_number"]))
+        except (ValueError, KeyError, TypeError):
+            continue
+        if isinstance(timestamp, str):  # SQLite returns text from a raw query
+            timestamp = datetime.fromisoformat(timestamp)
+        build = found.setdefault(key, {"event_ids": []})
+        build.update(status=str(jenkins.get("status") or "").upper(), url=jenkins.get("full_url"), timestamp=timestamp)
+        build["event_ids"].append(event_id)
+    if not found:
+        return
+
+    now = datetime.utcnow()
+    op.bulk_insert(jobs, [{"name": name, "created_at": now} for name in sorted({name for name, _ in found})])
+    job_ids = dict(bind.execute(sa.text("SELECT name, id FROM jobs")).all())
+    op.bulk_insert(
+        builds,
+        [
+            {"job_id": job_ids[name], "number": number, "status": build["status"], "url": build["url"],
+             "timestamp": build["timestamp"]}
+            for (name, number), build in found.items()
+        ],
+    )
+    build_ids = {(job_id, number): build_id for build_id, job_id, number in bind.execute(
+        sa.text("SELECT id, job_id, number FROM builds")
+    ).all()}
+    bind.execute(
+        sa.text("UPDATE events SET build_id = :build_id WHERE id = :event_id"),
+        [
+            {"build_id": build_ids[(job_ids[name], number)], "event_id": event_id}
+            for (name, number), build in found.items()
+            for event_id in build["event_ids"]
+        ],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_events_build_id", table_name="events")
+    with op.batch_alter_table("events") as batch:
+        batch.drop_column("build_id")
+    op.drop_table("builds")
+    op.drop_table("jobs")
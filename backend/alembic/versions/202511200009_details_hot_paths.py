@@ -0,0 +1,31 @@
+"""details_hot_paths: admin-declared event details paths with managed expression indexes"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202511200009"
+down_revision = "202511200008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "details_hot_paths",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("path", sa.String(length=40), nullable=False),
+        sa.Column("value_type", sa.String(length=10), nullable=False, server_default="string"),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_details_hot_paths_path", "details_hot_paths", ["path"], unique=True)
+
+
+def downgrade():
+    # The per-path indexes on events (ix_events_details_*) are created by the app; drop them with it
+    bind = op.get_bind()
+    for (path,) in bind.execute(sa.text("SELECT path FROM details_hot_paths")).all():
+        # Named from a digest of the path (app.core.details_paths.index_name), or by earlier releases from the path
+        op.execute(f"DROP INDEX IF EXISTS ix_events_details_{hashlib.sha1(path.encode()).hexdigest()[:16]}")
+        op.execute(f"DROP INDEX IF EXISTS ix_events_details_{path.replace('.', '__')}")
+    op.drop_table("details_hot_paths")
@@ -0,0 +1,39 @@
+"""churn_counters: per-day event counts per agent and tool, backfilled from event history"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202511200010"
+down_revision = "202511200009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "churn_counters",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("kind", sa.String(length=10), primary_key=True),
+        sa.Column("entity_id", sa.Integer(), primary_key=True),
+        sa.Column("event_type", sa.String(length=50), primary_key=True),
+        sa.Column("severity", sa.String(length=50), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_churn_counters_entity_id", "churn_counters", ["entity_id"])
+
+    # One row per distinct (event, entity) link, counted per day/type/severity
+    for kind, table, column in (("agent", "event_agents", "agent_id"), ("tool", "event_tools", "tool_id")):
+        op.execute(
+            f"""
+            INSERT INTO churn_counters (day, kind, entity_id, event_type, severity, count)
+            SELECT CAST(timestamp AS DATE), '{kind}', entity_id, event_type, severity, COUNT(*)
+            FROM (
+                SELECT DISTINCT e.id, e.timestamp, e.event_type, e.severity, l.{column} AS entity_id
+                FROM events e JOIN {table} l ON l.event_id = e.id
+            ) links
+            GROUP BY CAST(timestamp AS DATE), entity_id, event_type, severity
+            """
+        )
+
+
+def downgrade():
+    op.drop_table("churn_counters")
@@ -0,0 +1,107 @@
+"""change_outcomes / change_failure_counters: incremental change failure rate, backfilled from event history"""
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+revision = "202511200011"
+down_revision = "202511200010"
+branch_labels = None
+depends_on = None
+
+
+def _timestamp(value):
+    return datetime.fromisoformat(value) if isinstance(value, str) else value  # SQLite returns text
+
+
+def upgrade():
+    outcomes_table = op.create_table(
+        "change_outcomes",
+        sa.Column("event_id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=10), primary_key=True),
+        sa.Column("entity_id", sa.Integer(), primary_key=True),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("failed_by", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_change_outcomes_entity_id", "change_outcomes", ["entity_id"])
+    op.create_index("ix_change_outcomes_failed_by", "change_outcomes", ["failed_by"])
+    counters_table = op.create_table(
+        "change_failure_counters",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("kind", sa.String(length=10), primary_key=True),
+        sa.Column("entity_id", sa.Integer(), primary_key=True),
+        sa.Column("changes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failures", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_change_failure_counters_entity_id", "change_failure_counters", ["entity_id"])
+
+    # Same pairing as app.crud.change_failure.rebuild: each change fails on the
+    # earliest outage on a shared agent within the window
+    bind = op.get_bind()
+    changes, outages_by_agent = {}, defaultdict(list)
+    rows = bind.execute(sa.text(
+        """
+        SELECT e.id, e.timestamp, e.event_type, ea.agent_id
+        FROM events e LEFT JOIN event_agents ea ON ea.event_id = e.id
+        WHERE e.event_type IN ('TOOL_UPDATE', 'ROLLOUT', 'PATCH', 'OUTAGE')
+        """
+    ))
+    for event_id, timestamp, event_type, agent_id in rows:
+        timestamp = _timestamp(timestamp)
+        if event_type == "OUTAGE":
+            if agent_id is not None:
+                outages_by_agent[agent_id].append((timestamp, event_id))
+            continue
+        agents = changes.setdefault(event_id, (timestamp, set()))[1]
+        if agent_id is not None:
+            agents.add(agent_id)
+    for outages in outages_by_agent.values():
+        outages.sort()
+    tools = defaultdict(set)
+    for event_id, tool_id in bind.execute(sa.text(
+        """
+        SELECT et.event_id, et.tool_id FROM event_tools et JOIN events e ON e.id = et.event_id
+        WHERE e.event_type IN ('TOOL_UPDATE', 'ROLLOUT', 'PATCH')
+        """
+    )):
+        tools[event_id].add(tool_id)
+    toolchains = defaultdict(set)
+    for tool_id, toolchain_id in bind.execute(sa.text("SELECT tool_id, toolchain_id FROM toolchain_tools")):
+        toolchains[tool_id].add(toolchain_id)
+
+    window = timedelta(hours=settings.CHANGE_FAILURE_WINDOW_HOURS)
+    outcomes, counters = [], {}
+    for event_id, (timestamp, agents) in changes.items():
+        candidates = []
+        for agent_id in agents:
+            outages = outages_by_agent.get(agent_id, [])
+            position = bisect_left(outages, (timestamp, -1))
+            if position < len(outages) and outages[position][0] - timestamp <= window:
+                candidates.append(outages[position])
+        failed_by = min(candidates)[1] if candidates else None
+        keys = {("all", 0)} | {("tool", tool_id) for tool_id in tools[event_id]}
+        keys |= {("toolchain", toolchain_id) for tool_id in tools[event_id] for toolchain_id in toolchains[tool_id]}
+        for kind, entity_id in keys:
+            outcomes.append({
+                "event_id": event_id, "kind": kind, "entity_id": entity_id,
+                "day": timestamp.date(), "failed_by": failed_by,
+            })
+            counter = counters.setdefault((timestamp.date(), kind, entity_id), [0, 0])
+            counter[0] += 1
+            counter[1] += int(failed_by is not None)
+    if outcomes:
+        op.bulk_insert(outcomes_table, outcomes)
+    if counters:
+        op.bulk_insert(counters_table, [
+            {"day": day, "kind": kind, "entity_id": entity_id, "changes": changes, "failures": failures}
+            for (day, kind, entity_id), (changes, failures) in counters.items()
+        ])
+
+
+def downgrade():
+    op.drop_table("change_failure_counters")
+    op.drop_table("change_outcomes")
@@ -1,12 +1,17 @@
+from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
 
-from app.core.database import get_session
+from app.core.database import get_read_session, get_session
 from app.core.deps import get_current_user, get_current_admin_user
 from app.crud import agent as crud_agent
+from app.crud import agent_tool_state as crud_tool_state
+from app.crud import tool_checkpoint as crud_checkpoint
 from app.models.agent import Agent, AgentCreate, AgentUpdate, AgentRead
+from app.models.agent_tool_state import AgentToolRead
+from app.models.tool_checkpoint import AgentStateRead
 
 router = APIRouter(prefix="/api/agents", tags=["agents"])
 
@@ -14,7 +19,7 @@ router = APIRouter(prefix="/api/agents", tags=["agents"])
 @router.get("", response_model=List[AgentRead])
 def list_agents(
     *,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user=Depends(get_current_admin_user),
     status: Optional[str] = Query(default=None),
     skip: int = Query(default=0, ge=0),
@@ -24,10 +29,22 @@ def list_agents(
     return agents
 
 
+@router.get("/state", response_model=List[AgentStateRead])
+def fleet_state(
+    *,
+    session: Session = Depends(get_read_session),
+    current_user=Depends(get_current_admin_user),
+    at: Optional[datetime] = Query(default=None, description="Moment to reconstruct (UTC, default now)"),
+    agent_id: Optional[List[int]] = Query(default=None, description="Limit to these agents"),
+):
+    """Tool versions on every agent (or the given agents) as of `at`."""
+    return crud_checkpoint.agent_states(session, at or datetime.utcnow(), agent_id)
+
+
 @router.get("/{agent_id}", response_model=AgentRead)
 def get_agent(
     *,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user=Depends(get_current_admin_user),
     agent_id: int,
 ):
@@ -37,6 +54,39 @@ def get_agent(
     return agent
 
 
+@router.get("/{agent_id}/tools", response_model=List[AgentToolRead])
+def list_agent_tools(
+    *,
+    session: Session = Depends(get_read_session),
+    current_user=Depends(get_current_admin_user),
+    agent_id: int,
+):
+    """Current version of each tool on the agent (latest event that set a version)."""
+    if not crud_agent.get_agent(session, agent_id):
+        raise HTTPException(status_code=404, detail="Agent not found")
+    return crud_tool_state.list_agent_tools(session, agent_id)
+
+
+@router.get("/{agent_id}/state", response_model=AgentStateRead)
+def agent_state(
+    *,
+    session: Session = Depends(get_read_session),
+    current_user=Depends(get_current_admin_user),
+    agent_id: int,
+    at: Optional[datetime] = Query(default=None, description="Moment to reconstruct (UTC, default now)"),
+):
+    """
+    Tool versions on the agent as of `at`.
+
+    Starts from the newest checkpoint at or before `at` and replays the tool
+    changes after it.
+    """
+    states = crud_checkpoint.agent_states(session, at or datetime.utcnow(), [agent_id])
+    if not states:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    return states[0]
+
+
 @router.post("", response_model=AgentRead, status_code=201)
 def create_agent(
     *,
@@ -0,0 +1,143 @@
+"""Read-only analytics over derived tables (no event history scans)."""
+from datetime import date, datetime, timedelta
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import get_read_session
+from app.core.deps import get_current_user
+from app.crud import change_failure as crud_change_failure
+from app.crud import churn as crud_churn
+from app.crud import heatmap as crud_heatmap
+from app.crud import outage as crud_outage
+from app.models.change_failure import ChangeFailureRate
+from app.models.churn import ChurnEntry
+from app.models.enums import EventSeverity, EventType
+from app.models.heatmap import Heatmap
+from app.models.outage import OutageStats
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+
+@router.get("/outages", response_model=List[OutageStats])
+def read_outage_stats(
+    *,
+    session: Session = Depends(get_read_session),
+    current_user=Depends(get_current_user),
+    group_by: Literal["job", "agent", "bucket"] = Query(default="job"),
+    bucket: Literal["day", "week", "month"] = Query(default="day"),
+    start: Optional[datetime] = Query(default=None),
+    end: Optional[datetime] = Query(default=None),
+    job: Optional[str] = Query(default=None, description="Jenkins job name"),
+    agent_id: Optional[int] = Query(default=None),
+):
+    """
+    MTTR, p50/p90 outage duration and failure counts from paired build results.
+
+    An outage runs from a job's first failing build to its next successful
+    one; outages are grouped by job, by the agent of the first failure, or by
+    the `bucket` their start falls in. Open outages count towards `outages`
+    and `failures` but not towards the duration figures.
+    """
+    return crud_outage.outage_stats(
+        session, group_by=group_by, bucket=bucket, start=start, end=end, job_name=job, agent_id=agent_id
+    )
+
+
+def _churn(session: Session, kind: str, start, end, event_type, severity, limit) -> List[ChurnEntry]:
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    return crud_churn.top_entities(session, kind, start, end, event_type=event_type, severity=severity, limit=limit)
+
+
+@router.get("/churn/tools", response_model=List[ChurnEntry])
+def read_tool_churn(
+    *,
+    session: Session = Depends(get_read_session),
+    current_user=Depends(get_current_user),
+    start: Optional[date] = Query(default=None, description="First day (default: 30 days up to `end`)"),
+    end: Optional[date] = Query(default=None, description="Last day, inclusive (default: today, UTC)"),
+    event_type: Optional[EventType] = Query(default=None),
+    severity: Optional[EventSeverity] = Query(default=None),
+    limit: int = Query(default=10, ge=1, le=100),
+):
+    """
+    Tools linked to the most events in the window, e.g. `event_type=tool_update` for the most-updated.
+
+    Served from per-day counters maintained on every event write.
+    """
+    return _churn(session, "tool", start, end, event_type, severity, limit)
+
+
+@router.get("/churn/agents", response_model=List[ChurnEntry])
+def read_agent_churn(
+    *,
+    session: Session = Depends(get_read_session),
+    current_user=Depends(get_current_user),
+    start: Optional[date] = Query(default=None, description="First day (default: 30 days up to `end`)"),
+    end: Optional[date] = Query(default=None, description="Last day, inclusive (default: today, UTC)"),
+    event_type: Optional[EventType] = Query(default=None),
+    severity: Optional[EventSeverity] = Query(default=None),
+    limit: int = Query(default=10, ge=1, le=100),
+):
+    """Agents touched by the most events in the window; same counters and filters as the tool leaderboard."""
+    return _churn(session, "agent", start, end, event_type, severity, limit)
+
+
+@router.get("/heatmap", response_model=Heatmap)
+def read_agent_heatmap(
+    *,
+    session: Session = Depends(get_read_session),
+    current_user=Depends(get_current_user),
+    start: Optional[date] = Query(default=None, description="First day (default: 90 days up to `end`)"),
+    end: Optional[date] = Query(default=None, description="Last day, inclusive (default: today, UTC)"),
+    agent_id: Optional[List[int]] = Query(default=None, description="Restrict rows to these agents"),
+    event_type: Optional[EventType] = Query(default=None),
+):
+    """
+    Agent x day activity matrix as parallel arrays: `agents` (rows), `days`
+    (columns) and a flat row-major `counts` vector.
+
+    Each event counts with the weight of its severity
+    (`HEATMAP_SEVERITY_WEIGHTS`); agents without events in the window are
+    left out.
+    """
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=89)
+    if start > end or (end - start).days >= settings.HEATMAP_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"start must not be after end, and the window is limited to {settings.HEATMAP_MAX_DAYS} days",
+        )
+    return crud_heatmap.agent_heatmap(
+        session, start, end, settings.heatmap_severity_weights, agent_ids=agent_id, event_type=event_type
+    )
+
+
+@router.get("/change-failure-rate", response_model=List[ChangeFailureRate])
+def read_change_failure_rate(
+    *,
+    session: Session = Depends(get_read_session),
+    current_user=Depends(get_current_user),
+    group_by: Literal["tool", "toolchain", "bucket"] = Query(default="toolchain"),
+    bucket: Literal["day", "week", "month"] = Query(default="week"),
+    start: Optional[date] = Query(default=None, description="First day (default: 90 days up to `end`)"),
+    end: Optional[date] = Query(default=None, description="Last day, inclusive (default: today, UTC)"),
+    tool_id: Optional[int] = Query(default=None),
+    toolchain_id: Optional[int] = Query(default=None),
+):
+    """
+    Share of changes (`tool_update`, `rollout`, `patch`) followed by an
+    outage on one of their agents within `CHANGE_FAILURE_WINDOW_HOURS`.
+
+    Grouped per tool, per toolchain, or per `bucket` of the change's day
+    (fleet-wide, or for `tool_id` / `toolchain_id`). Served from counters
+    updated as changes and outages are written.
+    """
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=89)
+    return crud_change_failure.failure_rates(
+        session, group_by=group_by, bucket=bucket, start=start, end=end, tool_id=tool_id, toolchain_id=toolchain_id
+    )
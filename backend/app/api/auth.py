@@ -2,14 +2,15 @@
 from datetime import timedelta
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.auth_cache import invalidate_principal
 from app.core.config import settings
-from app.core.database import get_session
-from app.core.security import create_access_token, validate_password_strength, get_password_hash
-from app.core.deps import get_current_user
-from app.core.ldap_service import ldap_service
+from app.core.database import get_async_session
+from app.core.security import create_access_token, validate_password_strength, get_password_hash_async
+from app.core.deps import get_current_user_async, get_current_admin_user_async
 from app.crud import user as crud_user
 from app.models.user import User, UserCreate, UserInDB
 from pydantic import BaseModel
@@ -17,6 +18,13 @@ from pydantic import BaseModel
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
 
+def _get_ldap_service():
+    """The LDAP service; ldap3 is only imported once LDAP is actually used."""
+    from app.core.ldap_service import get_ldap_service
+
+    return get_ldap_service()
+
+
 class Token(BaseModel):
     """Token response model."""
     access_token: str
@@ -26,7 +34,7 @@ class Token(BaseModel):
 @router.post("/register", response_model=UserInDB, status_code=status.HTTP_201_CREATED)
 async def register(
     user_create: UserCreate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Register a new user.
@@ -38,7 +46,7 @@ async def register(
     - **is_admin**: Whether user is admin (default: false)
     """
     # Check if user already exists
-    existing_user = crud_user.get_user_by_email(session, user_create.email)
+    existing_user = await crud_user.get_user_by_email_async(session, user_create.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -53,8 +61,9 @@ async def register(
             detail=error_message
         )
     
-    # Create user
-    user = crud_user.create_user(session, user_create)
+    # Create user (hashing runs on the bounded hashing executor)
+    hashed_password = await get_password_hash_async(user_create.password)
+    user = await crud_user.create_user_async(session, user_create, hashed_password=hashed_password)
     
     return user
 
@@ -62,7 +71,7 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Login with email and password to get an access token.
@@ -79,14 +88,16 @@ async def login(
     
     # Try LDAP authentication first (if enabled)
     if settings.LDAP_ENABLED:
-        success, ldap_user_info, error = ldap_service.authenticate(
-            form_data.username, 
+        # Directory round trips are blocking; keep them off the event loop
+        success, ldap_user_info, error = await run_in_threadpool(
+            _get_ldap_service().authenticate,
+            form_data.username,
             form_data.password
         )
         
         if success and ldap_user_info:
             # LDAP authentication successful - provision/update user in local DB
-            user = crud_user.get_user_by_email(session, ldap_user_info['email'])
+            user = await crud_user.get_user_by_email_async(session, ldap_user_info['email'])
             
             if not user:
                 # Create new user from LDAP info
@@ -98,19 +109,21 @@ async def login(
                     is_admin=ldap_user_info.get('is_admin', False),
                     is_ldap_user=True
                 )
-                user = crud_user.create_user(session, user_create)
+                hashed_password = await get_password_hash_async(form_data.password)
+                user = await crud_user.create_user_async(session, user_create, hashed_password=hashed_password)
             else:
                 # Update existing user with LDAP info
                 user.full_name = ldap_user_info['full_name'] or user.full_name
                 user.is_admin = ldap_user_info.get('is_admin', user.is_admin)
                 user.is_ldap_user = True
                 session.add(user)
-                session.commit()
-                session.refresh(user)
+                await session.commit()
+                await session.refresh(user)
+                invalidate_principal(user.id)
     
     # If LDAP auth failed or is disabled, try local authentication
     if not user:
-        user = crud_user.authenticate_user(session, form_data.username, form_data.password)
+        user = await crud_user.authenticate_user_async(session, form_data.username, form_data.password)
     
     if not user:
         raise HTTPException(
@@ -139,7 +152,7 @@ async def login(
 
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(current_user: User = Depends(get_current_user_async)):
     """
     Logout current user.
     
@@ -153,7 +166,7 @@ async def logout(current_user: User = Depends(get_current_user)):
 
 
 @router.get("/me", response_model=UserInDB)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user_async)):
     """
     Get current authenticated user information.
     
@@ -163,7 +176,7 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/test-token", response_model=UserInDB)
-async def test_token(current_user: User = Depends(get_current_user)):
+async def test_token(current_user: User = Depends(get_current_user_async)):
     """
     Test if the access token is valid.
     
@@ -180,7 +193,7 @@ async def ldap_health_check():
     Returns status information about LDAP configuration and connection.
     Useful for troubleshooting LDAP authentication issues.
     """
-    health = ldap_service.health_check()
+    health = _get_ldap_service().health_check()
     
     # Return appropriate status code based on health
     if not health.get('healthy', False):
@@ -193,7 +206,7 @@ async def ldap_health_check():
 
 
 @router.get("/ldap/config")
-async def ldap_config_info(current_user: User = Depends(get_current_user)):
+async def ldap_config_info(current_user: User = Depends(get_current_user_async)):
     """
     Get LDAP configuration information (sanitized).
     
@@ -206,11 +219,12 @@ async def ldap_config_info(current_user: User = Depends(get_current_user)):
             detail="Admin access required"
         )
     
-    config = ldap_service.config
+    config = _get_ldap_service().config
     
     return {
         "enabled": config.enabled,
         "server": config.server,
+        "servers": config.servers,
         "port": config.port,
         "use_ssl": config.use_ssl,
         "use_ntlm": config.use_ntlm,
@@ -219,5 +233,25 @@ async def ldap_config_info(current_user: User = Depends(get_current_user)):
         "user_search_filter": config.user_search_filter,
         "admin_groups": config.admin_groups,
         "allowed_groups": config.allowed_groups,
-        "timeout": config.timeout
+        "timeout": config.timeout,
+        "connect_timeout": config.connect_timeout
+    }
+
+
+@router.post("/ldap/cache/flush")
+async def ldap_cache_flush(current_admin: User = Depends(get_current_admin_user_async)):
+    """
+    Flush cached LDAP user and group lookups (admin only).
+    
+    Use after directory changes (renames, group membership) that must take
+    effect before the cache TTL expires. Hit-rate counters are reset.
+    """
+    service = _get_ldap_service()
+    stats = service.cache_stats()
+    flushed = service.flush_cache()
+    
+    return {
+        "message": "LDAP cache flushed",
+        "flushed": flushed,
+        "previous": stats
     }
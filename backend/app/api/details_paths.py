@@ -0,0 +1,63 @@
+"""Hot `details` paths with managed expression indexes (admin only)."""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import Session
+
+from app.core import details_paths
+from app.core.database import get_session
+from app.core.deps import get_current_admin_user
+from app.crud import details_path as crud_details_path
+from app.models.details_path import DetailsHotPathCreate, DetailsHotPathRead
+from app.models.user import User
+
+router = APIRouter(prefix="/api/admin/details-paths", tags=["admin"])
+
+
+@router.get("", response_model=List[DetailsHotPathRead])
+def list_hot_paths(
+    session: Session = Depends(get_session),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    return crud_details_path.list_hot_paths(session)
+
+
+@router.post("", response_model=DetailsHotPathRead, status_code=201)
+def create_hot_path(
+    hot_path_in: DetailsHotPathCreate,
+    session: Session = Depends(get_session),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """
+    Declare a hot `details` path and create its expression index on `events`.
+
+    Filters such as `details.<path>=...` on `GET /api/events` then use the
+    index (SQLite and PostgreSQL). On PostgreSQL, `value_type: number` indexes
+    the numeric value for range filters; `string` indexes the text.
+    """
+    try:
+        details_paths.validate_path(hot_path_in.path)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if crud_details_path.get_hot_path_by_path(session, hot_path_in.path):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Path already declared")
+    taken = crud_details_path.get_hot_path_by_index_name(session, details_paths.index_name(hot_path_in.path))
+    if taken:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=f"Index name already used by path {taken.path!r}"
+        )
+    return crud_details_path.create_hot_path(session, hot_path_in)
+
+
+@router.delete("/{hot_path_id}", status_code=204)
+def delete_hot_path(
+    hot_path_id: int,
+    session: Session = Depends(get_session),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """Drop the path's index and forget it; filters on it keep working unindexed."""
+    hot_path = crud_details_path.get_hot_path(session, hot_path_id)
+    if not hot_path:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hot path not found")
+    crud_details_path.delete_hot_path(session, hot_path)
+    return None
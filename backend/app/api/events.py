@@ -1,29 +1,36 @@
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.database import get_session
-from app.core.deps import get_current_user, get_current_admin_user
+from app.core.database import get_async_read_session, get_async_session
+from app.core.details_paths import parse_details_filters
+from app.core.deps import get_current_user_async, get_current_admin_user_async
+from app.crud import agent as crud_agent
+from app.crud import correlation as crud_correlation
 from app.crud import event as crud_event
-from app.models.event import Event, EventCreate, EventUpdate, EventRead
-from app.models.agent import Agent
-from app.models.tool import Tool
-from app.models.tag import Tag
+from app.crud import tag as crud_tag
+from app.crud import tool as crud_tool
+from app.jobs.retention import read_archived_events
+from app.models.event import CorrelatedEvent, Event, EventCreate, EventUpdate, EventRead
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
 
 @router.get("", response_model=List[EventRead])
-def list_events(
+async def list_events(
     *,
-    session: Session = Depends(get_session),
-    current_user=Depends(get_current_user),
+    request: Request,
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user=Depends(get_current_user_async),
     start: Optional[datetime] = Query(default=None),
     end: Optional[datetime] = Query(default=None),
     agent_id: Optional[int] = Query(default=None),
     tool_id: Optional[int] = Query(default=None),
+    job: Optional[str] = Query(default=None, description="CI job name"),
+    build: Optional[int] = Query(default=None, description="Build number within `job`"),
     event_type: Optional[str] = Query(default=None),
     severity: Optional[str] = Query(default=None),
     source: Optional[str] = Query(default=None),
@@ -31,76 +38,160 @@ def list_events(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=200),
 ):
-    events = crud_event.list_events(
+    """
+    List events, newest first.
+
+    Besides the named filters, `details.<path>=<value>` matches a key in the
+    event's structured details (e.g. `details.jenkins.status=FAILURE`), and
+    `details.<path>__gt|gte|lt|lte|ne=<value>` compares it; numbers compare
+    numerically. Repeat to combine. Admin-declared hot paths are indexed.
+    """
+    if build is not None and not job:
+        raise HTTPException(status_code=400, detail="build requires job")
+    try:
+        details_filters = parse_details_filters(request.query_params.multi_items())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    events = await crud_event.list_events_async(
         session,
         start=start,
         end=end,
         agent_id=agent_id,
         tool_id=tool_id,
+        job=job,
+        build=build,
         event_type=event_type,
         severity=severity,
         source=source,
         search=search,
+        details_filters=details_filters,
         skip=skip,
         limit=limit,
     )
-    _attach_relations(session, events)
+    await session.run_sync(_attach_relations, events)
     return events
 
 
+@router.get("/archived", response_model=List[EventRead])
+async def list_archived_events(
+    *,
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user=Depends(get_current_user_async),
+    start: Optional[datetime] = Query(default=None),
+    end: Optional[datetime] = Query(default=None),
+    agent_id: Optional[int] = Query(default=None),
+    tool_id: Optional[int] = Query(default=None),
+    event_type: Optional[str] = Query(default=None),
+    severity: Optional[str] = Query(default=None),
+    source: Optional[str] = Query(default=None),
+    search: Optional[str] = Query(default=None),
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=200),
+):
+    """
+    Query events moved out by the retention job.
+
+    Same filters as `GET /api/events`, served from the compressed archive
+    files overlapping `start`/`end` (slower; narrow the range when possible).
+    """
+    return await session.run_sync(
+        lambda s: read_archived_events(
+            s,
+            start=start,
+            end=end,
+            agent_id=agent_id,
+            tool_id=tool_id,
+            event_type=event_type,
+            severity=severity,
+            source=source,
+            search=search,
+            skip=skip,
+            limit=limit,
+        )
+    )
+
+
 @router.get("/{event_id}", response_model=EventRead)
-def get_event(
+async def get_event(
     *,
-    session: Session = Depends(get_session),
-    current_user=Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user=Depends(get_current_user_async),
     event_id: int,
 ):
-    event = crud_event.get_event(session, event_id)
+    event = await crud_event.get_event_async(session, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    _attach_relations(session, [event])
+    await session.run_sync(_attach_relations, [event])
     return event
 
 
+@router.get("/{event_id}/correlated", response_model=List[CorrelatedEvent])
+async def list_correlated_events(
+    *,
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user=Depends(get_current_user_async),
+    event_id: int,
+    window: str = Query(default="6h", description="Look-back window, e.g. 30m, 6h, 2d"),
+    limit: int = Query(default=50, ge=1, le=200),
+):
+    """
+    Changes that preceded an event on the same agents or tools.
+
+    Candidates are non-outage events within `window` before the event that share
+    at least one agent or tool with it, ranked by overlap, then closest first.
+    """
+    duration = crud_correlation.parse_window(window)
+    if duration is None or duration > crud_correlation.MAX_WINDOW:
+        raise HTTPException(status_code=400, detail="window must look like 30m, 6h or 2d and be at most 7d")
+    event = await crud_event.get_event_async(session, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return await crud_correlation.correlated_events_async(session, event, duration, limit)
+
+
 @router.post("", response_model=EventRead, status_code=201)
-def create_event(
+async def create_event(
     *,
-    session: Session = Depends(get_session),
-    current_user=Depends(get_current_admin_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user=Depends(get_current_admin_user_async),
     event_in: EventCreate,
 ):
-    _ensure_related_entities_exist(session, event_in.agent_ids, event_in.tool_versions, event_in.tag_ids)
-    event = crud_event.create_event(session, event_in)
+    await session.run_sync(
+        _ensure_related_entities_exist, event_in.agent_ids, event_in.tool_versions, event_in.tag_ids
+    )
+    event = await crud_event.create_event_async(session, event_in)
     return event
 
 
 @router.put("/{event_id}", response_model=EventRead)
-def update_event(
+async def update_event(
     *,
-    session: Session = Depends(get_session),
-    current_user=Depends(get_current_admin_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user=Depends(get_current_admin_user_async),
     event_id: int,
     event_in: EventUpdate,
 ):
-    db_event = crud_event.get_event(session, event_id)
+    db_event = await crud_event.get_event_async(session, event_id)
     if not db_event:
         raise HTTPException(status_code=404, detail="Event not found")
-    _ensure_related_entities_exist(session, event_in.agent_ids, event_in.tool_versions, event_in.tag_ids)
-    event = crud_event.update_event(session, db_event, event_in)
+    await session.run_sync(
+        _ensure_related_entities_exist, event_in.agent_ids, event_in.tool_versions, event_in.tag_ids
+    )
+    event = await crud_event.update_event_async(session, db_event, event_in)
     return event
 
 
 @router.delete("/{event_id}", status_code=204)
-def delete_event(
+async def delete_event(
     *,
-    session: Session = Depends(get_session),
-    current_user=Depends(get_current_admin_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user=Depends(get_current_admin_user_async),
     event_id: int,
 ):
-    db_event = crud_event.get_event(session, event_id)
+    db_event = await crud_event.get_event_async(session, event_id)
     if not db_event:
         raise HTTPException(status_code=404, detail="Event not found")
-    crud_event.delete_event(session, db_event)
+    await crud_event.delete_event_async(session, db_event)
     return None
 
 
@@ -167,17 +258,13 @@ def _ensure_related_entities_exist(
     tool_versions: Optional[List[dict]],
     tag_ids: Optional[List[int]],
 ):
-    """Validate referenced entities to avoid FK errors."""
-    if agent_ids:
-        for agent_id in agent_ids:
-            if not session.get(Agent, agent_id):
-                raise HTTPException(status_code=400, detail=f"Agent {agent_id} not found")
-    if tool_versions:
-        for tool_data in tool_versions:
-            tool_id = tool_data.get("tool_id")
-            if tool_id and not session.get(Tool, tool_id):
-                raise HTTPException(status_code=400, detail=f"Tool {tool_id} not found")
-    if tag_ids:
-        for tag_id in tag_ids:
-            if not session.get(Tag, tag_id):
-                raise HTTPException(status_code=400, detail=f"Tag {tag_id} not found")
+    """Validate referenced entities to avoid FK errors (one query per entity type)."""
+    checks = (
+        ("Agent", crud_agent.missing_agent_ids, agent_ids or []),
+        ("Tool", crud_tool.missing_tool_ids, [t.get("tool_id") for t in tool_versions or [] if t.get("tool_id")]),
+        ("Tag", crud_tag.missing_tag_ids, tag_ids or []),
+    )
+    for label, find_missing, ids in checks:
+        missing = find_missing(session, ids)
+        if missing:
+            raise HTTPException(status_code=400, detail=f"{label} {missing[0]} not found")
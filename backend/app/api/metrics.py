@@ -0,0 +1,18 @@
+"""Operational metrics endpoint."""
+from fastapi import APIRouter, Depends
+
+from app.core.deps import get_current_admin_user
+from app.core.metrics import metrics
+from app.models.user import User
+
+router = APIRouter(prefix="/api/metrics", tags=["admin"])
+
+
+@router.get("")
+def read_metrics(current_admin: User = Depends(get_current_admin_user)):
+    """
+    Per-worker counters, gauges and latency percentiles (admin only).
+    
+    Timers are reported in milliseconds as count/p50/p95/p99/max.
+    """
+    return metrics.snapshot()
@@ -0,0 +1,41 @@
+"""Event partition management (admin only)."""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import Session
+
+from app.core import partitions
+from app.core.database import get_session
+from app.core.deps import get_current_admin_user
+from app.models.user import User
+
+router = APIRouter(prefix="/api/admin/partitions", tags=["admin"])
+
+
+@router.get("")
+def read_partitions(
+    session: Session = Depends(get_session),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """List event months with their row counts (and whether each is a native partition)."""
+    return partitions.list_partitions(session.connection())
+
+
+@router.delete("/{month}")
+def drop_partition(
+    month: int,
+    session: Session = Depends(get_session),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """
+    Drop a whole month of events and their agent/tool/tag links.
+
+    `month` is `YYYYMM`. On PostgreSQL the month's partitions are detached
+    and dropped in constant time. On SQLite (no per-month storage) this is a
+    bulk delete of the month's rows, so it takes longer, and holds the write
+    lock longer, the more events the month holds.
+    """
+    try:
+        removed = partitions.drop_partition(session.connection(), month)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    session.commit()
+    return {"month": month, "events_removed": removed}
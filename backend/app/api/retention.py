@@ -0,0 +1,74 @@
+"""Retention policies and event archives (admin only)."""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel import Session
+
+from app.core.database import get_session
+from app.core.deps import get_current_admin_user
+from app.crud import retention as crud_retention
+from app.jobs.retention import archive_expired
+from app.models.retention import EventArchive, RetentionPolicyCreate, RetentionPolicyRead
+from app.models.user import User
+
+router = APIRouter(prefix="/api/admin/retention", tags=["admin"])
+
+
+@router.get("/policies", response_model=List[RetentionPolicyRead])
+def list_policies(
+    session: Session = Depends(get_session),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    return crud_retention.list_policies(session)
+
+
+@router.post("/policies", response_model=RetentionPolicyRead, status_code=201)
+def create_policy(
+    policy_in: RetentionPolicyCreate,
+    session: Session = Depends(get_session),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """
+    Add a retention policy.
+
+    Unset `event_type`/`severity`/`source` match anything; the policy matching
+    the most fields wins. `keep_days` null keeps matching events forever.
+    """
+    if crud_retention.get_matching_policy(session, policy_in):
+        raise HTTPException(status_code=409, detail="A policy with these match fields already exists")
+    return crud_retention.create_policy(session, policy_in)
+
+
+@router.delete("/policies/{policy_id}", status_code=204)
+def delete_policy(
+    policy_id: int,
+    session: Session = Depends(get_session),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    db_policy = crud_retention.get_policy(session, policy_id)
+    if not db_policy:
+        raise HTTPException(status_code=404, detail="Retention policy not found")
+    crud_retention.delete_policy(session, db_policy)
+    return None
+
+
+@router.post("/run")
+def run_retention(
+    session: Session = Depends(get_session),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """
+    Archive one chunk (`RETENTION_BATCH_SIZE` events) of expired events now.
+
+    `more` is true while expired events remain: call again, or leave them to
+    the scheduled job. One chunk per call keeps the request's cost fixed.
+    """
+    return archive_expired(session, max_batches=1)
+
+
+@router.get("/archives", response_model=List[EventArchive])
+def list_archives(
+    session: Session = Depends(get_session),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    return crud_retention.list_archives(session)
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlmodel import Session
 
-from app.core.database import get_session
+from app.core.database import get_read_session, get_session
 from app.core.deps import get_current_user, get_current_admin_user
 from app.crud import tag as crud_tag
 from app.models.tag import Tag
@@ -19,7 +19,7 @@ class TagCreate(BaseModel):
 @router.get("", response_model=List[Tag])
 def list_tags(
     *,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user=Depends(get_current_admin_user),
     skip: int = 0,
     limit: int = 100,
@@ -1,14 +1,15 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlmodel import Session
 
-from app.core.database import get_session
+from app.core.database import get_read_session, get_session
 from app.core.deps import get_current_user, get_current_admin_user
 from app.crud import toolchain as crud_toolchain
 from app.crud import tool as crud_tool
-from app.models.toolchain import Toolchain, ToolchainCreate, ToolchainUpdate, ToolchainRead
+from app.crud import toolchain_drift as crud_drift
+from app.models.toolchain import Toolchain, ToolchainCreate, ToolchainUpdate, ToolchainRead, ToolchainDrift
 
 router = APIRouter(prefix="/api/toolchains", tags=["toolchains"])
 
@@ -20,7 +21,7 @@ class ToolchainToolsUpdate(BaseModel):
 @router.get("", response_model=List[ToolchainRead])
 def list_toolchains(
     *,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user=Depends(get_current_admin_user),
     skip: int = 0,
     limit: int = 100,
@@ -28,10 +29,29 @@ def list_toolchains(
     return crud_toolchain.list_toolchains(session, skip=skip, limit=limit)
 
 
+@router.get("/drift", response_model=List[ToolchainDrift])
+def toolchain_drift(
+    *,
+    session: Session = Depends(get_read_session),
+    current_user=Depends(get_current_admin_user),
+    toolchain_id: Optional[int] = Query(default=None),
+):
+    """
+    Agents missing toolchain tools or running divergent versions, per toolchain.
+
+    An agent is checked against a toolchain once it has any of its tools; the
+    expected version of a tool is the most common one across the fleet.
+    """
+    report = crud_drift.get_drift(session)
+    if toolchain_id is not None:
+        report = [drift for drift in report if drift.toolchain_id == toolchain_id]
+    return report
+
+
 @router.get("/{toolchain_id}", response_model=ToolchainRead)
 def get_toolchain(
     *,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user=Depends(get_current_admin_user),
     toolchain_id: int,
 ):
@@ -78,9 +98,9 @@ def set_toolchain_tools(
         raise HTTPException(status_code=404, detail="Toolchain not found")
 
     # Validate tools exist to avoid FK errors
-    for tool_id in payload.tool_ids:
-        if not crud_tool.get_tool(session, tool_id):
-            raise HTTPException(status_code=400, detail=f"Tool {tool_id} not found")
+    missing = crud_tool.missing_tool_ids(session, payload.tool_ids)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Tool {missing[0]} not found")
 
     return crud_toolchain.set_toolchain_tools(session, db_tc, payload.tool_ids)
 
@@ -3,9 +3,11 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
 
-from app.core.database import get_session
+from app.core.database import get_read_session, get_session
 from app.core.deps import get_current_user, get_current_admin_user
+from app.crud import agent_tool_state as crud_tool_state
 from app.crud import tool as crud_tool
+from app.models.agent_tool_state import ToolVersionCount
 from app.models.tool import Tool, ToolCreate, ToolUpdate, ToolRead
 
 router = APIRouter(prefix="/api/tools", tags=["tools"])
@@ -14,7 +16,7 @@ router = APIRouter(prefix="/api/tools", tags=["tools"])
 @router.get("", response_model=List[ToolRead])
 def list_tools(
     *,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user=Depends(get_current_admin_user),
     category: Optional[str] = Query(default=None),
     tool_type: Optional[str] = Query(default=None),
@@ -28,7 +30,7 @@ def list_tools(
 @router.get("/{tool_id}", response_model=ToolRead)
 def get_tool(
     *,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user=Depends(get_current_admin_user),
     tool_id: int,
 ):
@@ -38,6 +40,19 @@ def get_tool(
     return tool
 
 
+@router.get("/{tool_id}/versions", response_model=List[ToolVersionCount])
+def tool_version_distribution(
+    *,
+    session: Session = Depends(get_read_session),
+    current_user=Depends(get_current_admin_user),
+    tool_id: int,
+):
+    """Fleet-wide distribution of the tool's current versions (agents per version)."""
+    if not crud_tool.get_tool(session, tool_id):
+        raise HTTPException(status_code=404, detail="Tool not found")
+    return crud_tool_state.tool_version_distribution(session, tool_id)
+
+
 @router.post("", response_model=ToolRead, status_code=201)
 def create_tool(
     *,
@@ -5,6 +5,7 @@ from sqlmodel import Session, select
 
 from app.core.database import get_session
 from app.core.deps import get_current_user, get_current_admin_user
+from app.core.security import get_password_hash_async
 from app.crud import user as crud_user
 from app.models.user import User, UserUpdate, UserInDB
 
@@ -52,7 +53,9 @@ async def update_user_me(
                 detail="Email already registered"
             )
     
-    updated_user = crud_user.update_user(session, current_user, user_update)
+    # Hashing runs on the bounded hashing executor
+    hashed_password = await get_password_hash_async(user_update.password) if user_update.password else None
+    updated_user = crud_user.update_user(session, current_user, user_update, hashed_password=hashed_password)
     return updated_user
 
 
@@ -71,10 +74,10 @@ async def change_password(
     
     Requires: Valid JWT token
     """
-    from app.core.security import verify_password, validate_password_strength
+    from app.core.security import verify_password_async, validate_password_strength
     
     # Verify current password
-    if not verify_password(current_password, current_user.hashed_password):
+    if not await verify_password_async(current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect password"
@@ -88,9 +91,10 @@ async def change_password(
             detail=error_message
         )
     
-    # Update password
+    # Update password (hashing runs on the bounded hashing executor)
     user_update = UserUpdate(password=new_password)
-    crud_user.update_user(session, current_user, user_update)
+    hashed_password = await get_password_hash_async(new_password)
+    crud_user.update_user(session, current_user, user_update, hashed_password=hashed_password)
     
     return {"message": "Password updated successfully"}
 
@@ -154,7 +158,9 @@ async def update_user(
             detail="User not found"
         )
     
-    updated_user = crud_user.update_user(session, user, user_update)
+    # Hashing runs on the bounded hashing executor
+    hashed_password = await get_password_hash_async(user_update.password) if user_update.password else None
+    updated_user = crud_user.update_user(session, user, user_update, hashed_password=hashed_password)
     return updated_user
 
 
@@ -2,21 +2,23 @@ from datetime import datetime
 import hashlib
 import hmac
 import json
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from sqlalchemy import insert
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.core.database import get_session
+from app.core.database import get_async_session
+from app.core.write_lane import run_write
 from app.crud import event as crud_event
-from app.crud import agent as crud_agent
-from app.crud import tool as crud_tool
-from app.crud import tag as crud_tag
+from app.crud import job as crud_job
+from app.crud import outage as crud_outage
 from app.models.agent import Agent
 from app.models.tool import Tool
 from app.models.tag import Tag
-from app.models.event import EventCreate, EventRead
+from app.models.event import EventCreate, EventRead, naive_utc
 from app.models.enums import EventSeverity, EventSource, EventType
 
 from pydantic import BaseModel, Field
@@ -67,43 +69,70 @@ def _status_to_type_and_severity(status: str) -> tuple[EventType, EventSeverity]
     return EventType.CONFIG_CHANGE, EventSeverity.INFO
 
 
-def _get_or_create_agent(session: Session, name: str) -> Agent:
-    agent = crud_agent.get_agent_by_name(session, name)
-    if agent:
-        return agent
-    agent = Agent(name=name, status="active")
-    session.add(agent)
-    session.commit()
-    session.refresh(agent)
-    return agent
+def _ids_by_name(session: Session, model, names: List[str], **defaults) -> Dict[str, int]:
+    """name -> id for ``names``, creating missing rows: a lookup, plus one bulk insert and re-read if any are new."""
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    ids = dict(session.exec(select(model.name, model.id).where(model.name.in_(names))).all())
+    missing = [name for name in names if name not in ids]
+    if missing:
+        session.exec(insert(model), params=[
+            model(name=name, **defaults).model_dump(exclude={"id"}) for name in missing
+        ])
+        ids.update(session.exec(select(model.name, model.id).where(model.name.in_(missing))).all())
+    return ids
 
 
-def _get_or_create_tool(session: Session, name: str) -> Tool:
-    tool = crud_tool.get_tool_by_name(session, name)
-    if tool:
-        return tool
-    tool = Tool(name=name)
-    session.add(tool)
-    session.commit()
-    session.refresh(tool)
-    return tool
+def _ingest_jenkins(session: Session, payload: JenkinsWebhookPayload) -> int:
+    """Create the event (and any missing agents/tools/tags) for a Jenkins payload, in constant statements."""
+    event_type, severity = _status_to_type_and_severity(payload.status)
+    title = f"Jenkins {payload.job_name} #{payload.build_number} {payload.status.lower()}"
+    description_parts = [payload.message, payload.full_url]
+    description = "\n".join([p for p in description_parts if p]) or None
+    # Jenkins sends UTC 'Z' times; builds and events store naive UTC
+    timestamp = naive_utc(payload.timestamp) or datetime.utcnow()
+
+    agent_ids = list(_ids_by_name(session, Agent, [payload.agent] if payload.agent else [], status="active").values())
+    tag_ids = list(_ids_by_name(session, Tag, payload.tags or []).values())
+    tool_ids = _ids_by_name(session, Tool, [tool_payload.name for tool_payload in payload.tools or []])
+    tool_versions = [
+        {
+            "tool_id": tool_ids[tool_payload.name],
+            "version_from": tool_payload.previous_version,
+            "version_to": tool_payload.version,
+        }
+        for tool_payload in payload.tools or []
+    ]
 
+    event_in = EventCreate(
+        title=title,
+        description=description,
+        timestamp=timestamp,
+        event_type=event_type,
+        severity=severity,
+        source=EventSource.WEBHOOK,
+        details=json.dumps({"jenkins": payload.model_dump(mode="json")}),
+        agent_ids=agent_ids or None,
+        tool_versions=tool_versions or None,
+        tag_ids=tag_ids or None,
+    )
 
-def _get_or_create_tag(session: Session, name: str) -> Tag:
-    tag = crud_tag.get_tag_by_name(session, name)
-    if tag:
-        return tag
-    tag = Tag(name=name)
-    session.add(tag)
-    session.commit()
-    session.refresh(tag)
-    return tag
+    build = crud_job.record_build(
+        session, payload.job_name, payload.build_number, payload.status.upper(), timestamp, payload.full_url
+    )
+    event = crud_event.create_event(session, event_in, build_id=build.id)
+    event_id = event.id
+    # Pair failures with the recovery that ends them (outage analytics)
+    if crud_outage.record_build(session, payload.job_name, event, agent_ids[0] if agent_ids else None):
+        session.commit()
+    return event_id
 
 
 @router.post("/jenkins", response_model=EventRead, status_code=202)
 async def jenkins_webhook(
     request: Request,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     x_hub_signature_256: Optional[str] = Header(default=None),
 ):
     """Ingest Jenkins build notifications into CI Ledger events.
@@ -119,49 +148,11 @@ async def jenkins_webhook(
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid webhook payload")
 
-    event_type, severity = _status_to_type_and_severity(payload.status)
-    title = f"Jenkins {payload.job_name} #{payload.build_number} {payload.status.lower()}"
-    description_parts = [payload.message, payload.full_url]
-    description = "\n".join([p for p in description_parts if p]) or None
-    timestamp = payload.timestamp or datetime.utcnow()
-
-    agent_ids: List[int] = []
-    if payload.agent:
-        agent = _get_or_create_agent(session, payload.agent)
-        agent_ids.append(agent.id)
-
-    tag_ids: List[int] = []
-    for tag_name in payload.tags or []:
-        tag = _get_or_create_tag(session, tag_name)
-        tag_ids.append(tag.id)
-
-    tool_versions = []
-    for tool_payload in payload.tools or []:
-        tool = _get_or_create_tool(session, tool_payload.name)
-        tool_versions.append(
-            {
-                "tool_id": tool.id,
-                "version_from": tool_payload.previous_version,
-                "version_to": tool_payload.version,
-            }
-        )
-
-    event_in = EventCreate(
-        title=title,
-        description=description,
-        timestamp=timestamp,
-        event_type=event_type,
-        severity=severity,
-        source=EventSource.WEBHOOK,
-        details=json.dumps({"jenkins": payload.model_dump(mode="json")}),
-        agent_ids=agent_ids or None,
-        tool_versions=tool_versions or None,
-        tag_ids=tag_ids or None,
-    )
-
-    event = crud_event.create_event(session, event_in)
+    # Ingestion writes go through the SQLite write lane when enabled
+    event_id = await run_write(session, lambda s: _ingest_jenkins(s, payload))
+    event = await crud_event.get_event_async(session, event_id)
     # Attach relations for response parity with other event endpoints
     from app.api.events import _attach_relations
-    _attach_relations(session, [event])
+    await session.run_sync(_attach_relations, [event])
 
     return event
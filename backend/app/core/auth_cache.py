@@ -0,0 +1,81 @@
+"""
+Per-process caches for request authentication.
+
+Two caches keep steady-state authenticated requests free of user queries:
+- decoded JWT claims keyed by the raw token (bounded by the token's ``exp``)
+- principal snapshots (the ``users`` row) keyed by user id
+
+Principal entries live for ``AUTH_PRINCIPAL_CACHE_TTL`` seconds and are
+invalidated explicitly whenever a user is updated or deleted through
+``app.crud.user``. Other workers converge within the TTL.
+"""
+import time
+from typing import Optional
+
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+claims_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CLAIMS_CACHE_TTL,
+    name="jwt_claims",
+)
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_PRINCIPAL_CACHE_TTL,
+    name="principals",
+)
+
+
+def get_cached_claims(token: str) -> Optional[dict]:
+    """Return previously decoded claims for ``token`` if still valid."""
+    payload = claims_cache.get(token)
+    if payload is None:
+        return None
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        claims_cache.pop(token)
+        return None
+    return payload
+
+
+def cache_claims(token: str, payload: dict) -> None:
+    """Remember decoded claims, never beyond the token's own expiry."""
+    exp = payload.get("exp")
+    ttl = None if exp is None else exp - time.time()
+    claims_cache.set(token, payload, ttl=ttl)
+
+
+def load_principal(session: Session, user_id: int) -> Optional[User]:
+    """
+    Load a user by id, serving from the principal cache when possible.
+
+    Cached snapshots are merged into ``session`` without a SELECT so the
+    returned instance behaves like one loaded by ``session.get``.
+    """
+    snapshot = principal_cache.get(user_id)
+    if snapshot is not None:
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return session.merge(user, load=False)
+
+    user = session.get(User, user_id)
+    if user is not None:
+        principal_cache.set(user_id, user.model_dump())
+    return user
+
+
+def invalidate_principal(user_id: Optional[int]) -> None:
+    """Forget the cached snapshot for ``user_id``."""
+    if user_id is not None:
+        principal_cache.pop(user_id)
+
+
+def clear_auth_caches() -> None:
+    """Drop all cached claims and principals."""
+    claims_cache.clear()
+    principal_cache.clear()
@@ -0,0 +1,85 @@
+"""In-process caching helpers."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Entries are evicted least-recently-used first once ``maxsize`` is
+    reached. A ``ttl`` of 0 disables the cache (every lookup misses).
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: str = "cache"):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing/expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``; ``ttl`` may only shorten the default."""
+        if not self.enabled:
+            return
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + lifetime, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop ``key`` if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry and reset hit/miss counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit-rate counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -2,7 +2,7 @@
 Application configuration using Pydantic BaseSettings.
 All configuration is loaded from environment variables or .env file.
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, validator
 
@@ -22,9 +22,68 @@ class Settings(BaseSettings):
     )
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Auth caches (per process)
+    AUTH_CLAIMS_CACHE_TTL: int = 300  # seconds to reuse decoded JWT claims (0 = disabled)
+    AUTH_PRINCIPAL_CACHE_TTL: int = 30  # seconds to reuse user lookups (0 = disabled)
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # Password hashing (argon2). Changing these rehashes passwords on next login.
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # defaults to CPU count
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64  # queued hashes beyond the workers before 503
     
     # Database
     DATABASE_URL: str = "sqlite:///./app.db"
+    DATABASE_ASYNC_URL: Optional[str] = None  # Defaults to DATABASE_URL with its async driver (aiosqlite, asyncpg, ...)
+    DATABASE_READ_URL: Optional[str] = None  # Read replica for read-only endpoints (unset = primary)
+    READ_YOUR_WRITES_SECONDS: int = 5  # After a write, the client reads from the primary this long
+    DATABASE_ECHO: bool = False  # Log every SQL statement (debugging only)
+    DATABASE_AUTO_CREATE: bool = True  # Create the schema on boot when the database is empty (else run alembic)
+    SERVER_TIMING_ENABLED: bool = True  # Server-Timing header with per-request SQL count/time
+    SLOW_QUERY_MS: int = 200  # Log statements slower than this, parameters redacted (0 = off)
+    # Connection pool; unset values use per-backend defaults (see app.core.database)
+    DATABASE_POOL_SIZE: Optional[int] = None  # SQLite 5, server databases 10
+    DATABASE_MAX_OVERFLOW: Optional[int] = None  # SQLite 10, server databases 20
+    DATABASE_POOL_TIMEOUT: float = 30  # Seconds to wait for a free connection
+    DATABASE_POOL_PRE_PING: Optional[bool] = None  # SQLite off, server databases on
+    DATABASE_POOL_RECYCLE: Optional[int] = None  # Seconds; SQLite never, server databases 1800
+
+    # SQLite high-throughput profile (file databases only)
+    SQLITE_TUNED: bool = False  # WAL, synchronous=NORMAL and the pragmas below on every connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait this long for the write lock before "database is locked"
+    SQLITE_MMAP_SIZE: int = 268435456  # Bytes of the file to memory-map (256 MiB)
+    SQLITE_CACHE_SIZE_KIB: int = 65536  # Page cache per connection
+    SQLITE_WRITE_LANE: bool = False  # Serialize webhook/PAT writes on one thread with group commit
+    SQLITE_WRITE_BATCH_MAX: int = 64  # Most queued writes committed in one transaction
+    SQLITE_WRITE_BATCH_WAIT_MS: int = 2  # How long the writer waits to fill a batch
+
+    # Event partitioning (native on PostgreSQL; see app.core.partitions)
+    EVENT_PARTITION_MONTHS_AHEAD: int = 3  # Month partitions created ahead of time at startup
+
+    # Retention / archival (policies are managed via /api/admin/retention)
+    RETENTION_ENABLED: bool = False  # Run the archive job on a schedule
+    RETENTION_INTERVAL: int = 3600  # seconds
+    RETENTION_DEFAULT_DAYS: Optional[int] = None  # Events no policy matches (None = keep forever)
+    RETENTION_BATCH_SIZE: int = 1000  # Events archived (and deleted) per transaction/file
+    ARCHIVE_DIR: str = "./archive"  # Compressed JSONL archive files
+
+    # Point-in-time tool state (/api/agents/state)
+    TOOL_STATE_CHECKPOINT_INTERVAL: int = 86400  # Seconds between fleet snapshots (0 = off)
+    TOOL_STATE_CHECKPOINT_KEEP: int = 90  # Newest snapshots kept; older moments replay from the oldest kept
+    TOOLCHAIN_DRIFT_CACHE_TTL: int = 300  # Seconds other workers may serve a cached drift report (0 = no cache)
+
+    # Analytics (/api/analytics)
+    HEATMAP_SEVERITY_WEIGHTS: str = "info:1,warning:3,critical:10"  # Weight of one event per severity in the heatmap
+    HEATMAP_MAX_DAYS: int = 366  # Widest heatmap window
+    CHANGE_FAILURE_WINDOW_HOURS: int = 24  # An outage this soon after a change on a shared agent fails it (rebuild after changing)
+
+    # Leader election: which process runs pollers and scheduled jobs
+    LEADER_ELECTION: str = "none"  # none (every process), file (one host), database (any number of hosts)
+    LEADER_LEASE_SECONDS: int = 15  # Database lease length; renewed every third of it
+    LEADER_LOCK_FILE: str = "./ci-ledger-leader.lock"  # Lock file for LEADER_ELECTION=file
     
     # CORS
     BACKEND_CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
@@ -35,21 +94,40 @@ class Settings(BaseSettings):
         if isinstance(self.BACKEND_CORS_ORIGINS, str):
             return [i.strip() for i in self.BACKEND_CORS_ORIGINS.split(",")]
         return self.BACKEND_CORS_ORIGINS
+
+    @property
+    def heatmap_severity_weights(self) -> Dict[str, float]:
+        """Parse ``severity:weight`` pairs; unlisted severities weigh 1."""
+        weights = {}
+        for pair in self.HEATMAP_SEVERITY_WEIGHTS.split(","):
+            if pair.strip():
+                severity, _, weight = pair.partition(":")
+                weights[severity.strip().lower()] = float(weight)
+        return weights
     
     # LDAP Configuration
     LDAP_ENABLED: bool = False
     LDAP_SERVER: Optional[str] = None
+    LDAP_SERVERS: str = ""  # Comma-separated servers/URLs for failover (overrides LDAP_SERVER)
     LDAP_PORT: int = 389
     LDAP_USE_SSL: bool = False
     LDAP_BIND_DN: Optional[str] = None
     LDAP_BIND_PASSWORD: Optional[str] = None
     LDAP_SEARCH_BASE: Optional[str] = None
     LDAP_USE_NTLM: bool = False  # Use NTLM authentication (for Windows AD)
-    LDAP_TIMEOUT: int = 10  # Connection timeout in seconds
+    LDAP_TIMEOUT: int = 10  # Operation (receive) timeout in seconds
+    LDAP_CONNECT_TIMEOUT: int = 3  # TCP connect timeout before failing over to the next server
+    LDAP_SERVER_COOLDOWN: int = 30  # Seconds a failed server is skipped
     LDAP_USER_SEARCH_FILTER: str = "(sAMAccountName={username})"
     LDAP_GROUP_SEARCH_FILTER: str = "(member={user_dn})"
     LDAP_ADMIN_GROUPS: str = ""  # Comma-separated list of admin groups
     LDAP_ALLOWED_GROUPS: str = ""  # Comma-separated list of allowed groups (empty = all)
+    LDAP_POOL_SIZE: int = 5  # Pooled service-account connections per worker
+    LDAP_POOL_MAX_AGE: int = 600  # Seconds before a pooled connection is recycled
+    LDAP_POOL_IDLE_CHECK: int = 60  # Probe pooled connections idle longer than this (seconds)
+    LDAP_CACHE_TTL: int = 300  # Seconds to cache user/group lookups (0 = disabled)
+    LDAP_NEGATIVE_CACHE_TTL: int = 60  # Seconds to cache "user not found" results
+    LDAP_CACHE_MAX_ENTRIES: int = 10000
     
     # Email Configuration
     SMTP_ENABLED: bool = False
@@ -1,14 +1,234 @@
 """Database connection and session management."""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event as sa_event
+from sqlalchemy import exc as sa_exc
+from fastapi import Request
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.read_routing import prefers_primary
+
+# Pool defaults per backend: SQLite files are local and never go stale, while
+# server databases sit behind networks/proxies that drop idle connections.
+_POOL_DEFAULTS = {
+    "sqlite": {"pool_size": 5, "max_overflow": 10, "pool_pre_ping": False, "pool_recycle": -1},
+    "server": {"pool_size": 10, "max_overflow": 20, "pool_pre_ping": True, "pool_recycle": 1800},
+}
+
+
+# Async driver used for each backend when DATABASE_ASYNC_URL is not set
+_ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+    "mssql": "aioodbc",
+}
+
+
+class _CheckoutTimingMixin:
+    """Reports pool checkout wait time and timeouts as metrics."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            metrics.inc("db.pool.timeouts")
+            raise
+        finally:
+            metrics.observe("db.pool.checkout_wait_ms", (time.perf_counter() - started) * 1000)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool that reports checkout wait time and timeouts as metrics."""
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """Async-adapted variant of ``InstrumentedQueuePool``."""
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """
+    Build ``create_engine`` keyword arguments for ``url`` from settings.
+
+    Explicit ``DATABASE_POOL_*`` settings win; anything unset falls back to
+    the defaults for the URL's backend. In-memory SQLite keeps SQLAlchemy's
+    own single-connection pool since a queue pool would hand out separate
+    (empty) databases.
+    """
+    options: Dict[str, Any] = {"echo": settings.DATABASE_ECHO}
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    if is_sqlite:
+        options["connect_args"] = {"check_same_thread": False}
+    if _is_memory_sqlite(url):
+        return options
+
+    defaults = _POOL_DEFAULTS["sqlite" if is_sqlite else "server"]
+    configured = {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    }
+    options.update({key: defaults[key] if value is None else value for key, value in configured.items()})
+    options["pool_timeout"] = settings.DATABASE_POOL_TIMEOUT
+    options["poolclass"] = InstrumentedQueuePool
+    return options
+
+
+def sqlite_pragmas() -> List[str]:
+    """PRAGMA statements for the tuned SQLite profile (``SQLITE_TUNED``)."""
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KIB)}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def apply_sqlite_profile(engine: Engine) -> None:
+    """Run the tuned-profile pragmas on every new connection of ``engine``."""
+    pragmas = sqlite_pragmas()
+
+    @sa_event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def is_sqlite_file(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite" and not _is_memory_sqlite(url)
+
+
+def build_engine(url: Optional[str] = None) -> Engine:
+    """Create an engine for ``url`` (default ``DATABASE_URL``) with pool settings applied."""
+    url = url or settings.DATABASE_URL
+    engine = create_engine(url, **engine_options(url))
+    if settings.SQLITE_TUNED and is_sqlite_file(url):
+        apply_sqlite_profile(engine)
+    return engine
+
+
+def async_database_url(url: Optional[str] = None) -> str:
+    """``DATABASE_ASYNC_URL`` if set, else ``url`` rewritten to its backend's async driver."""
+    if url is None and settings.DATABASE_ASYNC_URL:
+        return settings.DATABASE_ASYNC_URL
+    parsed = make_url(url or settings.DATABASE_URL)
+    backend = parsed.get_backend_name()
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver known for '{backend}'; set DATABASE_ASYNC_URL")
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+def build_async_engine(url: Optional[str] = None) -> AsyncEngine:
+    """Create an async engine for ``url`` with the same pool settings as the sync engine."""
+    sync_url = url or settings.DATABASE_URL
+    options = engine_options(sync_url)
+    if options.get("poolclass") is InstrumentedQueuePool:
+        options["poolclass"] = InstrumentedAsyncQueuePool
+    async_engine = create_async_engine(async_database_url(url), **options)
+    if settings.SQLITE_TUNED and is_sqlite_file(sync_url):
+        apply_sqlite_profile(async_engine.sync_engine)
+    return async_engine
+
+
+def pool_stats(pool: Optional[Pool] = None) -> Dict[str, Any]:
+    """Current pool occupancy; ``saturation`` is checked-out / total capacity."""
+    pool = pool if pool is not None else engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+
+    size = pool.size()
+    max_overflow = pool._max_overflow
+    checked_out = pool.checkedout()
+    capacity = size + max_overflow if max_overflow >= 0 else None
+    return {
+        "pool": type(pool).__name__,
+        "size": size,
+        "max_overflow": max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": max(0, pool.overflow()),
+        "saturation": round(checked_out / capacity, 4) if capacity else None,
+    }
+
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=True if settings.ENVIRONMENT == "development" else False,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+engine = build_engine()
+metrics.register_collector("db_pool", lambda: pool_stats(engine.pool))
+
+
+_async_engine: Optional[AsyncEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    """The process-wide async engine, created on first use."""
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                _async_engine = build_async_engine()
+                metrics.register_collector("db_async_pool", lambda: pool_stats(_async_engine.sync_engine.pool))
+    return _async_engine
+
+
+_read_engine: Optional[Engine] = None
+_async_read_engine: Optional[AsyncEngine] = None
+
+
+def get_read_engine() -> Optional[Engine]:
+    """Engine for ``DATABASE_READ_URL``, or None when no replica is configured."""
+    global _read_engine
+    if not settings.DATABASE_READ_URL:
+        return None
+    if _read_engine is None:
+        with _engine_lock:
+            if _read_engine is None:
+                _read_engine = build_engine(settings.DATABASE_READ_URL)
+                metrics.register_collector("db_read_pool", lambda: pool_stats(_read_engine.pool))
+    return _read_engine
+
+
+def get_async_read_engine() -> Optional[AsyncEngine]:
+    """Async engine for ``DATABASE_READ_URL``, or None when no replica is configured."""
+    global _async_read_engine
+    if not settings.DATABASE_READ_URL:
+        return None
+    if _async_read_engine is None:
+        with _engine_lock:
+            if _async_read_engine is None:
+                _async_read_engine = build_async_engine(settings.DATABASE_READ_URL)
+    return _async_read_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (app shutdown)."""
+    global _async_engine, _async_read_engine
+    for async_engine in (_async_engine, _async_read_engine):
+        if async_engine is not None:
+            await async_engine.dispose()
+    _async_engine = _async_read_engine = None
 
 
 def create_db_and_tables():
@@ -19,9 +239,53 @@ def create_db_and_tables():
 def get_session():
     """
     Get database session.
-    
+
     Yields:
         Database session
     """
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    """
+    Get async database session.
+
+    Objects stay loaded after commit (``expire_on_commit=False``) so they can
+    be serialized without another round trip. Sync CRUD helpers run on it via
+    ``await session.run_sync(fn, ...)``.
+
+    Yields:
+        Async database session
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+def get_read_session(request: Request):
+    """
+    Get database session for read-only endpoints.
+
+    Uses the ``DATABASE_READ_URL`` replica when configured, unless the
+    client asked to read its own writes (see ``app.core.read_routing``).
+
+    Yields:
+        Database session
+    """
+    read_engine = None if prefers_primary(request) else get_read_engine()
+    metrics.inc("db.reads.replica" if read_engine is not None else "db.reads.primary")
+    with Session(read_engine or engine) as session:
+        yield session
+
+
+async def get_async_read_session(request: Request):
+    """
+    Async variant of ``get_read_session``.
+
+    Yields:
+        Async database session
+    """
+    read_engine = None if prefers_primary(request) else get_async_read_engine()
+    metrics.inc("db.reads.replica" if read_engine is not None else "db.reads.primary")
+    async with AsyncSession(read_engine or get_async_engine(), expire_on_commit=False) as session:
+        yield session
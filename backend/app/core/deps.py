@@ -2,10 +2,14 @@
 from typing import Optional
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import update
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.database import get_session
+from app.core.auth_cache import cache_claims, get_cached_claims, load_principal
+from app.core.database import get_async_session, get_session
 from app.core.security import decode_access_token
+from app.core.write_lane import submit_write
 from app.models.user import User
 
 # OAuth2 scheme for token authentication
@@ -36,12 +40,48 @@ def get_current_user(
     Raises:
         HTTPException: If no valid credentials provided
     """
-    credentials_exception = HTTPException(
+    user = _authenticate(jwt_token, bearer_credentials, session)
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+async def get_current_user_async(
+    jwt_token: Optional[str] = Depends(oauth2_scheme),
+    bearer_credentials: Optional[HTTPAuthorizationCredentials] = Depends(http_bearer),
+    session: AsyncSession = Depends(get_async_session)
+) -> User:
+    """
+    Async variant of ``get_current_user`` for routes on the async session.
+    
+    Same JWT/PAT semantics; lookups run on the async engine so the request
+    never occupies a threadpool thread.
+    
+    Raises:
+        HTTPException: If no valid credentials provided
+    """
+    user = await session.run_sync(
+        lambda sync_session: _authenticate(jwt_token, bearer_credentials, sync_session)
+    )
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def _authenticate(
+    jwt_token: Optional[str],
+    bearer_credentials: Optional[HTTPAuthorizationCredentials],
+    session: Session
+) -> Optional[User]:
+    """Resolve the user for a PAT or JWT, or None."""
     # Try PAT authentication first
     if bearer_credentials and bearer_credentials.credentials.startswith("pat_"):
         user = _authenticate_with_pat(bearer_credentials.credentials, session)
@@ -54,20 +94,23 @@ def get_current_user(
         if user:
             return user
     
-    raise credentials_exception
+    return None
 
 
 def _authenticate_with_jwt(token: str, session: Session) -> Optional[User]:
     """Authenticate using JWT token."""
-    payload = decode_access_token(token)
+    payload = get_cached_claims(token)
     if payload is None:
-        return None
+        payload = decode_access_token(token)
+        if payload is None:
+            return None
+        cache_claims(token, payload)
     
     user_id: Optional[int] = payload.get("sub")
     if user_id is None:
         return None
     
-    user = session.get(User, user_id)
+    user = load_principal(session, int(user_id))
     if user is None or not user.is_active:
         return None
     
@@ -93,13 +136,18 @@ def _authenticate_with_pat(token: str, session: Session) -> Optional[User]:
     if is_token_expired(db_token.expires_at):
         return None
     
-    # Update last used timestamp
-    db_token.last_used_at = datetime.utcnow()
-    session.add(db_token)
-    session.commit()
+    # Update last used timestamp (group-committed off the request path when
+    # the SQLite write lane is enabled)
+    token_id = db_token.id
+    used_at = datetime.utcnow()
+    submit_write(session, lambda s: s.execute(
+        update(PersonalAccessToken)
+        .where(PersonalAccessToken.id == token_id)
+        .values(last_used_at=used_at)
+    ))
     
     # Get user
-    user = session.get(User, db_token.user_id)
+    user = load_principal(session, db_token.user_id)
     if user is None or not user.is_active:
         return None
     
@@ -150,3 +198,17 @@ def get_current_admin_user(
             detail="Admin access required"
         )
     return current_user
+
+
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async)
+) -> User:
+    """Async variant of ``get_current_active_user``."""
+    return get_current_active_user(current_user)
+
+
+async def get_current_admin_user_async(
+    current_user: User = Depends(get_current_user_async)
+) -> User:
+    """Async variant of ``get_current_admin_user``."""
+    return get_current_admin_user(current_user)
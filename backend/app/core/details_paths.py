@@ -0,0 +1,157 @@
+"""
+JSON-path filters on event ``details`` and the expression indexes behind hot paths.
+
+``details`` is stored as JSON text in ``events.metadata``. Filters look like
+``details.<path>=<value>`` or ``details.<path>__<op>=<value>`` with ``op`` in
+``OPERATORS``; values that parse as numbers compare numerically, ``true`` and
+``false`` as booleans, anything else as text.
+
+Paths are restricted to dotted identifiers, so the extraction expression is
+inlined as SQL. That lets a filter on a declared hot path use the expression
+index created for it (``ensure_details_indexes``):
+
+- SQLite: ``json_extract(metadata, '$.a.b')`` returns typed values, so one
+  index serves every filter on the path;
+- PostgreSQL: ``metadata::jsonb #>> '{a,b}'`` (text), or its numeric cast for
+  ``number`` paths;
+- other backends filter through SQLAlchemy's generic JSON accessors and get
+  no index.
+"""
+import hashlib
+import operator
+import re
+from typing import Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from sqlalchemy import JSON, and_, literal, literal_column, text, type_coerce
+from sqlalchemy.engine import Connection
+
+_COMPARISONS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+OPERATORS = tuple(_COMPARISONS)
+PREFIX = "details."
+INDEXED_DIALECTS = ("sqlite", "postgresql")
+
+_PATH_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+_NUMBER_PATTERN = re.compile(r"^-?\d+(\.\d+)?$")
+
+Value = Union[str, float, int, bool]
+
+
+class DetailsFilter(NamedTuple):
+    path: str
+    op: str
+    value: Value
+
+
+def validate_path(path: str) -> str:
+    if len(path) > 40 or not _PATH_PATTERN.match(path):
+        raise ValueError(f"Invalid details path {path!r}; use dotted identifiers like jenkins.status")
+    return path
+
+
+def _coerce(raw: str) -> Value:
+    if _NUMBER_PATTERN.match(raw):
+        return float(raw) if "." in raw else int(raw)
+    if raw.lower() in ("true", "false"):
+        return raw.lower() == "true"
+    return raw
+
+
+def parse_details_filters(params: Iterable[Tuple[str, str]]) -> List[DetailsFilter]:
+    """``details.*`` query parameters as filters; raises ValueError on a bad path or operator."""
+    filters = []
+    for key, raw in params:
+        if not key.startswith(PREFIX):
+            continue
+        path, _, op = key[len(PREFIX):].partition("__")
+        op = op or "eq"
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown details operator {op!r}; use one of {', '.join(OPERATORS)}")
+        filters.append(DetailsFilter(validate_path(path), op, _coerce(raw)))
+    return filters
+
+
+def _sql_expression(dialect: str, path: str, numeric: bool) -> Optional[str]:
+    """Inlined extraction SQL for ``path`` (shared by filters and index DDL), or None."""
+    if dialect == "sqlite":
+        return f"json_extract(events.metadata, '$.{path}')"
+    if dialect == "postgresql":
+        pg_path = "{" + ",".join(path.split(".")) + "}"
+        value = f"(events.metadata::jsonb #>> '{pg_path}')"
+        if not numeric:
+            return value
+        return f"(CASE WHEN jsonb_typeof(events.metadata::jsonb #> '{pg_path}') = 'number' THEN {value}::numeric END)"
+    return None
+
+
+def _compare(expression, op: str, value):
+    return _COMPARISONS[op](expression, literal(value))
+
+
+def details_condition(dialect: str, details_column, details_filter: DetailsFilter):
+    """WHERE clause for one filter on ``details_column`` (``Event.details``)."""
+    path, op, value = details_filter
+    numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+    inlined = _sql_expression(dialect, path, numeric)
+    if inlined is None:
+        accessor = type_coerce(details_column, JSON)[tuple(path.split("."))]
+        if isinstance(value, bool):
+            return _compare(accessor.as_boolean(), op, value)
+        return _compare(accessor.as_float() if numeric else accessor.as_string(), op, value)
+
+    expression = literal_column(inlined)
+    if dialect == "postgresql" and isinstance(value, bool):
+        value = "true" if value else "false"
+    condition = _compare(expression, op, value)
+    if dialect == "sqlite" and numeric and op != "eq":
+        # SQLite orders text after numbers; keep ranges to numeric values
+        condition = and_(condition, literal_column(f"json_type(events.metadata, '$.{path}')").in_(("integer", "real")))
+    return condition
+
+
+def index_name(path: str) -> str:
+    # A digest, not the path itself: identifiers may contain "__", so "a.b" -> "a__b" would collide
+    return "ix_events_details_" + hashlib.sha1(path.encode()).hexdigest()[:16]
+
+
+def _legacy_index_name(path: str) -> str:
+    """Name earlier releases gave the index (dots as ``__``)."""
+    return "ix_events_details_" + path.replace(".", "__")
+
+
+def create_details_index(connection: Connection, path: str, value_type: str = "string") -> Optional[str]:
+    """Create the expression index for a hot path; returns its name, None if unsupported here."""
+    expression = _sql_expression(connection.dialect.name, validate_path(path), value_type == "number")
+    if expression is None:
+        return None
+    name = index_name(path)
+    # Index expressions are written unqualified
+    connection.execute(text(
+        f"CREATE INDEX IF NOT EXISTS {name} ON events (({expression.replace('events.metadata', 'metadata')}))"
+    ))
+    return name
+
+
+def drop_details_index(connection: Connection, path: str) -> None:
+    if connection.dialect.name in INDEXED_DIALECTS:
+        connection.execute(text(f"DROP INDEX IF EXISTS {index_name(validate_path(path))}"))
+
+
+def ensure_details_indexes(engine) -> List[str]:
+    """(Re)create the expression index of every declared hot path; returns the index names."""
+    names = []
+    with engine.begin() as connection:
+        if connection.dialect.name not in INDEXED_DIALECTS:
+            return names
+        rows = connection.execute(text("SELECT path, value_type FROM details_hot_paths")).all()
+        for path, _ in rows:
+            connection.execute(text(f"DROP INDEX IF EXISTS {_legacy_index_name(validate_path(path))}"))
+        for path, value_type in rows:
+            names.append(create_details_index(connection, path, value_type))
+    return names
@@ -2,30 +2,43 @@
 LDAP authentication service.
 
 Provides flexible LDAP/Active Directory authentication with:
-- Multiple LDAP server support
+- Multiple LDAP server support (latency-aware selection with failover)
 - Automatic user provisioning
 - Group-based role assignment
 - Connection pooling and health checks
 - Comprehensive error handling and logging
 """
 import logging
-from typing import Optional, Dict, List, Tuple
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Iterator, Optional, Dict, List, Tuple, TypeVar
 from datetime import datetime
 
-from ldap3 import Server, Connection, ALL, NTLM, SIMPLE, Tls
+from ldap3 import Server, Connection, DSA, NTLM, SIMPLE, SYNC, Tls
 from ldap3.core.exceptions import (
     LDAPException, 
     LDAPBindError, 
+    LDAPCommunicationError,
     LDAPSocketOpenError,
     LDAPSocketReceiveError,
-    LDAPOperationsErrorResult
+    LDAPOperationsErrorResult,
+    LDAPInvalidCredentialsResult
 )
 import ssl
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+# Cache marker for "no such user" (negative) entries
+_NOT_FOUND = object()
+
+T = TypeVar("T")
+
 
 class LDAPConfig:
     """LDAP configuration with validation and defaults."""
@@ -33,6 +46,7 @@ class LDAPConfig:
     def __init__(self):
         self.enabled = settings.LDAP_ENABLED
         self.server = settings.LDAP_SERVER
+        self.server_list = self._parse_list(getattr(settings, 'LDAP_SERVERS', ''))
         self.port = settings.LDAP_PORT or 389
         self.use_ssl = settings.LDAP_USE_SSL
         self.bind_dn = settings.LDAP_BIND_DN
@@ -41,6 +55,8 @@ class LDAPConfig:
         
         # Additional configuration from environment
         self.timeout = getattr(settings, 'LDAP_TIMEOUT', 10)
+        self.connect_timeout = getattr(settings, 'LDAP_CONNECT_TIMEOUT', 3)
+        self.server_cooldown = getattr(settings, 'LDAP_SERVER_COOLDOWN', 30)
         self.use_ntlm = getattr(settings, 'LDAP_USE_NTLM', False)
         self.user_search_filter = getattr(settings, 'LDAP_USER_SEARCH_FILTER', 
                                           '(sAMAccountName={username})')
@@ -49,6 +65,16 @@ class LDAPConfig:
         self.admin_groups = self._parse_list(getattr(settings, 'LDAP_ADMIN_GROUPS', ''))
         self.allowed_groups = self._parse_list(getattr(settings, 'LDAP_ALLOWED_GROUPS', ''))
         
+        # Service-account connection pool
+        self.pool_size = getattr(settings, 'LDAP_POOL_SIZE', 5)
+        self.pool_max_age = getattr(settings, 'LDAP_POOL_MAX_AGE', 600)
+        self.pool_idle_check = getattr(settings, 'LDAP_POOL_IDLE_CHECK', 60)
+        
+        # User/group lookup cache
+        self.cache_ttl = getattr(settings, 'LDAP_CACHE_TTL', 300)
+        self.negative_cache_ttl = getattr(settings, 'LDAP_NEGATIVE_CACHE_TTL', 60)
+        self.cache_max_entries = getattr(settings, 'LDAP_CACHE_MAX_ENTRIES', 10000)
+        
         # Attributes to retrieve
         self.user_attributes = ['cn', 'mail', 'displayName', 'memberOf', 'sAMAccountName']
         
@@ -59,13 +85,18 @@ class LDAPConfig:
             return []
         return [item.strip() for item in value.split(',') if item.strip()]
     
+    @property
+    def servers(self) -> List[str]:
+        """Directory servers in configured order (LDAP_SERVERS, else LDAP_SERVER)."""
+        return list(self.server_list) or [self.server]
+    
     def is_valid(self) -> Tuple[bool, Optional[str]]:
         """Validate LDAP configuration."""
         if not self.enabled:
             return True, None
             
-        if not self.server:
-            return False, "LDAP_SERVER is required"
+        if not self.server_list and not self.server:
+            return False, "LDAP_SERVER (or LDAP_SERVERS) is required"
         if not self.bind_dn:
             return False, "LDAP_BIND_DN is required"
         if not self.bind_password:
@@ -76,41 +107,392 @@ class LDAPConfig:
         return True, None
 
 
+class _ServerState:
+    """Health and latency bookkeeping for one directory server."""
+    
+    def __init__(self, server: Server, position: int):
+        self.server = server
+        self.position = position
+        self.latency_ms: Optional[float] = None
+        self.failures = 0
+        self.down_until = 0.0
+        self.last_error: Optional[str] = None
+
+
+class LDAPServerPool:
+    """
+    Routes directory traffic to the fastest healthy server.
+    
+    Each server keeps an exponentially weighted average of recent round
+    trips. Healthy servers are tried fastest first (unmeasured servers
+    first, so every server gets measured). A server that fails with a
+    communication error is skipped for ``cooldown`` seconds and is only
+    tried again as a last resort, so a dead or hung domain controller costs
+    at most one connect timeout.
+    """
+    
+    def __init__(self, servers: List[Server], cooldown: float = 30, smoothing: float = 0.3):
+        self._states = [_ServerState(server, i) for i, server in enumerate(servers)]
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._states)
+    
+    def _state(self, server: Server) -> Optional[_ServerState]:
+        for state in self._states:
+            if state.server is server:
+                return state
+        return None
+    
+    def ordered(self) -> List[Server]:
+        """Servers in the order they should be tried."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [s for s in self._states if s.down_until <= now]
+            down = [s for s in self._states if s.down_until > now]
+            healthy.sort(key=lambda s: (s.latency_ms is not None, s.latency_ms or 0.0, s.position))
+            down.sort(key=lambda s: s.down_until)
+        return [s.server for s in healthy + down]
+    
+    def is_available(self, server: Server) -> bool:
+        """False while ``server`` is cooling down after a failure."""
+        state = self._state(server)
+        return state is None or state.down_until <= time.monotonic()
+    
+    def record_success(self, server: Server, latency_ms: float) -> None:
+        state = self._state(server)
+        if state is None:
+            return
+        with self._lock:
+            if state.latency_ms is None:
+                state.latency_ms = latency_ms
+            else:
+                state.latency_ms += self.smoothing * (latency_ms - state.latency_ms)
+            state.failures = 0
+            state.down_until = 0.0
+    
+    def record_failure(self, server: Server, error: Optional[Exception] = None) -> None:
+        state = self._state(server)
+        if state is None:
+            return
+        with self._lock:
+            state.failures += 1
+            state.down_until = time.monotonic() + self.cooldown
+            state.last_error = str(error) if error else None
+        metrics.inc("ldap.server.failures")
+        logger.warning(f"LDAP server {server} marked unavailable for {self.cooldown}s: {error}")
+    
+    def stats(self) -> List[Dict]:
+        """Per-server health and latency."""
+        now = time.monotonic()
+        return [
+            {
+                "server": str(s.server.name),
+                "healthy": s.down_until <= now,
+                "latency_ms": round(s.latency_ms, 3) if s.latency_ms is not None else None,
+                "failures": s.failures,
+                "last_error": s.last_error,
+            }
+            for s in self._states
+        ]
+
+
+class LDAPPoolExhausted(LDAPException):
+    """Raised when no pooled service connection became free in time."""
+
+
+class LDAPConnectionPool:
+    """
+    Bounded pool of connections already bound as the service account.
+    
+    Connections are reused LIFO so the hottest ones stay warm. On checkout a
+    connection older than ``max_age`` is recycled, and one idle longer than
+    ``idle_check`` seconds is probed with ``probe`` before being handed out.
+    A connection that raised during use, or that ``validator`` rejects
+    (e.g. its server is cooling down), is discarded instead of reused.
+    """
+    
+    def __init__(
+        self,
+        factory: Callable[[], Connection],
+        probe: Callable[[Connection], None],
+        size: int = 5,
+        max_age: float = 600,
+        idle_check: float = 60,
+        checkout_timeout: float = 10,
+        validator: Optional[Callable[[Connection], bool]] = None,
+    ):
+        self._factory = factory
+        self._probe = probe
+        self._validator = validator
+        self.size = max(1, size)
+        self.max_age = max_age
+        self.idle_check = idle_check
+        self.checkout_timeout = checkout_timeout
+        self._idle: Deque[Tuple[Connection, float, float]] = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._in_use = 0
+        self.created = 0
+        self.recycled = 0
+        self.discarded = 0
+    
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """Check out a bound service connection for the duration of the block."""
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            metrics.inc("ldap.pool.exhausted")
+            raise LDAPPoolExhausted("No LDAP service connection available")
+        try:
+            conn, created_at = self._checkout()
+            with self._lock:
+                self._in_use += 1
+            try:
+                yield conn
+            except Exception:
+                self._discard(conn)
+                raise
+            else:
+                with self._lock:
+                    self._idle.append((conn, created_at, time.monotonic()))
+            finally:
+                with self._lock:
+                    self._in_use -= 1
+        finally:
+            self._slots.release()
+    
+    def _checkout(self) -> Tuple[Connection, float]:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, created_at, last_used = self._idle.pop()
+            if now - created_at > self.max_age:
+                self.recycled += 1
+                metrics.inc("ldap.pool.recycled")
+                self._close(conn)
+                continue
+            if conn.closed or not conn.bound or (self._validator and not self._validator(conn)):
+                self._discard(conn)
+                continue
+            if now - last_used > self.idle_check:
+                try:
+                    self._probe(conn)
+                except LDAPException as e:
+                    logger.info(f"Discarding stale LDAP connection: {e}")
+                    self._discard(conn)
+                    continue
+            return conn, created_at
+        
+        conn = self._factory()
+        self.created += 1
+        metrics.inc("ldap.pool.created")
+        return conn, time.monotonic()
+    
+    def _discard(self, conn: Connection) -> None:
+        self.discarded += 1
+        metrics.inc("ldap.pool.discarded")
+        self._close(conn)
+    
+    @staticmethod
+    def _close(conn: Connection) -> None:
+        try:
+            if conn.bound:
+                conn.unbind()
+        except LDAPException:
+            pass
+    
+    def close(self) -> None:
+        """Unbind and drop all idle connections."""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _, _ in idle:
+            self._close(conn)
+    
+    def stats(self) -> Dict[str, int]:
+        """Pool occupancy and lifecycle counters."""
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "created": self.created,
+            "recycled": self.recycled,
+            "discarded": self.discarded,
+        }
+
+
 class LDAPService:
     """LDAP authentication and user management service."""
     
-    def __init__(self):
+    def __init__(self, client_strategy: str = SYNC):
         self.config = LDAPConfig()
-        self._server: Optional[Server] = None
+        # ldap3 client strategy; tests and benchmarks use MOCK_SYNC
+        self.client_strategy = client_strategy
+        self._server_pool: Optional[LDAPServerPool] = None
+        self._pool: Optional[LDAPConnectionPool] = None
+        self._pool_lock = threading.Lock()
         self._last_health_check: Optional[datetime] = None
         self._health_check_interval = 300  # 5 minutes
         
+        # Lookup caches; the user's password bind is never cached
+        self._user_cache = TTLCache(
+            maxsize=self.config.cache_max_entries,
+            ttl=self.config.cache_ttl,
+            name="ldap_users",
+        )
+        self._group_cache = TTLCache(
+            maxsize=self.config.cache_max_entries,
+            ttl=self.config.cache_ttl,
+            name="ldap_groups",
+        )
+        
+    def _build_server(self, host: str) -> Server:
+        """Create an ldap3 Server for one configured host or URL."""
+        tls_config = None
+        if self.config.use_ssl:
+            tls_config = Tls(validate=ssl.CERT_REQUIRED)
+        
+        # Only DSA info is needed; it is read once on the first service
+        # bind and then cached on the Server object (no schema download).
+        server = Server(
+            host,
+            port=self.config.port,
+            use_ssl=self.config.use_ssl,
+            tls=tls_config,
+            get_info=DSA,
+            connect_timeout=self.config.connect_timeout
+        )
+        logger.info(f"LDAP server initialized: {host}:{self.config.port}")
+        return server
+    
+    def _get_server_pool(self) -> LDAPServerPool:
+        """Get or create the health/latency-tracking server pool."""
+        if self._server_pool is None:
+            with self._pool_lock:
+                if self._server_pool is None:
+                    self._server_pool = LDAPServerPool(
+                        [self._build_server(host) for host in self.config.servers],
+                        cooldown=self.config.server_cooldown,
+                    )
+        return self._server_pool
+    
     def _get_server(self) -> Server:
-        """Get or create LDAP server instance."""
-        if self._server is None:
-            tls_config = None
-            if self.config.use_ssl:
-                tls_config = Tls(validate=ssl.CERT_REQUIRED)
-            
-            self._server = Server(
-                self.config.server,
-                port=self.config.port,
-                use_ssl=self.config.use_ssl,
-                tls=tls_config,
-                get_info=ALL,
-                connect_timeout=self.config.timeout
-            )
-            logger.info(f"LDAP server initialized: {self.config.server}:{self.config.port}")
+        """Get the currently preferred LDAP server."""
+        return self._get_server_pool().ordered()[0]
+    
+    def _get_pool(self) -> LDAPConnectionPool:
+        """Get or create the service-account connection pool."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = LDAPConnectionPool(
+                        factory=self._create_service_connection,
+                        probe=self._probe_connection,
+                        size=self.config.pool_size,
+                        max_age=self.config.pool_max_age,
+                        idle_check=self.config.pool_idle_check,
+                        checkout_timeout=self.config.timeout,
+                        validator=lambda conn: self._get_server_pool().is_available(conn.server),
+                    )
+        return self._pool
+    
+    def _bind_with_failover(
+        self,
+        user_dn: Optional[str] = None,
+        password: Optional[str] = None,
+        read_server_info: bool = False
+    ) -> Tuple[Connection, bool]:
+        """
+        Bind against the best available server, failing over on network errors.
+        
+        Returns tuple of (connection, bound). Credential errors are raised
+        as-is since another server would give the same answer.
+        """
+        servers = self._get_server_pool()
+        last_error: Optional[Exception] = None
+        
+        for server in servers.ordered():
+            conn = self._create_connection(user_dn, password, server=server)
+            started = time.perf_counter()
+            try:
+                # Read server info only until it has been cached on the Server object
+                bound = conn.bind(read_server_info=read_server_info and server.info is None)
+            except LDAPCommunicationError as e:
+                servers.record_failure(server, e)
+                metrics.inc("ldap.failover")
+                last_error = e
+                continue
+            except LDAPException:
+                servers.record_success(server, (time.perf_counter() - started) * 1000)
+                raise
+            servers.record_success(server, (time.perf_counter() - started) * 1000)
+            return conn, bound
+        
+        raise last_error or LDAPSocketOpenError("No LDAP server available")
+    
+    def _create_service_connection(self) -> Connection:
+        """Open and bind a new service-account connection for the pool."""
+        conn, bound = self._bind_with_failover(read_server_info=True)
+        if not bound:
+            raise LDAPBindError(f"Service account bind failed: {conn.result}")
+        return conn
+    
+    def _with_service_connection(self, operation: Callable[[Connection], T]) -> T:
+        """
+        Run ``operation`` on a pooled service connection.
         
-        return self._server
+        If the server drops or times out mid-operation it is marked down and
+        the operation is retried once per remaining server.
+        """
+        servers = self._get_server_pool()
+        pool = self._get_pool()
+        attempts = max(1, len(servers))
+        
+        for attempt in range(attempts):
+            used: Optional[Connection] = None
+            try:
+                with pool.connection() as conn:
+                    used = conn
+                    started = time.perf_counter()
+                    result = operation(conn)
+                    servers.record_success(conn.server, (time.perf_counter() - started) * 1000)
+                    return result
+            except LDAPCommunicationError as e:
+                if used is None or attempt == attempts - 1:
+                    raise
+                servers.record_failure(used.server, e)
+                metrics.inc("ldap.failover")
+        
+        raise LDAPSocketOpenError("No LDAP server available")
+    
+    def _probe_connection(self, conn: Connection) -> None:
+        """Cheap liveness check for an idle pooled connection."""
+        conn.search(
+            search_base=self.config.search_base,
+            search_filter='(objectClass=*)',
+            search_scope='BASE',
+            attributes=['objectClass']
+        )
+    
+    def reset_pool(self) -> None:
+        """Close pooled connections and forget server health (e.g. after config changes)."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+            self._server_pool = None
+        if pool is not None:
+            pool.close()
     
     def _create_connection(
         self, 
         user_dn: Optional[str] = None, 
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        server: Optional[Server] = None
     ) -> Connection:
         """Create LDAP connection with appropriate authentication."""
-        server = self._get_server()
+        server = server or self._get_server()
         
         # Use service account credentials if not provided
         bind_user = user_dn or self.config.bind_dn
@@ -125,6 +507,7 @@ class LDAPService:
             password=bind_pass,
             authentication=authentication,
             auto_bind=False,
+            client_strategy=self.client_strategy,
             raise_exceptions=True,
             receive_timeout=self.config.timeout
         )
@@ -154,25 +537,8 @@ class LDAPService:
             }
         
         try:
-            conn = self._create_connection()
-            
-            # Try to bind
-            if not conn.bind():
-                return {
-                    "status": "error",
-                    "message": f"Bind failed: {conn.result}",
-                    "healthy": False
-                }
-            
-            # Try a simple search to verify connectivity
-            conn.search(
-                search_base=self.config.search_base,
-                search_filter='(objectClass=*)',
-                search_scope='BASE',
-                attributes=['objectClass']
-            )
-            
-            conn.unbind()
+            # Verify connectivity with a simple search on a pooled connection
+            self._with_service_connection(self._probe_connection)
             
             self._last_health_check = datetime.utcnow()
             
@@ -180,10 +546,13 @@ class LDAPService:
                 "status": "ok",
                 "message": "LDAP server is reachable and responding",
                 "healthy": True,
-                "server": self.config.server,
+                # Preferred server right now; LDAP_SERVER alone is unset with LDAP_SERVERS
+                "server": str(self._get_server().name),
                 "port": self.config.port,
                 "ssl": self.config.use_ssl,
-                "last_check": self._last_health_check.isoformat()
+                "last_check": self._last_health_check.isoformat(),
+                "pool": self._get_pool().stats(),
+                "servers": self._get_server_pool().stats()
             }
             
         except LDAPSocketOpenError as e:
@@ -243,10 +612,10 @@ class LDAPService:
                     logger.warning(f"User {username} not in allowed groups")
                     return False, None, "User not authorized (group membership required)"
             
-            # Attempt to bind with user's credentials
-            conn = self._create_connection(user_dn, password)
-            
-            if not conn.bind():
+            # Attempt to bind with user's credentials (always a fresh, live bind)
+            with self._timed("ldap.user_bind_ms"):
+                conn, bound = self._bind_with_failover(user_dn, password)
+            if not bound:
                 logger.warning(f"LDAP bind failed for user: {username}")
                 return False, None, "Invalid credentials"
             
@@ -255,7 +624,7 @@ class LDAPService:
             logger.info(f"LDAP authentication successful for user: {username}")
             return True, user_info, None
             
-        except LDAPBindError as e:
+        except (LDAPBindError, LDAPInvalidCredentialsResult) as e:
             # Bind errors typically mean invalid credentials
             logger.warning(f"Invalid credentials for user: {username}")
             return False, None, "Invalid credentials"
@@ -273,66 +642,107 @@ class LDAPService:
         """
         Find user in LDAP directory using service account.
         
+        Results (including "no such user") are cached for a short TTL;
+        directory errors are never cached.
+        
         Returns tuple of (user_dn, user_info_dict)
         """
+        key = username.lower()
+        cached = self._user_cache.get(key)
+        if cached is _NOT_FOUND:
+            metrics.inc("ldap.cache.user.negative_hit")
+            return None, None
+        if cached is not None:
+            user_dn, user_info = cached
+            return user_dn, {**user_info, 'groups': list(user_info['groups'])}
+        
+        try:
+            user_dn, user_info = self._search_user(username)
+        except LDAPBindError as e:
+            logger.error(f"Service account bind failed: {e}")
+            return None, None
+        except LDAPException as e:
+            logger.error(f"Error finding user {username}: {e}")
+            return None, None
+        
+        if not user_dn:
+            self._user_cache.set(key, _NOT_FOUND, ttl=self.config.negative_cache_ttl)
+            return None, None
+        
+        self._user_cache.set(key, (user_dn, user_info))
+        logger.info(f"Found user in LDAP: {username} -> {user_dn}")
+        return user_dn, {**user_info, 'groups': list(user_info['groups'])}
+    
+    def _search_user(self, username: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """Run the user search against the directory (uncached)."""
         # Handle email format
         if '@' in username:
             search_filter = f'(mail={username})'
         else:
             search_filter = self.config.user_search_filter.format(username=username)
         
-        conn = self._create_connection()
-        
-        try:
-            if not conn.bind():
-                logger.error(f"Service account bind failed: {conn.result}")
-                return None, None
-            
-            # Search for user
+        def _search(conn: Connection) -> list:
             conn.search(
                 search_base=self.config.search_base,
                 search_filter=search_filter,
                 search_scope='SUBTREE',
                 attributes=self.config.user_attributes
             )
-            
-            if not conn.entries:
-                return None, None
-            
-            # Get first matching entry
-            entry = conn.entries[0]
-            user_dn = entry.entry_dn
-            
-            # Extract user information
-            user_info = {
-                'dn': user_dn,
-                'username': str(entry.sAMAccountName) if hasattr(entry, 'sAMAccountName') else username,
-                'email': str(entry.mail) if hasattr(entry, 'mail') else None,
-                'full_name': str(entry.displayName) if hasattr(entry, 'displayName') else str(entry.cn) if hasattr(entry, 'cn') else None,
-                'groups': []
-            }
-            
-            # Extract group memberships
-            if hasattr(entry, 'memberOf'):
-                user_info['groups'] = [self._extract_cn_from_dn(dn) for dn in entry.memberOf]
-            
-            # Determine if user should be admin based on group membership
-            user_info['is_admin'] = any(
-                group in user_info['groups'] 
-                for group in self.config.admin_groups
-            ) if self.config.admin_groups else False
-            
-            conn.unbind()
-            
-            logger.info(f"Found user in LDAP: {username} -> {user_dn}")
-            return user_dn, user_info
-            
-        except LDAPException as e:
-            logger.error(f"Error finding user {username}: {e}")
+            return list(conn.entries)
+        
+        with self._timed("ldap.search_user_ms"):
+            entries = self._with_service_connection(_search)
+        
+        if not entries:
             return None, None
+        
+        # Get first matching entry
+        entry = entries[0]
+        user_dn = entry.entry_dn
+        
+        # Extract user information
+        user_info = {
+            'dn': user_dn,
+            'username': str(entry.sAMAccountName) if hasattr(entry, 'sAMAccountName') else username,
+            'email': str(entry.mail) if hasattr(entry, 'mail') else None,
+            'full_name': str(entry.displayName) if hasattr(entry, 'displayName') else str(entry.cn) if hasattr(entry, 'cn') else None,
+            'groups': []
+        }
+        
+        # Extract group memberships
+        if hasattr(entry, 'memberOf'):
+            user_info['groups'] = [self._extract_cn_from_dn(dn) for dn in entry.memberOf]
+        
+        # Determine if user should be admin based on group membership
+        user_info['is_admin'] = any(
+            group in user_info['groups'] 
+            for group in self.config.admin_groups
+        ) if self.config.admin_groups else False
+        
+        return user_dn, user_info
+    
+    @contextmanager
+    def _timed(self, metric: str) -> Iterator[None]:
+        """Record directory round-trip latency under ``metric``."""
+        started = time.perf_counter()
+        try:
+            yield
         finally:
-            if conn.bound:
-                conn.unbind()
+            metrics.observe(metric, (time.perf_counter() - started) * 1000)
+    
+    def flush_cache(self) -> int:
+        """Drop cached user and group lookups; returns the number of entries dropped."""
+        dropped = len(self._user_cache) + len(self._group_cache)
+        self._user_cache.clear()
+        self._group_cache.clear()
+        return dropped
+    
+    def cache_stats(self) -> Dict[str, Dict]:
+        """Hit-rate and size counters for the lookup caches."""
+        return {
+            "users": self._user_cache.stats(),
+            "groups": self._group_cache.stats(),
+        }
     
     @staticmethod
     def _extract_cn_from_dn(dn: str) -> str:
@@ -345,35 +755,41 @@ class LDAPService:
         return dn
     
     def get_user_groups(self, user_dn: str) -> List[str]:
-        """Get list of groups for a user."""
-        conn = self._create_connection()
+        """Get list of groups for a user (cached for a short TTL)."""
+        key = user_dn.lower()
+        cached = self._group_cache.get(key)
+        if cached is not None:
+            return list(cached)
         
         try:
-            if not conn.bind():
-                return []
-            
             # Search for groups containing this user
             group_filter = self.config.group_search_filter.format(user_dn=user_dn)
             
-            conn.search(
-                search_base=self.config.search_base,
-                search_filter=group_filter,
-                search_scope='SUBTREE',
-                attributes=['cn']
-            )
+            def _search(conn: Connection) -> List[str]:
+                conn.search(
+                    search_base=self.config.search_base,
+                    search_filter=group_filter,
+                    search_scope='SUBTREE',
+                    attributes=['cn']
+                )
+                return [str(entry.cn) for entry in conn.entries]
             
-            groups = [str(entry.cn) for entry in conn.entries]
-            conn.unbind()
+            with self._timed("ldap.search_groups_ms"):
+                groups = self._with_service_connection(_search)
             
+            self._group_cache.set(key, tuple(groups))
             return groups
             
         except LDAPException as e:
             logger.error(f"Error getting groups for {user_dn}: {e}")
             return []
-        finally:
-            if conn.bound:
-                conn.unbind()
 
 
 # Global LDAP service instance
 ldap_service = LDAPService()
+metrics.register_collector("ldap_cache", ldap_service.cache_stats)
+
+
+def get_ldap_service() -> LDAPService:
+    """The global LDAP service, looked up at call time (patch ``ldap_service`` in tests)."""
+    return ldap_service
@@ -0,0 +1,228 @@
+"""
+Leader election for background work.
+
+Every worker process runs the FastAPI lifespan, so without coordination
+``gunicorn -w 8`` would poll Jenkins and run the retention job eight times.
+``start_leader_jobs`` runs a small supervisor per process instead: it keeps
+trying to become leader and only the leader starts the jobs. If leadership
+is lost (lease stolen after a stall, database unreachable) the jobs are
+stopped; when the leader exits another process takes over.
+
+Backends (``LEADER_ELECTION``):
+
+- ``none``: every process is leader (single-worker deployments, default)
+- ``file``: exclusive ``flock`` on ``LEADER_LOCK_FILE``; the OS drops it when
+  the holder dies, so takeover happens on the next retry. One host only.
+- ``database``: a row in ``leases`` renewed every ``LEADER_LEASE_SECONDS / 3``;
+  others take over once it expires (or immediately after a clean shutdown).
+  Works across hosts sharing the database; assumes roughly synced clocks.
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import case, insert, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE = "background-jobs"
+
+
+def holder_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class AlwaysLeader:
+    """``LEADER_ELECTION=none``: no coordination."""
+
+    retry_seconds = 60.0
+
+    def try_acquire(self) -> bool:
+        return True
+
+    def release(self) -> None:
+        pass
+
+
+class FileLease:
+    """Exclusive, non-blocking lock on a file; held until released or the process dies."""
+
+    def __init__(self, path: str, retry_seconds: float = 2.0):
+        self.path = path
+        self.retry_seconds = retry_seconds
+        self._fh = None
+
+    def try_acquire(self) -> bool:
+        if self._fh is not None:
+            return True
+        fh = open(self.path, "a+")
+        try:
+            _lock_file(fh)
+        except OSError:
+            fh.close()
+            return False
+        fh.seek(0)
+        fh.truncate()
+        fh.write(f"{os.getpid()}\n")
+        fh.flush()
+        self._fh = fh
+        return True
+
+    def release(self) -> None:
+        if self._fh is None:
+            return
+        with suppress(OSError):
+            _unlock_file(self._fh)
+        self._fh.close()
+        self._fh = None
+
+
+def _lock_file(fh) -> None:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows
+        import msvcrt
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        return
+    fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _unlock_file(fh) -> None:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows
+        import msvcrt
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+class DatabaseLease:
+    """Heartbeat lease in the ``leases`` table; acquire and renew are one conditional UPDATE."""
+
+    def __init__(self, engine: Engine, name: str = DEFAULT_LEASE, lease_seconds: int = 15, holder: Optional[str] = None):
+        self.engine = engine
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.retry_seconds = max(lease_seconds / 3, 1.0)
+        self.holder = holder or holder_id()
+
+    def try_acquire(self) -> bool:
+        from app.models.lease import Lease
+
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        with self.engine.begin() as connection:
+            renewed = connection.execute(
+                update(Lease)
+                .where(Lease.name == self.name, or_(Lease.holder == self.holder, Lease.expires_at < now))
+                .values(
+                    holder=self.holder,
+                    expires_at=expires_at,
+                    acquired_at=case((Lease.holder == self.holder, Lease.acquired_at), else_=now),
+                )
+            ).rowcount
+            if renewed:
+                return True
+            if connection.execute(select(Lease.name).where(Lease.name == self.name)).first():
+                return False
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(
+                    insert(Lease).values(name=self.name, holder=self.holder, acquired_at=now, expires_at=expires_at)
+                )
+        except IntegrityError:
+            return False  # another process created it first
+        return True
+
+    def release(self) -> None:
+        """Expire our lease now so a follower takes over on its next retry."""
+        from app.models.lease import Lease
+
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(Lease)
+                .where(Lease.name == self.name, Lease.holder == self.holder)
+                .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+            )
+
+
+def build_elector(engine: Optional[Engine] = None):
+    backend = settings.LEADER_ELECTION.lower()
+    if backend == "none":
+        return AlwaysLeader()
+    if backend == "file":
+        return FileLease(settings.LEADER_LOCK_FILE)
+    if backend == "database":
+        if engine is None:
+            from app.core.database import engine
+        return DatabaseLease(engine, lease_seconds=max(settings.LEADER_LEASE_SECONDS, 3))
+    raise ValueError(f"Unknown LEADER_ELECTION backend: {settings.LEADER_ELECTION!r} (none, file, database)")
+
+
+async def _supervise(
+    elector,
+    stop_event: asyncio.Event,
+    start_jobs: Callable[[], Any],
+    stop_jobs: Callable[[Any], Awaitable[None]],
+):
+    jobs = None
+    try:
+        while not stop_event.is_set():
+            try:
+                leader = await asyncio.to_thread(elector.try_acquire)
+            except Exception:
+                # Cannot confirm the lease: step down rather than risk two leaders
+                logger.exception("Leader election failed")
+                leader = False
+
+            if leader and jobs is None:
+                logger.info("Elected leader (%s); starting background jobs", type(elector).__name__)
+                metrics.inc("leader.elected")
+                metrics.set_gauge("leader.is_leader", 1)
+                jobs = start_jobs()
+            elif not leader and jobs is not None:
+                logger.warning("Lost leadership; stopping background jobs")
+                metrics.set_gauge("leader.is_leader", 0)
+                await stop_jobs(jobs)
+                jobs = None
+
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=elector.retry_seconds)
+            except asyncio.TimeoutError:
+                continue
+    finally:
+        if jobs is not None:
+            await stop_jobs(jobs)
+            metrics.set_gauge("leader.is_leader", 0)
+        with suppress(Exception):
+            await asyncio.to_thread(elector.release)
+
+
+def start_leader_jobs(
+    stop_event: asyncio.Event,
+    start_jobs: Callable[[], Any],
+    stop_jobs: Callable[[Any], Awaitable[None]],
+    elector=None,
+) -> asyncio.Task:
+    """Run ``start_jobs()`` while this process is leader; ``stop_jobs(result)`` when it stops being one."""
+    return asyncio.create_task(_supervise(elector or build_elector(), stop_event, start_jobs, stop_jobs))
+
+
+async def stop_leader_jobs(task: Optional[asyncio.Task], stop_event: asyncio.Event):
+    """Signal stop, stop the jobs if leader, and release the lease."""
+    stop_event.set()
+    if task:
+        await task
@@ -0,0 +1,103 @@
+"""
+Lightweight in-process metrics registry.
+
+Counters, gauges and latency timers are kept in memory per worker and
+exposed to administrators through ``GET /api/metrics``. Timers keep a
+bounded reservoir of recent samples so percentiles stay cheap.
+"""
+import math
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict
+
+_TIMER_RESERVOIR = 2048
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, gauges, timers and collectors."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._timers: Dict[str, Deque[float]] = {}
+        self._timer_counts: Dict[str, int] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def inc(self, name: str, value: float = 1) -> None:
+        """Increment counter ``name`` by ``value``."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set gauge ``name`` to ``value``."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, millis: float) -> None:
+        """Record a latency sample (milliseconds) for timer ``name``."""
+        with self._lock:
+            samples = self._timers.get(name)
+            if samples is None:
+                samples = self._timers[name] = deque(maxlen=_TIMER_RESERVOIR)
+            samples.append(millis)
+            self._timer_counts[name] = self._timer_counts.get(name, 0) + 1
+
+    def register_collector(self, name: str, collector: Callable[[], Dict[str, Any]]) -> None:
+        """Register a callable whose dict output is included in snapshots."""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def counter(self, name: str) -> float:
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable view of all metrics."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            timers = {name: list(samples) for name, samples in self._timers.items()}
+            timer_counts = dict(self._timer_counts)
+            collectors = dict(self._collectors)
+
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "timers": {
+                name: summarize(samples, total=timer_counts.get(name, len(samples)))
+                for name, samples in timers.items()
+            },
+            **{name: collector() for name, collector in collectors.items()},
+        }
+
+    def reset(self) -> None:
+        """Clear recorded values (collectors stay registered)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timers.clear()
+            self._timer_counts.clear()
+
+
+def percentile(sorted_samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, math.ceil(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples: list, total: int | None = None) -> Dict[str, float]:
+    """Summarize latency samples as count/p50/p95/p99/max (milliseconds)."""
+    ordered = sorted(samples)
+    return {
+        "count": total if total is not None else len(ordered),
+        "p50": round(percentile(ordered, 0.50), 3),
+        "p95": round(percentile(ordered, 0.95), 3),
+        "p99": round(percentile(ordered, 0.99), 3),
+        "max": round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+# Global registry instance
+metrics = MetricsRegistry()
@@ -0,0 +1,135 @@
+"""
+Migration-aware boot.
+
+Workers no longer run ``SQLModel.metadata.create_all`` on every start (one
+catalogue probe per table, per worker). ``prepare_database`` instead compares
+the database's Alembic revision with the head of ``alembic/versions``:
+
+- at head: nothing to do (one query);
+- empty database: create the schema and record the head revision, when
+  ``DATABASE_AUTO_CREATE`` allows it (SQLite uses ``create_all``, other
+  backends run the migrations so e.g. native partitioning is set up);
+- tables but no ``alembic_version`` (created by releases before Alembic): stamp
+  them at ``LEGACY_REVISION``, the schema those releases created, and run the
+  migrations from there; refuse to start if the baseline tables are incomplete;
+- behind or unknown revision: refuse to start and say how to fix it.
+"""
+import logging
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+VERSION_TABLE = "alembic_version"
+# Schema that create_all produced before the app tracked revisions, and its tables
+LEGACY_REVISION = "202511200001"
+LEGACY_TABLES = (
+    "users", "personal_access_tokens", "items", "agents", "tools", "toolchains", "tags",
+    "events", "event_agents", "event_tools", "event_tags", "toolchain_tools",
+)
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database is not at the schema revision this code expects."""
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return config
+
+
+def _script_directory():
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(_alembic_config())
+
+
+def head_revision() -> str:
+    """Head revision of the migration scripts shipped with this code."""
+    return _script_directory().get_current_head()
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """Revision recorded in the database, or None if it has never been stamped."""
+    if not inspect(connection).has_table(VERSION_TABLE):
+        return None
+    return connection.execute(text(f"SELECT version_num FROM {VERSION_TABLE}")).scalar()
+
+
+def _stamp(connection: Connection, revision: str) -> None:
+    from alembic.migration import MigrationContext
+
+    MigrationContext.configure(connection).stamp(_script_directory(), revision)
+
+
+def _upgrade(connection: Connection) -> None:
+    from alembic import command
+
+    config = _alembic_config()
+    config.attributes["configure_logger"] = False
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
+def _create_schema(engine: Engine, head: str) -> None:
+    if engine.dialect.name == "sqlite":
+        # Nothing to backfill: create_all is the same schema without replaying every migration
+        from sqlmodel import SQLModel
+        import app.models  # noqa: F401 - register every table
+
+        with engine.begin() as connection:
+            SQLModel.metadata.create_all(connection)
+            _stamp(connection, head)
+        return
+
+    with engine.begin() as connection:
+        _upgrade(connection)
+
+
+def prepare_database(engine: Engine) -> str:
+    """Make sure the schema is usable; returns what was done (current/created/legacy)."""
+    with engine.connect() as connection:
+        revision = current_revision(connection)
+        has_tables = bool(inspect(connection).get_table_names()) if revision is None else True
+
+    head = head_revision()
+    if revision == head:
+        return "current"
+
+    if revision is None and not has_tables:
+        if not settings.DATABASE_AUTO_CREATE:
+            raise SchemaOutOfDate("Database is empty; run `alembic upgrade head` (DATABASE_AUTO_CREATE is off)")
+        logger.info("Empty database: creating schema at revision %s", head)
+        _create_schema(engine, head)
+        return "created"
+
+    if revision is None:
+        with engine.connect() as connection:
+            missing = sorted(set(LEGACY_TABLES) - set(inspect(connection).get_table_names()))
+        if missing:
+            raise SchemaOutOfDate(
+                f"Database has tables but no Alembic revision, and lacks {', '.join(missing)} of the "
+                f"pre-migration schema; create them, then run `alembic stamp {LEGACY_REVISION}` and "
+                "`alembic upgrade head` before starting the app"
+            )
+        logger.warning(
+            "Database has tables but no Alembic revision; upgrading it from %s to %s", LEGACY_REVISION, head
+        )
+        with engine.begin() as connection:
+            _stamp(connection, LEGACY_REVISION)
+            _upgrade(connection)
+        return "legacy"
+
+    raise SchemaOutOfDate(
+        f"Database schema is at revision {revision} but this release expects {head}; "
+        "run `alembic upgrade head` before starting the app"
+    )
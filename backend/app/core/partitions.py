@@ -0,0 +1,141 @@
+"""
+Month partitioning for events and their link tables.
+
+Every row in ``events``, ``event_agents``, ``event_tools`` and ``event_tags``
+carries ``partition_month`` (``YYYYMM`` of the event timestamp). That column
+is the partition key:
+
+- PostgreSQL: the tables are natively ``PARTITION BY RANGE (partition_month)``
+  (see migration 202511200002). ``ensure_partitions`` creates upcoming months
+  and ``drop_partition`` detaches and drops a month's tables, which is O(1)
+  regardless of how many rows the month holds.
+- SQLite (and other backends) have no per-month storage. Queries still prune
+  on the leading ``partition_month`` index, but dropping a month is a bulk
+  ``DELETE`` per table: it avoids a table scan, yet its cost (and the time the
+  write lock is held) grows with the number of rows in the month. The O(1)
+  drop is PostgreSQL only.
+
+``list_events`` adds ``partition_month`` bounds derived from ``start``/``end``
+so the planner only touches the months in range.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+
+# Children first: dropping a month removes links before their events
+PARTITIONED_TABLES = ("event_agents", "event_tools", "event_tags", "events")
+
+
+def month_key(value: datetime) -> int:
+    """``YYYYMM`` partition key for a timestamp."""
+    return value.year * 100 + value.month
+
+
+def add_months(key: int, months: int) -> int:
+    year, month = divmod(key // 100 * 12 + key % 100 - 1 + months, 12)
+    return year * 100 + month + 1
+
+
+def month_bounds(key: int) -> Tuple[int, int]:
+    """Half-open ``[key, next)`` range bounds for a month partition."""
+    return key, add_months(key, 1)
+
+
+def validate_month(key: int) -> int:
+    if not (100001 <= key <= 999912) or not (1 <= key % 100 <= 12):
+        raise ValueError(f"Invalid partition month {key!r}; expected YYYYMM")
+    return key
+
+
+def partition_name(table: str, key: int) -> str:
+    return f"{table}_p{key}"
+
+
+def is_native(connection: Connection) -> bool:
+    """True if ``events`` is a native (PostgreSQL) partitioned table."""
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(connection.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'events' AND c.relnamespace = to_regnamespace(current_schema())"
+    )).first())
+
+
+def create_month_partitions(connection: Connection, key: int) -> None:
+    """Create the month's partition of every partitioned table (PostgreSQL)."""
+    low, high = month_bounds(key)
+    for table in reversed(PARTITIONED_TABLES):
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(table, key)} "
+            f"PARTITION OF {table} FOR VALUES FROM ({low}) TO ({high})"
+        ))
+
+
+def ensure_partitions(engine: Engine, months_ahead: Optional[int] = None) -> List[int]:
+    """Create partitions for the current month and ``months_ahead`` after it.
+
+    No-op unless the database uses native partitioning. Returns the months
+    covered.
+    """
+    months_ahead = settings.EVENT_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_key(datetime.utcnow())
+    months = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    with engine.begin() as connection:
+        if not is_native(connection):
+            return []
+        for key in months:
+            create_month_partitions(connection, key)
+    return months
+
+
+def list_partitions(connection: Connection) -> List[Dict]:
+    """Months holding events, oldest first, with their row counts."""
+    rows = connection.execute(text(
+        "SELECT partition_month, COUNT(*) FROM events GROUP BY partition_month ORDER BY partition_month"
+    )).all()
+    native = is_native(connection)
+    existing = set()
+    if native:
+        existing = {
+            int(name.rsplit("_p", 1)[1])
+            for (name,) in connection.execute(text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = 'events' AND c.relname ~ '^events_p[0-9]{6}$'"
+            ))
+        }
+    counts = {month: count for month, count in rows if month is not None}
+    return [
+        {"month": month, "events": counts.get(month, 0), "native": month in existing}
+        for month in sorted(set(counts) | existing)
+    ]
+
+
+def drop_partition(connection: Connection, key: int) -> int:
+    """Drop every event (and link) in month ``key``; returns the events removed.
+
+    On PostgreSQL a dedicated month partition is detached and dropped in
+    constant time; only the reported count reads the month's rows. Rows that
+    landed in the default partition, and all rows on SQLite, are removed with
+    a bulk ``DELETE`` per table whose cost grows with the month's row count.
+    """
+    validate_month(key)
+    removed = connection.execute(
+        text("SELECT COUNT(*) FROM events WHERE partition_month = :month"), {"month": key}
+    ).scalar_one()
+
+    if is_native(connection):
+        for table in PARTITIONED_TABLES:
+            name = partition_name(table, key)
+            if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+                connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                connection.execute(text(f"DROP TABLE {name}"))
+
+    for table in PARTITIONED_TABLES:
+        connection.execute(text(f"DELETE FROM {table} WHERE partition_month = :month"), {"month": key})
+    return removed
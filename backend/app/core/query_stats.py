@@ -0,0 +1,140 @@
+"""
+Per-request SQL accounting.
+
+Cursor-execute hooks on every SQLAlchemy ``Engine`` (sync and async alike)
+add each statement's count and duration to the current request's
+``QueryStats``. ``QueryStatsMiddleware`` opens that scope per HTTP request,
+reports it as a ``Server-Timing`` header::
+
+    Server-Timing: db;dur=3.2;desc="4 queries", app;dur=11.8
+
+and hands it to registered observers (the test-suite query budget uses
+this). Statements slower than ``SLOW_QUERY_MS`` are logged with their bound
+parameters redacted.
+
+Sync endpoints run in a worker thread with a copy of the request context,
+so they update the same ``QueryStats`` object. Writes executed on the
+SQLite write lane run on the lane's thread and are not attributed.
+"""
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger("app.sql.slow")
+
+
+class QueryStats:
+    __slots__ = ("count", "duration_ms", "statements")
+
+    def __init__(self, record_statements: bool = False):
+        self.count = 0
+        self.duration_ms = 0.0
+        # Only filled when recording (tests), to show what blew a budget
+        self.statements: Optional[List[str]] = [] if record_statements else None
+
+
+_current: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar("query_stats", default=None)
+_observers: List[Callable[[Scope, QueryStats], None]] = []
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """Count the statements executed in this context (nested scopes restart at zero)."""
+    stats = QueryStats(record_statements)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def add_observer(observer: Callable[[Scope, QueryStats], None]) -> None:
+    """Call ``observer(scope, stats)`` after every HTTP request."""
+    _observers.append(observer)
+
+
+def remove_observer(observer: Callable[[Scope, QueryStats], None]) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def redact_parameters(parameters) -> str:
+    """Describe bound parameters by type only; values may hold secrets or PII."""
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return f"[{len(parameters)} parameter sets]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: <{type(value).__name__}>" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(f"<{type(value).__name__}>" for value in parameters) + ")"
+    return "<redacted>"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration_ms += elapsed_ms
+        if stats.statements is not None:
+            stats.statements.append(statement)
+    if settings.SLOW_QUERY_MS and elapsed_ms >= settings.SLOW_QUERY_MS:
+        metrics.inc("db.slow_queries")
+        logger.warning(
+            "Slow query (%.1f ms): %s | params=%s",
+            elapsed_ms, " ".join(statement.split()), redact_parameters(parameters),
+        )
+
+
+class QueryStatsMiddleware:
+    """Scope SQL accounting to each HTTP request and report it as ``Server-Timing``."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with track_queries(record_statements=bool(_observers)) as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start" and settings.SERVER_TIMING_ENABLED:
+                    total_ms = (time.perf_counter() - started) * 1000
+                    MutableHeaders(scope=message).append(
+                        "server-timing",
+                        f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}',
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                metrics.observe("http.db_queries_per_request", stats.count)
+                for observer in list(_observers):
+                    observer(scope, stats)
@@ -0,0 +1,66 @@
+"""
+Read-replica routing helpers.
+
+When ``DATABASE_READ_URL`` is set, read-only endpoints take their session
+from ``get_read_session``/``get_async_read_session`` and hit the replica.
+Replicas lag, so a client that just wrote can ask for the primary instead:
+
+- send ``X-Read-Primary: true`` on the read, or
+- rely on the ``read_primary_until`` cookie that every successful write
+  sets for ``READ_YOUR_WRITES_SECONDS`` (browsers get this for free).
+"""
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+READ_PRIMARY_HEADER = "x-read-primary"
+READ_PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def prefers_primary(connection: HTTPConnection) -> bool:
+    """True if this request must read from the primary (read-your-writes)."""
+    if connection.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true", "yes"):
+        return True
+    until = connection.cookies.get(READ_PRIMARY_COOKIE)
+    if not until:
+        return False
+    try:
+        return float(until) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """Pin a client to the primary for a short window after it writes."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or not settings.DATABASE_READ_URL
+            or settings.READ_YOUR_WRITES_SECONDS <= 0
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        window = settings.READ_YOUR_WRITES_SECONDS
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = f"{time.time() + window:.3f}"
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{READ_PRIMARY_COOKIE}={until}; Max-Age={window}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
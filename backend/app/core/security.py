@@ -1,17 +1,42 @@
 """Security utilities for password hashing and JWT tokens."""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from typing import Callable, Optional, TypeVar, Union
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlmodel import Session, select
 
 from app.core.config import settings
 from app.core.database import get_session as get_db_session
+from app.core.metrics import metrics
+
+# Password hashing context (using argon2 instead of bcrypt for Python 3.13 compatibility).
+# Hashes created with other parameters are flagged for rehash on next login.
+# Built on first use: passlib/argon2 are heavy imports most worker boots never need.
+_pwd_context = None
+_pwd_context_lock = threading.Lock()
+
+
+def get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        with _pwd_context_lock:
+            if _pwd_context is None:
+                from passlib.context import CryptContext
+
+                _pwd_context = CryptContext(
+                    schemes=["argon2"],
+                    deprecated="auto",
+                    argon2__time_cost=settings.ARGON2_TIME_COST,
+                    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+                    argon2__parallelism=settings.ARGON2_PARALLELISM,
+                )
+    return _pwd_context
 
-# Password hashing context (using argon2 instead of bcrypt for Python 3.13 compatibility)
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
 # JWT settings
 ALGORITHM = settings.ALGORITHM
@@ -21,12 +46,107 @@ ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash uses stale parameters.
+
+    Returns:
+        Tuple of (is_valid, new_hash_or_None)
+    """
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
+
+
+# Password hashing executor.
+# argon2 is deliberately slow and releases the GIL, so it runs on a small
+# dedicated pool instead of the event loop. Work beyond the queue limit is
+# rejected with 503 rather than piling up behind a login burst.
+T = TypeVar("T")
+
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+_hash_pending = 0
+
+
+def _hash_workers() -> int:
+    return settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=_hash_workers(),
+                thread_name_prefix="password-hash",
+            )
+        return _hash_executor
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the hashing executor (called on application shutdown)."""
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=False, cancel_futures=True)
+            _hash_executor = None
+
+
+async def _run_password_op(operation: str, func: Callable[..., T], *args) -> T:
+    """Run a hashing operation on the bounded executor and record latency."""
+    global _hash_pending
+    with _hash_executor_lock:
+        if _hash_pending >= _hash_workers() + settings.PASSWORD_HASH_QUEUE_LIMIT:
+            metrics.inc("password_hash.rejected")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        _hash_pending += 1
+        metrics.set_gauge("password_hash.pending", _hash_pending)
+
+    submitted = time.perf_counter()
+
+    def _timed() -> T:
+        started = time.perf_counter()
+        metrics.observe("password_hash.queue_wait_ms", (started - submitted) * 1000)
+        try:
+            return func(*args)
+        finally:
+            metrics.observe(f"password_hash.{operation}_ms", (time.perf_counter() - started) * 1000)
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), _timed)
+    finally:
+        with _hash_executor_lock:
+            _hash_pending -= 1
+            metrics.set_gauge("password_hash.pending", _hash_pending)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await _run_password_op("verify", verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Verify (and possibly rehash) a password without blocking the event loop."""
+    return await _run_password_op("verify", verify_and_update_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await _run_password_op("hash", get_password_hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -52,6 +172,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         "iat": datetime.utcnow()
     })
     
+    from jose import jwt
+
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -66,6 +188,8 @@ def decode_access_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token payload dict, or None if invalid
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
@@ -131,10 +255,12 @@ def get_current_user_from_pat(
     from app.models.token import PersonalAccessToken
     from app.models.user import User
     from app.core.token_security import hash_token, is_token_expired
-    from app.core.database import get_session
+    from app.core.database import engine
     
     if session is None:
-        session = next(get_session())
+        # Own a session for the lookup instead of leaking a generator-held one
+        with Session(engine) as own_session:
+            return get_current_user_from_pat(credentials, own_session)
     
     # Hash the token and look it up
     token_hash = hash_token(token)
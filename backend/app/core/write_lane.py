@@ -0,0 +1,222 @@
+"""
+Single-writer lane for SQLite.
+
+SQLite allows one writer at a time. When many request sessions commit
+concurrently (webhook ingestion, PAT ``last_used_at`` touches) they queue on
+the database lock and eventually fail with "database is locked". The lane
+funnels those writes through one thread instead: queued jobs are run back to
+back in a single transaction and committed together (group commit), while
+reads keep using their own pooled connections.
+
+Jobs are callables taking a ``Session``. They may call ``session.commit()``
+as the CRUD helpers do; inside the lane that only flushes, and the lane
+commits the whole batch. If any job in a batch fails the batch is rolled
+back and each job is replayed in its own transaction, so one bad write
+never takes its neighbours down with it.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, TypeVar, Union
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _LaneSession(Session):
+    """Session whose ``commit()`` only flushes; the lane commits the batch."""
+
+    def commit(self) -> None:
+        self.flush()
+
+
+class _Job:
+    __slots__ = ("fn", "future", "enqueued_at")
+
+    def __init__(self, fn: Callable[[Session], Any]):
+        self.fn = fn
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class WriteLane:
+    """Runs write jobs on one thread, committing them in batches."""
+
+    def __init__(self, engine: Engine, max_batch: int = 64, max_wait: float = 0.002):
+        self.engine = engine
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="sqlite-write-lane", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Finish queued jobs, then stop the writer thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def submit(self, fn: Callable[[Session], T]) -> "Future[T]":
+        """Queue ``fn`` and return a future resolved once its batch commits."""
+        self.start()
+        job = _Job(fn)
+        self._queue.put(job)
+        return job.future
+
+    def run(self, fn: Callable[[Session], T]) -> T:
+        """Queue ``fn`` and block until it has been committed."""
+        return self.submit(fn).result()
+
+    async def run_async(self, fn: Callable[[Session], T]) -> T:
+        """Queue ``fn`` and await its commit without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn))
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    queued = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if queued is None:
+                    stopping = True
+                    break
+                batch.append(queued)
+            self._process(batch)
+            if stopping:
+                return
+
+    def _process(self, batch: List[_Job]) -> None:
+        jobs = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        if not jobs:
+            return
+        now = time.perf_counter()
+        for job in jobs:
+            metrics.observe("write_lane.queue_wait_ms", (now - job.enqueued_at) * 1000)
+
+        try:
+            results = self._commit(jobs)
+        except Exception as exc:
+            if len(jobs) == 1:
+                jobs[0].future.set_exception(exc)
+                return
+            logger.warning("Write lane batch of %d failed (%s); replaying jobs individually", len(jobs), exc)
+            metrics.inc("write_lane.batch_replays")
+            for job in jobs:
+                try:
+                    result = self._commit([job])[0]
+                except Exception as job_exc:
+                    job.future.set_exception(job_exc)
+                else:
+                    job.future.set_result(result)
+            return
+
+        for job, result in zip(jobs, results):
+            job.future.set_result(result)
+
+    def _commit(self, jobs: List[_Job]) -> List[Any]:
+        started = time.perf_counter()
+        with _LaneSession(self.engine, expire_on_commit=False) as session:
+            try:
+                results = [job.fn(session) for job in jobs]
+                Session.commit(session)
+            except Exception:
+                session.rollback()
+                raise
+        metrics.observe("write_lane.commit_ms", (time.perf_counter() - started) * 1000)
+        metrics.inc("write_lane.commits")
+        metrics.inc("write_lane.jobs", len(jobs))
+        return results
+
+
+_lane: Optional[WriteLane] = None
+_lane_lock = threading.Lock()
+
+
+def get_write_lane() -> Optional[WriteLane]:
+    """The process-wide lane, or None unless ``SQLITE_WRITE_LANE`` is on for a SQLite file."""
+    global _lane
+    if not settings.SQLITE_WRITE_LANE:
+        return None
+    from app.core.database import engine, is_sqlite_file
+
+    if not is_sqlite_file(str(engine.url)):
+        return None
+    with _lane_lock:
+        if _lane is None:
+            _lane = WriteLane(
+                engine,
+                max_batch=settings.SQLITE_WRITE_BATCH_MAX,
+                max_wait=settings.SQLITE_WRITE_BATCH_WAIT_MS / 1000,
+            )
+        return _lane
+
+
+def shutdown_write_lane() -> None:
+    """Drain and stop the process-wide lane (app shutdown)."""
+    global _lane
+    with _lane_lock:
+        lane, _lane = _lane, None
+    if lane is not None:
+        lane.stop()
+
+
+async def run_write(session: Union[Session, AsyncSession], fn: Callable[[Session], T]) -> T:
+    """
+    Run write job ``fn`` on the lane if enabled, otherwise inline on ``session``.
+
+    Results produced on the lane come from another session; return ids (or
+    plain values) and re-load objects through ``session`` if needed.
+    """
+    lane = get_write_lane()
+    if lane is not None:
+        return await lane.run_async(fn)
+    if isinstance(session, AsyncSession):
+        result = await session.run_sync(fn)
+        await session.commit()
+        return result
+    result = fn(session)
+    session.commit()
+    return result
+
+
+def _log_failure(future: Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Background write failed: %s", future.exception())
+
+
+def submit_write(session: Session, fn: Callable[[Session], Any]) -> None:
+    """Fire-and-forget variant of ``run_write`` for writes nobody waits on."""
+    lane = get_write_lane()
+    if lane is not None:
+        lane.submit(fn).add_done_callback(_log_failure)
+        return
+    fn(session)
+    session.commit()
@@ -1,7 +1,9 @@
 """CRUD helpers for agents."""
 from typing import List, Optional
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.crud import agent_tool_state, churn, toolchain_drift
 from app.models.agent import Agent, AgentCreate, AgentUpdate
 
 
@@ -17,6 +19,15 @@ def get_agent(session: Session, agent_id: int) -> Optional[Agent]:
     return session.get(Agent, agent_id)
 
 
+def missing_agent_ids(session: Session, agent_ids: List[int]) -> List[int]:
+    """Ids from ``agent_ids`` with no agent row, checked in one query."""
+    wanted = set(agent_ids)
+    if not wanted:
+        return []
+    found = set(session.exec(select(Agent.id).where(Agent.id.in_(wanted))).all())
+    return [agent_id for agent_id in agent_ids if agent_id not in found]
+
+
 def get_agent_by_name(session: Session, name: str) -> Optional[Agent]:
     return session.exec(select(Agent).where(Agent.name == name)).first()
 
@@ -34,10 +45,39 @@ def update_agent(session: Session, db_agent: Agent, agent_in: AgentUpdate) -> Ag
         setattr(db_agent, key, value)
     session.add(db_agent)
     session.commit()
+    toolchain_drift.invalidate()  # names appear in the report
     session.refresh(db_agent)
     return db_agent
 
 
 def delete_agent(session: Session, db_agent: Agent) -> None:
+    agent_tool_state.forget_agent(session, db_agent.id)
+    churn.forget(session, "agent", db_agent.id)
     session.delete(db_agent)
     session.commit()
+    toolchain_drift.invalidate()
+
+
+# Async variants: same helpers, run on an AsyncSession via run_sync
+async def create_agent_async(session: AsyncSession, agent_in: AgentCreate) -> Agent:
+    return await session.run_sync(create_agent, agent_in)
+
+
+async def get_agent_async(session: AsyncSession, agent_id: int) -> Optional[Agent]:
+    return await session.run_sync(get_agent, agent_id)
+
+
+async def get_agent_by_name_async(session: AsyncSession, name: str) -> Optional[Agent]:
+    return await session.run_sync(get_agent_by_name, name)
+
+
+async def list_agents_async(session: AsyncSession, **filters) -> List[Agent]:
+    return await session.run_sync(list_agents, **filters)
+
+
+async def update_agent_async(session: AsyncSession, db_agent: Agent, agent_in: AgentUpdate) -> Agent:
+    return await session.run_sync(update_agent, db_agent, agent_in)
+
+
+async def delete_agent_async(session: AsyncSession, db_agent: Agent) -> None:
+    return await session.run_sync(delete_agent, db_agent)
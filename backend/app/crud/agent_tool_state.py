@@ -0,0 +1,200 @@
+"""
+Maintenance and queries for the derived ``agent_tool_state`` table.
+
+The event CRUD helpers keep it current incrementally:
+
+- ``detach_event`` (before an event's links, timestamp or existence change)
+  drops the state rows that event set and returns their (agent, tool) pairs;
+- ``apply_event`` (after the change) recomputes those pairs from history and
+  lets the event's current links compete with the stored state, so a new
+  event touching N agents x M tools costs one lookup plus bulk writes.
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, insert, update
+from sqlmodel import Session, select
+
+from app.core.partitions import month_key
+from app.crud import toolchain_drift
+from app.models.agent import EventAgent
+from app.models.agent_tool_state import AgentToolRead, AgentToolState, ToolVersionCount
+from app.models.event import Event
+from app.models.tool import EventTool, Tool
+
+Pair = Tuple[int, int]
+
+
+def detach_event(session: Session, event_id: int) -> Set[Pair]:
+    """Drop state rows set by ``event_id``; pass the result to ``apply_event`` after the change."""
+    pairs = set(session.exec(
+        select(AgentToolState.agent_id, AgentToolState.tool_id).where(AgentToolState.event_id == event_id)
+    ).all())
+    if pairs:
+        session.exec(delete(AgentToolState).where(AgentToolState.event_id == event_id))
+    return pairs
+
+
+def event_pairs(session: Session, event_id: int) -> Set[Pair]:
+    """(agent, tool) pairs ``event_id`` sets a version for."""
+    return set(session.exec(
+        select(EventAgent.agent_id, EventTool.tool_id)
+        .join(EventTool, EventTool.event_id == EventAgent.event_id)
+        .where(EventAgent.event_id == event_id, EventTool.version_to.is_not(None))
+    ).all())
+
+
+def apply_event(
+    session: Session,
+    event: Optional[Event],
+    detached: Iterable[Pair] = (),
+    links: Optional[List[Tuple[int, int, Optional[str]]]] = None,
+) -> None:
+    """
+    Fold ``event``'s current links (None when deleted) and the ``detached`` pairs back into state.
+
+    ``links`` are the event's (agent_id, tool_id, version_to) triples in link
+    order, when the caller already has them; otherwise they are read back.
+    """
+    detached = set(detached)
+    if detached:
+        _recompute_pairs(session, detached)
+    if event is None:
+        return
+
+    if links is None:
+        links = session.exec(
+            select(EventAgent.agent_id, EventTool.tool_id, EventTool.version_to)
+            .join(EventTool, EventTool.event_id == EventAgent.event_id)
+            .where(EventAgent.event_id == event.id)
+            .order_by(EventTool.id)
+        ).all()
+    # Last versioned link per tool wins within one event
+    candidates = {
+        (agent_id, tool_id): version
+        for agent_id, tool_id, version in links
+        if version is not None and (agent_id, tool_id) not in detached
+    }
+    if not candidates:
+        return
+
+    current = {
+        (row.agent_id, row.tool_id): row
+        for row in session.exec(
+            select(AgentToolState).where(
+                AgentToolState.agent_id.in_({agent_id for agent_id, _ in candidates}),
+                AgentToolState.tool_id.in_({tool_id for _, tool_id in candidates}),
+            )
+        ).all()
+    }
+    inserts, updates = [], []
+    for (agent_id, tool_id), version in candidates.items():
+        values = {"agent_id": agent_id, "tool_id": tool_id, "version": version, "since": event.timestamp, "event_id": event.id}
+        state = current.get((agent_id, tool_id))
+        if state is None:
+            inserts.append(values)
+        elif (event.timestamp, event.id) > (state.since, state.event_id):
+            updates.append(values)
+    if inserts:
+        session.exec(insert(AgentToolState), params=inserts)
+    if updates:
+        session.exec(update(AgentToolState), params=updates)
+
+
+def forget_agent(session: Session, agent_id: int) -> None:
+    session.exec(delete(AgentToolState).where(AgentToolState.agent_id == agent_id))
+
+
+def forget_tool(session: Session, tool_id: int) -> None:
+    session.exec(delete(AgentToolState).where(AgentToolState.tool_id == tool_id))
+
+
+def latest_versions(
+    agent_ids: Optional[Iterable[int]] = None,
+    tool_ids: Optional[Iterable[int]] = None,
+    after: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Winning (agent_id, tool_id, version, since, event_id) rows, optionally scoped.
+
+    ``after``/``until`` restrict the events considered to ``after < timestamp <= until``.
+    """
+    rank = func.row_number().over(
+        partition_by=(EventAgent.agent_id, EventTool.tool_id),
+        order_by=(Event.timestamp.desc(), Event.id.desc(), EventTool.id.desc()),
+    )
+    ranked = (
+        select(
+            EventAgent.agent_id,
+            EventTool.tool_id,
+            EventTool.version_to.label("version"),
+            Event.timestamp.label("since"),
+            Event.id.label("event_id"),
+            rank.label("rank"),
+        )
+        .join(EventTool, EventTool.event_id == EventAgent.event_id)
+        .join(Event, Event.id == EventAgent.event_id)
+        .where(EventTool.version_to.is_not(None))
+    )
+    if agent_ids is not None:
+        ranked = ranked.where(EventAgent.agent_id.in_(agent_ids))
+    if tool_ids is not None:
+        ranked = ranked.where(EventTool.tool_id.in_(tool_ids))
+    partitioned = (Event, EventAgent, EventTool)
+    if after is not None:
+        ranked = ranked.where(Event.timestamp > after, *(model.partition_month >= month_key(after) for model in partitioned))
+    if until is not None:
+        ranked = ranked.where(Event.timestamp <= until, *(model.partition_month <= month_key(until) for model in partitioned))
+    ranked = ranked.subquery()
+    return select(ranked.c.agent_id, ranked.c.tool_id, ranked.c.version, ranked.c.since, ranked.c.event_id).where(
+        ranked.c.rank == 1
+    )
+
+
+def _recompute_pairs(session: Session, pairs: Set[Pair]) -> None:
+    rows = session.exec(
+        latest_versions({agent_id for agent_id, _ in pairs}, {tool_id for _, tool_id in pairs})
+    ).all()
+    values = [row._asdict() for row in rows if (row.agent_id, row.tool_id) in pairs]
+    if values:
+        session.exec(insert(AgentToolState), params=values)
+
+
+def rebuild(session: Session) -> int:
+    """Recompute the whole table from event history (after bulk loads that bypass the CRUD helpers)."""
+    session.exec(delete(AgentToolState))
+    latest = latest_versions()
+    session.exec(
+        insert(AgentToolState).from_select(["agent_id", "tool_id", "version", "since", "event_id"], latest)
+    )
+    session.commit()
+    toolchain_drift.invalidate()
+    return session.exec(select(func.count()).select_from(AgentToolState)).one()
+
+
+def list_agent_tools(session: Session, agent_id: int) -> List[AgentToolRead]:
+    rows = session.exec(
+        select(AgentToolState, Tool.name)
+        .join(Tool, Tool.id == AgentToolState.tool_id)
+        .where(AgentToolState.agent_id == agent_id)
+        .order_by(Tool.name)
+    ).all()
+    return [
+        AgentToolRead(tool_id=state.tool_id, tool_name=name, version=state.version, since=state.since, event_id=state.event_id)
+        for state, name in rows
+    ]
+
+
+def tool_version_distribution(session: Session, tool_id: int) -> List[ToolVersionCount]:
+    agents = func.count(AgentToolState.agent_id)
+    rows = session.exec(
+        select(AgentToolState.version, agents, func.min(AgentToolState.since), func.max(AgentToolState.since))
+        .where(AgentToolState.tool_id == tool_id)
+        .group_by(AgentToolState.version)
+        .order_by(agents.desc(), AgentToolState.version)
+    ).all()
+    return [
+        ToolVersionCount(version=version, agents=count, first_seen=first_seen, last_seen=last_seen)
+        for version, count, first_seen, last_seen in rows
+    ]
@@ -0,0 +1,336 @@
+"""
+Change failure rate: the share of changes followed by an outage on one of their agents.
+
+A change is a ``TOOL_UPDATE``, ``ROLLOUT`` or ``PATCH`` event; it fails when
+an ``OUTAGE`` event on a shared agent follows within
+``CHANGE_FAILURE_WINDOW_HOURS``. The event CRUD helpers keep the counters
+current:
+
+- ``record`` counts a new change under the fleet total, its tools and their
+  toolchains (failing it at once if a recorded outage already follows it),
+  and lets a new outage fail the not-yet-failed changes in its window;
+- ``retract`` takes back what an event contributed before it is updated or
+  deleted; changes a retracted outage had failed are re-checked against the
+  remaining outages.
+
+Failures count on the change's day, so ``failure_rates`` reads days x
+entities of counters instead of joining events to events.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, insert, update
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.partitions import month_key
+from app.crud.outage import _bucket_start
+from app.models.agent import EventAgent
+from app.models.change_failure import ChangeFailureCounter, ChangeFailureRate, ChangeOutcome
+from app.models.enums import EventType
+from app.models.event import Event
+from app.models.tool import EventTool, Tool
+from app.models.toolchain import Toolchain, ToolchainTool
+
+CHANGE_TYPES = (EventType.TOOL_UPDATE, EventType.ROLLOUT, EventType.PATCH)
+TOTAL = ("all", 0)
+_ENTITIES = {"tool": Tool, "toolchain": Toolchain}
+
+# (day, kind, entity_id) -> [changes, failures]
+Deltas = Dict[Tuple[date, str, int], List[int]]
+
+
+def _window() -> timedelta:
+    return timedelta(hours=settings.CHANGE_FAILURE_WINDOW_HOURS)
+
+
+def _naive(moment: datetime) -> datetime:
+    return moment.replace(tzinfo=None)
+
+
+def _add(deltas: Deltas, day: date, kind: str, entity_id: int, changes: int = 0, failures: int = 0) -> None:
+    delta = deltas.setdefault((day, kind, entity_id), [0, 0])
+    delta[0] += changes
+    delta[1] += failures
+
+
+def _apply(session: Session, deltas: Deltas) -> None:
+    deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+    current = {
+        (row.day, row.kind, row.entity_id): (row.changes, row.failures)
+        for row in session.exec(
+            select(ChangeFailureCounter).where(
+                ChangeFailureCounter.day.in_({key[0] for key in deltas}),
+                ChangeFailureCounter.entity_id.in_({key[2] for key in deltas}),
+            )
+        ).all()
+    }
+    inserts, updates = [], []
+    for key, (changes, failures) in deltas.items():
+        values = dict(zip(("day", "kind", "entity_id"), key))
+        if key in current:
+            updates.append({**values, "changes": current[key][0] + changes, "failures": current[key][1] + failures})
+        elif changes > 0 or failures > 0:
+            inserts.append({**values, "changes": changes, "failures": failures})
+    if inserts:
+        session.exec(insert(ChangeFailureCounter), params=inserts)
+    if updates:
+        session.exec(update(ChangeFailureCounter), params=updates)
+
+
+def _first_outages(
+    session: Session, change_ids: Iterable[int], after: datetime, until: datetime, exclude: Optional[int] = None
+) -> Dict[int, int]:
+    """change id -> earliest outage between ``after`` and ``until`` that fails it."""
+    change_ids = set(change_ids)
+    if not change_ids:
+        return {}
+    change, outage = aliased(Event), aliased(Event)
+    change_link, outage_link = aliased(EventAgent), aliased(EventAgent)
+    statement = (
+        select(change.id, change.timestamp, outage.id, outage.timestamp)
+        .join(change_link, change_link.event_id == change.id)
+        .join(outage_link, outage_link.agent_id == change_link.agent_id)
+        .join(outage, outage.id == outage_link.event_id)
+        .where(
+            change.id.in_(change_ids),
+            outage.event_type == EventType.OUTAGE,
+            outage.timestamp >= change.timestamp,
+            outage.timestamp >= after,
+            outage.timestamp <= until,
+            *(model.partition_month >= month_key(after) for model in (outage, outage_link)),
+            *(model.partition_month <= month_key(until) for model in (outage, outage_link)),
+        )
+    )
+    if exclude is not None:
+        statement = statement.where(outage.id != exclude)
+    window = _window()
+    first: Dict[int, int] = {}
+    for change_id, changed_at, outage_id, outage_at in sorted(
+        session.exec(statement).all(), key=lambda row: (_naive(row[3]), row[2])
+    ):
+        if _naive(outage_at) - _naive(changed_at) <= window:
+            first.setdefault(change_id, outage_id)
+    return first
+
+
+def _fail(session: Session, failed: Dict[int, int], deltas: Deltas) -> None:
+    """Mark not-yet-failed changes as failed by the given outages."""
+    if not failed:
+        return
+    rows = session.exec(
+        select(ChangeOutcome.event_id, ChangeOutcome.kind, ChangeOutcome.entity_id, ChangeOutcome.day).where(
+            ChangeOutcome.event_id.in_(failed), ChangeOutcome.failed_by.is_(None)
+        )
+    ).all()
+    if not rows:
+        return
+    session.exec(update(ChangeOutcome), params=[
+        {"event_id": event_id, "kind": kind, "entity_id": entity_id, "failed_by": failed[event_id]}
+        for event_id, kind, entity_id, _ in rows
+    ])
+    for _, kind, entity_id, day in rows:
+        _add(deltas, day, kind, entity_id, failures=1)
+
+
+def _counted_under(session: Session, tool_ids: Iterable[int]) -> set:
+    tool_ids = set(tool_ids)
+    keys = {TOTAL} | {("tool", tool_id) for tool_id in tool_ids}
+    if tool_ids:
+        toolchain_ids = session.exec(
+            select(ToolchainTool.toolchain_id).where(ToolchainTool.tool_id.in_(tool_ids)).distinct()
+        ).all()
+        keys |= {("toolchain", toolchain_id) for toolchain_id in toolchain_ids}
+    return keys
+
+
+def record(session: Session, event: Event, agent_ids: Iterable[int], tool_ids: Iterable[int]) -> None:
+    """Count a new (or just updated) event with its links in place; the caller commits."""
+    agent_ids = set(agent_ids)
+    deltas: Deltas = {}
+    if event.event_type in CHANGE_TYPES:
+        day = event.timestamp.date()
+        failed_by = None
+        if agent_ids:
+            failed_by = _first_outages(session, [event.id], event.timestamp, event.timestamp + _window()).get(event.id)
+        keys = _counted_under(session, tool_ids)
+        session.exec(insert(ChangeOutcome), params=[
+            {"event_id": event.id, "kind": kind, "entity_id": entity_id, "day": day, "failed_by": failed_by}
+            for kind, entity_id in keys
+        ])
+        for kind, entity_id in keys:
+            _add(deltas, day, kind, entity_id, changes=1, failures=int(failed_by is not None))
+    elif event.event_type == EventType.OUTAGE and agent_ids:
+        after = event.timestamp - _window()
+        change_ids = session.exec(
+            select(Event.id)
+            .join(EventAgent, EventAgent.event_id == Event.id)
+            .join(ChangeOutcome, and_(ChangeOutcome.event_id == Event.id, ChangeOutcome.kind == TOTAL[0]))
+            .where(
+                EventAgent.agent_id.in_(agent_ids),
+                Event.timestamp >= after,
+                Event.timestamp <= event.timestamp,
+                ChangeOutcome.failed_by.is_(None),
+                *(model.partition_month >= month_key(after) for model in (Event, EventAgent)),
+                *(model.partition_month <= month_key(event.timestamp) for model in (Event, EventAgent)),
+            )
+            .distinct()
+        ).all()
+        _fail(session, {change_id: event.id for change_id in change_ids}, deltas)
+    _apply(session, deltas)
+
+
+def retract(session: Session, event: Event) -> None:
+    """Take back what ``event`` (as currently stored) contributed; the caller commits."""
+    deltas: Deltas = {}
+    if event.event_type in CHANGE_TYPES:
+        for row in session.exec(select(ChangeOutcome).where(ChangeOutcome.event_id == event.id)).all():
+            _add(deltas, row.day, row.kind, row.entity_id, changes=-1, failures=-int(row.failed_by is not None))
+        session.exec(delete(ChangeOutcome).where(ChangeOutcome.event_id == event.id))
+    elif event.event_type == EventType.OUTAGE:
+        rows = session.exec(select(ChangeOutcome).where(ChangeOutcome.failed_by == event.id)).all()
+        if rows:
+            for row in rows:
+                _add(deltas, row.day, row.kind, row.entity_id, failures=-1)
+            session.exec(
+                update(ChangeOutcome).where(ChangeOutcome.failed_by == event.id).values(failed_by=None),
+                execution_options={"synchronize_session": False},
+            )
+            # Another outage in the window may still fail them
+            window = _window()
+            replacements = _first_outages(
+                session, {row.event_id for row in rows}, event.timestamp - window, event.timestamp + window, exclude=event.id
+            )
+            _fail(session, replacements, deltas)
+    _apply(session, deltas)
+
+
+def forget(session: Session, kind: str, entity_id: int) -> None:
+    session.exec(delete(ChangeOutcome).where(ChangeOutcome.kind == kind, ChangeOutcome.entity_id == entity_id))
+    session.exec(
+        delete(ChangeFailureCounter).where(ChangeFailureCounter.kind == kind, ChangeFailureCounter.entity_id == entity_id)
+    )
+
+
+def rebuild(session: Session) -> int:
+    """Recompute outcomes and counters from event history with the current window and toolchains."""
+    session.exec(delete(ChangeOutcome))
+    session.exec(delete(ChangeFailureCounter))
+
+    changes, outages_by_agent = {}, defaultdict(list)
+    linked = (
+        select(Event.id, Event.timestamp, Event.event_type, EventAgent.agent_id)
+        .outerjoin(EventAgent, EventAgent.event_id == Event.id)
+        .where(Event.event_type.in_(CHANGE_TYPES + (EventType.OUTAGE,)))
+    )
+    for event_id, timestamp, event_type, agent_id in session.exec(linked).all():
+        if event_type == EventType.OUTAGE:
+            if agent_id is not None:
+                outages_by_agent[agent_id].append((_naive(timestamp), event_id))
+            continue
+        agents = changes.setdefault(event_id, (_naive(timestamp), set()))[1]
+        if agent_id is not None:
+            agents.add(agent_id)
+    for outages in outages_by_agent.values():
+        outages.sort()
+
+    tools = defaultdict(set)
+    for event_id, tool_id in session.exec(
+        select(EventTool.event_id, EventTool.tool_id)
+        .join(Event, Event.id == EventTool.event_id)
+        .where(Event.event_type.in_(CHANGE_TYPES))
+    ).all():
+        tools[event_id].add(tool_id)
+    toolchains = defaultdict(set)
+    for tool_id, toolchain_id in session.exec(select(ToolchainTool.tool_id, ToolchainTool.toolchain_id)).all():
+        toolchains[tool_id].add(toolchain_id)
+
+    window = _window()
+    outcomes, deltas = [], {}
+    for event_id, (timestamp, agents) in changes.items():
+        candidates = []
+        for agent_id in agents:
+            outages = outages_by_agent.get(agent_id, [])
+            position = bisect_left(outages, (timestamp, -1))
+            if position < len(outages) and outages[position][0] - timestamp <= window:
+                candidates.append(outages[position])
+        failed_by = min(candidates)[1] if candidates else None
+        keys = {TOTAL} | {("tool", tool_id) for tool_id in tools[event_id]}
+        keys |= {("toolchain", toolchain_id) for tool_id in tools[event_id] for toolchain_id in toolchains[tool_id]}
+        for kind, entity_id in keys:
+            outcomes.append({
+                "event_id": event_id, "kind": kind, "entity_id": entity_id,
+                "day": timestamp.date(), "failed_by": failed_by,
+            })
+            _add(deltas, timestamp.date(), kind, entity_id, changes=1, failures=int(failed_by is not None))
+    if outcomes:
+        session.exec(insert(ChangeOutcome), params=outcomes)
+    if deltas:
+        session.exec(insert(ChangeFailureCounter), params=[
+            {"day": day, "kind": kind, "entity_id": entity_id, "changes": changes, "failures": failures}
+            for (day, kind, entity_id), (changes, failures) in deltas.items()
+        ])
+    session.commit()
+    return len(changes)
+
+
+def _rate(key: str, entity_id: Optional[int], changes: int, failures: int) -> ChangeFailureRate:
+    return ChangeFailureRate(
+        key=key, id=entity_id, changes=changes, failures=failures, rate=failures / changes if changes else None
+    )
+
+
+def failure_rates(
+    session: Session,
+    *,
+    group_by: str = "toolchain",
+    bucket: str = "week",
+    start: date,
+    end: date,
+    tool_id: Optional[int] = None,
+    toolchain_id: Optional[int] = None,
+) -> List[ChangeFailureRate]:
+    """Changes, failed changes and their ratio for changes made between ``start`` and ``end`` (days, inclusive)."""
+    changes, failures = func.sum(ChangeFailureCounter.changes), func.sum(ChangeFailureCounter.failures)
+    in_window = (ChangeFailureCounter.day >= start, ChangeFailureCounter.day <= end, ChangeFailureCounter.changes > 0)
+
+    if group_by == "bucket":
+        kind, entity_id = ("tool", tool_id) if tool_id else ("toolchain", toolchain_id) if toolchain_id else TOTAL
+        rows = session.exec(
+            select(ChangeFailureCounter.day, changes, failures)
+            .where(ChangeFailureCounter.kind == kind, ChangeFailureCounter.entity_id == entity_id, *in_window)
+            .group_by(ChangeFailureCounter.day)
+        ).all()
+        buckets: Dict[str, List[int]] = {}
+        for day, day_changes, day_failures in rows:
+            key = _bucket_start(datetime.combine(day, time.min), bucket).date().isoformat()
+            totals = buckets.setdefault(key, [0, 0])
+            totals[0] += day_changes
+            totals[1] += day_failures
+        return [_rate(key, None, *buckets[key]) for key in sorted(buckets)]
+
+    entity = _ENTITIES[group_by]
+    statement = (
+        select(entity.id, entity.name, changes, failures)
+        .join(entity, entity.id == ChangeFailureCounter.entity_id)
+        .where(ChangeFailureCounter.kind == group_by, *in_window)
+    )
+    if group_by == "tool" and tool_id:
+        statement = statement.where(ChangeFailureCounter.entity_id == tool_id)
+    elif group_by == "tool" and toolchain_id:
+        statement = statement.where(ChangeFailureCounter.entity_id.in_(
+            select(ToolchainTool.tool_id).where(ToolchainTool.toolchain_id == toolchain_id)
+        ))
+    elif group_by == "toolchain" and toolchain_id:
+        statement = statement.where(ChangeFailureCounter.entity_id == toolchain_id)
+    elif group_by == "toolchain" and tool_id:
+        statement = statement.where(ChangeFailureCounter.entity_id.in_(
+            select(ToolchainTool.toolchain_id).where(ToolchainTool.tool_id == tool_id)
+        ))
+    rows = session.exec(statement.group_by(entity.id, entity.name).order_by(entity.name, entity.id)).all()
+    return [_rate(name, entity_id, total, failed) for entity_id, name, total, failed in rows]
@@ -0,0 +1,137 @@
+"""
+Change-churn counters and the leaderboards read from them.
+
+The event CRUD helpers call ``apply`` with the difference an event write
+makes: +1 per linked agent and tool in the event's (day, type, severity)
+for a new event, the reverse for a deleted one, and both for an update
+that moves the event or changes its links. Each write costs one lookup of
+the affected counters plus bulk writes.
+"""
+from collections import Counter
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Date, cast, delete, func, insert, literal, union_all, update
+from sqlmodel import Session, select
+
+from app.models.agent import Agent, EventAgent
+from app.models.churn import ChurnCounter, ChurnEntry
+from app.models.enums import EventSeverity, EventType
+from app.models.event import Event
+from app.models.tool import EventTool, Tool
+
+Links = Tuple[Set[int], Set[int]]
+_ENTITIES = {"agent": Agent, "tool": Tool}
+
+
+def counts(
+    timestamp: datetime, event_type: EventType, severity: EventSeverity, agent_ids: Iterable[int], tool_ids: Iterable[int]
+) -> Counter:
+    """Counter contributions of one event with these fields and links."""
+    day = timestamp.date()
+    contributions = Counter()
+    for kind, entity_ids in (("agent", agent_ids), ("tool", tool_ids)):
+        for entity_id in set(entity_ids):
+            contributions[(day, kind, entity_id, EventType(event_type), EventSeverity(severity))] += 1
+    return contributions
+
+
+def event_links(session: Session, event_id: int) -> Links:
+    """The event's linked agent and tool ids, in one statement."""
+    agents = select(literal("agent").label("kind"), EventAgent.agent_id.label("entity_id")).where(
+        EventAgent.event_id == event_id
+    )
+    tools = select(literal("tool").label("kind"), EventTool.tool_id.label("entity_id")).where(
+        EventTool.event_id == event_id
+    )
+    links: Links = (set(), set())
+    for kind, entity_id in session.exec(union_all(agents, tools)).all():
+        links[0 if kind == "agent" else 1].add(entity_id)
+    return links
+
+
+def apply(session: Session, deltas: Counter) -> None:
+    """Add ``deltas`` (key -> +/-n) to the stored counters; the caller commits."""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    current = {
+        (row.day, row.kind, row.entity_id, row.event_type, row.severity): row.count
+        for row in session.exec(
+            select(ChurnCounter).where(
+                ChurnCounter.day.in_({key[0] for key in deltas}),
+                ChurnCounter.entity_id.in_({key[2] for key in deltas}),
+            )
+        ).all()
+    }
+    inserts, updates = [], []
+    for key, delta in deltas.items():
+        values = dict(zip(("day", "kind", "entity_id", "event_type", "severity"), key))
+        if key in current:
+            updates.append({**values, "count": current[key] + delta})
+        elif delta > 0:
+            inserts.append({**values, "count": delta})
+    if inserts:
+        session.exec(insert(ChurnCounter), params=inserts)
+    if updates:
+        session.exec(update(ChurnCounter), params=updates)
+
+
+def forget(session: Session, kind: str, entity_id: int) -> None:
+    session.exec(delete(ChurnCounter).where(ChurnCounter.kind == kind, ChurnCounter.entity_id == entity_id))
+
+
+def day_of(session: Session, timestamp):
+    # SQLite has no DATE type: date() yields the same YYYY-MM-DD text a Date column stores
+    return func.date(timestamp) if session.get_bind().dialect.name == "sqlite" else cast(timestamp, Date)
+
+
+def rebuild(session: Session) -> int:
+    """Recompute every counter from event history (after bulk loads that bypass the CRUD helpers)."""
+    session.exec(delete(ChurnCounter))
+    for kind, link, column in (("agent", EventAgent, EventAgent.agent_id), ("tool", EventTool, EventTool.tool_id)):
+        links = (
+            select(Event.id, Event.timestamp, Event.event_type, Event.severity, column.label("entity_id"))
+            .join(link, link.event_id == Event.id)
+            .distinct()
+            .subquery()
+        )
+        day = day_of(session, links.c.timestamp)
+        grouped = select(
+            day, literal(kind), links.c.entity_id, links.c.event_type, links.c.severity, func.count()
+        ).group_by(day, links.c.entity_id, links.c.event_type, links.c.severity)
+        session.exec(
+            insert(ChurnCounter).from_select(["day", "kind", "entity_id", "event_type", "severity", "count"], grouped)
+        )
+    session.commit()
+    return session.exec(select(func.count()).select_from(ChurnCounter)).one()
+
+
+def top_entities(
+    session: Session,
+    kind: str,
+    start: date,
+    end: date,
+    event_type: Optional[EventType] = None,
+    severity: Optional[EventSeverity] = None,
+    limit: int = 10,
+) -> List[ChurnEntry]:
+    """Agents or tools with the most counted events between ``start`` and ``end`` (days, inclusive)."""
+    entity = _ENTITIES[kind]
+    changes = func.sum(ChurnCounter.count)
+    statement = (
+        select(ChurnCounter.entity_id, entity.name, changes, func.max(ChurnCounter.day))
+        .join(entity, entity.id == ChurnCounter.entity_id)
+        .where(ChurnCounter.kind == kind, ChurnCounter.day >= start, ChurnCounter.day <= end, ChurnCounter.count > 0)
+    )
+    if event_type:
+        statement = statement.where(ChurnCounter.event_type == event_type)
+    if severity:
+        statement = statement.where(ChurnCounter.severity == severity)
+    rows = session.exec(
+        statement.group_by(ChurnCounter.entity_id, entity.name).order_by(changes.desc(), entity.name).limit(limit)
+    ).all()
+    return [
+        ChurnEntry(id=entity_id, name=name, changes=total, last_day=last_day)
+        for entity_id, name, total, last_day in rows
+    ]
@@ -0,0 +1,98 @@
+"""
+Incident correlation: the changes that preceded an event on the same agents or tools.
+
+``correlated_events`` is a single windowed join: the anchor event's agent and
+tool links are matched against the links of events in ``[timestamp - window,
+timestamp]`` (timestamp and partition bounds on every partitioned table), the
+overlap is counted per candidate and the result is ranked in SQL.
+"""
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import case, func, literal, union_all
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.partitions import month_key
+from app.models.agent import EventAgent
+from app.models.enums import EventType
+from app.models.event import CorrelatedEvent, Event
+from app.models.tool import EventTool
+
+# Event types that count as a change (everything except the incidents themselves)
+CHANGE_TYPES = tuple(event_type for event_type in EventType if event_type != EventType.OUTAGE)
+MAX_WINDOW = timedelta(days=7)
+
+_WINDOW_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+_WINDOW_PATTERN = re.compile(r"^(\d+)([smhd])$")
+
+
+def parse_window(value: str) -> Optional[timedelta]:
+    """Parse ``30m``/``6h``/``2d`` style durations; None when malformed."""
+    match = _WINDOW_PATTERN.match(value.strip().lower())
+    if not match:
+        return None
+    return timedelta(**{_WINDOW_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def _shared_links(link_model, key, anchor: Event, start: datetime):
+    """(event_id, key) rows of events in the window that share ``key`` with the anchor."""
+    anchor_keys = select(key).where(link_model.event_id == anchor.id)
+    return (
+        select(link_model.event_id, key.label("key"))
+        .join(Event, Event.id == link_model.event_id)
+        .where(
+            key.in_(anchor_keys),
+            Event.timestamp >= start,
+            Event.timestamp <= anchor.timestamp,
+            Event.id != anchor.id,
+            Event.event_type.in_(CHANGE_TYPES),
+            *(model.partition_month >= month_key(start) for model in (Event, link_model)),
+            *(model.partition_month <= month_key(anchor.timestamp) for model in (Event, link_model)),
+        )
+    )
+
+
+def correlated_events(session: Session, anchor: Event, window: timedelta, limit: int = 50) -> List[CorrelatedEvent]:
+    """Changes in the ``window`` before ``anchor`` sharing agents or tools, most overlapping and closest first."""
+    start = anchor.timestamp - window
+    agents = _shared_links(EventAgent, EventAgent.agent_id, anchor, start).add_columns(literal("agent").label("kind"))
+    tools = _shared_links(EventTool, EventTool.tool_id, anchor, start).add_columns(literal("tool").label("kind"))
+    shared = union_all(agents, tools).subquery("shared")
+
+    counts = (
+        select(
+            shared.c.event_id,
+            func.count(func.distinct(case((shared.c.kind == "agent", shared.c.key)))).label("agents"),
+            func.count(func.distinct(case((shared.c.kind == "tool", shared.c.key)))).label("tools"),
+        )
+        .group_by(shared.c.event_id)
+        .subquery("counts")
+    )
+    rows = session.exec(
+        select(Event, counts.c.agents, counts.c.tools)
+        .join(counts, counts.c.event_id == Event.id)
+        .order_by((counts.c.agents + counts.c.tools).desc(), Event.timestamp.desc(), Event.id.desc())
+        .limit(limit)
+    ).all()
+    return [
+        CorrelatedEvent(
+            id=event.id,
+            title=event.title,
+            timestamp=event.timestamp,
+            event_type=event.event_type,
+            severity=event.severity,
+            source=event.source,
+            shared_agents=agent_count,
+            shared_tools=tool_count,
+            seconds_before=(anchor.timestamp - event.timestamp).total_seconds(),
+        )
+        for event, agent_count, tool_count in rows
+    ]
+
+
+async def correlated_events_async(
+    session: AsyncSession, anchor: Event, window: timedelta, limit: int = 50
+) -> List[CorrelatedEvent]:
+    return await session.run_sync(correlated_events, anchor, window, limit)
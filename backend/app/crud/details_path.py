@@ -0,0 +1,54 @@
+"""CRUD helpers for declared ``details`` hot paths and their expression indexes."""
+from typing import List, Optional
+
+from sqlmodel import Session, select
+
+from app.core import details_paths
+from app.models.details_path import DetailsHotPath, DetailsHotPathCreate, DetailsHotPathRead
+
+
+def _read(session: Session, hot_path: DetailsHotPath) -> DetailsHotPathRead:
+    indexed = session.get_bind().dialect.name in details_paths.INDEXED_DIALECTS
+    return DetailsHotPathRead(
+        id=hot_path.id,
+        path=hot_path.path,
+        value_type=hot_path.value_type,
+        created_at=hot_path.created_at,
+        index_name=details_paths.index_name(hot_path.path) if indexed else None,
+    )
+
+
+def list_hot_paths(session: Session) -> List[DetailsHotPathRead]:
+    return [_read(session, hot_path) for hot_path in session.exec(select(DetailsHotPath).order_by(DetailsHotPath.path)).all()]
+
+
+def get_hot_path(session: Session, hot_path_id: int) -> Optional[DetailsHotPath]:
+    return session.get(DetailsHotPath, hot_path_id)
+
+
+def get_hot_path_by_path(session: Session, path: str) -> Optional[DetailsHotPath]:
+    return session.exec(select(DetailsHotPath).where(DetailsHotPath.path == path)).first()
+
+
+def get_hot_path_by_index_name(session: Session, name: str) -> Optional[DetailsHotPath]:
+    """Declared path whose expression index is called ``name``, if any."""
+    for hot_path in session.exec(select(DetailsHotPath)).all():
+        if details_paths.index_name(hot_path.path) == name:
+            return hot_path
+    return None
+
+
+def create_hot_path(session: Session, hot_path_in: DetailsHotPathCreate) -> DetailsHotPathRead:
+    """Record the path and build its index in the same transaction."""
+    hot_path = DetailsHotPath(**hot_path_in.model_dump())
+    session.add(hot_path)
+    details_paths.create_details_index(session.connection(), hot_path.path, hot_path.value_type)
+    session.commit()
+    session.refresh(hot_path)
+    return _read(session, hot_path)
+
+
+def delete_hot_path(session: Session, hot_path: DetailsHotPath) -> None:
+    details_paths.drop_details_index(session.connection(), hot_path.path)
+    session.delete(hot_path)
+    session.commit()
@@ -1,26 +1,57 @@
 """CRUD helpers for events."""
+from collections import Counter
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import delete, or_
+from typing import List, Optional, Sequence
+from sqlalchemy import delete, insert, or_, update
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.details_paths import DetailsFilter, details_condition
+from app.core.partitions import month_key
+from app.crud import agent_tool_state, change_failure, churn, tool_checkpoint, toolchain_drift
 
 from app.models.event import Event, EventCreate, EventUpdate
 from app.models.agent import EventAgent
+from app.models.job import Build, Job
 from app.models.tool import EventTool
 from app.models.tag import EventTag
 
 
-def create_event(session: Session, event_in: EventCreate) -> Event:
+def create_event(session: Session, event_in: EventCreate, build_id: Optional[int] = None) -> Event:
     base_data = event_in.model_dump(exclude={"agent_ids", "tool_versions", "tag_ids"})
-    db_event = Event(**base_data, created_at=datetime.utcnow(), updated_at=datetime.utcnow())
+    db_event = Event(**base_data, build_id=build_id, created_at=datetime.utcnow(), updated_at=datetime.utcnow())
     session.add(db_event)
     session.flush()
 
-    _sync_agents(session, db_event, event_in.agent_ids or [])
-    _sync_tools(session, db_event, event_in.tool_versions or [])
-    _sync_tags(session, db_event, event_in.tag_ids or [])
+    # A new event has no links to replace
+    _sync_agents(session, db_event, event_in.agent_ids or [], replace=False)
+    _sync_tools(session, db_event, event_in.tool_versions or [], replace=False)
+    _sync_tags(session, db_event, event_in.tag_ids or [], replace=False)
+    churn.apply(session, churn.counts(
+        db_event.timestamp,
+        db_event.event_type,
+        db_event.severity,
+        event_in.agent_ids or [],
+        [tool_data.get("tool_id") for tool_data in event_in.tool_versions or []],
+    ))
+    change_failure.record(
+        session, db_event, event_in.agent_ids or [], [tool_data.get("tool_id") for tool_data in event_in.tool_versions or []]
+    )
+    touches_state = bool(event_in.agent_ids and event_in.tool_versions)
+    if touches_state:
+        links = [
+            (agent_id, tool_data.get("tool_id"), tool_data.get("version_to"))
+            for agent_id in event_in.agent_ids
+            for tool_data in event_in.tool_versions
+        ]
+        agent_tool_state.apply_event(session, db_event, links=links)
+        tool_checkpoint.patch_from(
+            session, db_event.timestamp, {(agent_id, tool_id) for agent_id, tool_id, version in links if version is not None}
+        )
 
     session.commit()
+    if touches_state:
+        toolchain_drift.invalidate()
     session.refresh(db_event)
     return db_event
 
@@ -36,23 +67,37 @@ def list_events(
     end: Optional[datetime] = None,
     agent_id: Optional[int] = None,
     tool_id: Optional[int] = None,
+    job: Optional[str] = None,
+    build: Optional[int] = None,
     event_type: Optional[str] = None,
     severity: Optional[str] = None,
     source: Optional[str] = None,
     search: Optional[str] = None,
+    details_filters: Sequence[DetailsFilter] = (),
     skip: int = 0,
     limit: int = 100,
 ) -> List[Event]:
     statement = select(Event)
 
+    # Partition pruning: bound partition_month on every partitioned table we touch
+    partitioned = [Event]
     if agent_id:
         statement = statement.join(EventAgent).where(EventAgent.agent_id == agent_id)
+        partitioned.append(EventAgent)
     if tool_id:
         statement = statement.join(EventTool).where(EventTool.tool_id == tool_id)
+        partitioned.append(EventTool)
+    if job:
+        statement = statement.join(Build, Build.id == Event.build_id).join(Job, Job.id == Build.job_id)
+        statement = statement.where(Job.name == job)
+        if build is not None:
+            statement = statement.where(Build.number == build)
     if start:
         statement = statement.where(Event.timestamp >= start)
+        statement = statement.where(*(model.partition_month >= month_key(start) for model in partitioned))
     if end:
         statement = statement.where(Event.timestamp <= end)
+        statement = statement.where(*(model.partition_month <= month_key(end) for model in partitioned))
     if event_type:
         statement = statement.where(Event.event_type == event_type)
     if severity:
@@ -62,6 +107,9 @@ def list_events(
     if search:
         like = f"%{search}%"
         statement = statement.where(or_(Event.title.ilike(like), Event.description.ilike(like)))
+    if details_filters:
+        dialect = session.get_bind().dialect.name
+        statement = statement.where(*(details_condition(dialect, Event.details, f) for f in details_filters))
 
     statement = statement.order_by(Event.timestamp.desc()).offset(skip).limit(limit)
     return list(session.exec(statement).all())
@@ -73,9 +121,36 @@ def update_event(session: Session, db_event: Event, event_in: EventUpdate) -> Ev
     tool_versions = data.pop("tool_versions", None)
     tag_ids = data.pop("tag_ids", None)
 
+    # Tool state only changes when links or the event's position in time change
+    touches_state = agent_ids is not None or tool_versions is not None or "timestamp" in data
+    detached = agent_tool_state.detach_event(session, db_event.id) if touches_state else set()
+    linked_before = agent_tool_state.event_pairs(session, db_event.id) if touches_state else set()
+    # Churn counters move with the event's day, type, severity and links
+    touches_churn = touches_state or "event_type" in data or "severity" in data
+    if touches_churn:
+        agents_before, tools_before = churn.event_links(session, db_event.id)
+        counted_before = churn.counts(
+            db_event.timestamp, db_event.event_type, db_event.severity, agents_before, tools_before
+        )
+    # Change failure outcomes depend on type, time and links, not severity
+    touches_failures = touches_state or "event_type" in data
+    if touches_failures:
+        change_failure.retract(session, db_event)
+
+    previous_month = db_event.partition_month
+    previous_timestamp = db_event.timestamp
     for key, value in data.items():
         setattr(db_event, key, value)
     db_event.updated_at = datetime.utcnow()
+    session.add(db_event)
+    session.flush()
+
+    # Links follow their event into its new month (ON UPDATE CASCADE already does this on PostgreSQL)
+    if db_event.partition_month != previous_month:
+        for link in (EventAgent, EventTool, EventTag):
+            session.exec(
+                update(link).where(link.event_id == db_event.id).values(partition_month=db_event.partition_month)
+            )
 
     if agent_ids is not None:
         _sync_agents(session, db_event, agent_ids)
@@ -83,42 +158,110 @@ def update_event(session: Session, db_event: Event, event_in: EventUpdate) -> Ev
         _sync_tools(session, db_event, tool_versions)
     if tag_ids is not None:
         _sync_tags(session, db_event, tag_ids)
+    if touches_churn:
+        counted = churn.counts(
+            db_event.timestamp,
+            db_event.event_type,
+            db_event.severity,
+            agents_before if agent_ids is None else agent_ids,
+            tools_before if tool_versions is None else [tool_data.get("tool_id") for tool_data in tool_versions],
+        )
+        counted.subtract(counted_before)
+        churn.apply(session, counted)
+    if touches_failures:
+        change_failure.record(
+            session,
+            db_event,
+            agents_before if agent_ids is None else agent_ids,
+            tools_before if tool_versions is None else [tool_data.get("tool_id") for tool_data in tool_versions],
+        )
+    if touches_state:
+        agent_tool_state.apply_event(session, db_event, detached)
+        earliest = min(previous_timestamp, db_event.timestamp, key=lambda ts: ts.replace(tzinfo=None))
+        relinked = agent_ids is not None or tool_versions is not None
+        linked = agent_tool_state.event_pairs(session, db_event.id) if relinked else set()
+        tool_checkpoint.patch_from(session, earliest, linked_before | linked)
 
-    session.add(db_event)
     session.commit()
+    if touches_state:
+        toolchain_drift.invalidate()
     session.refresh(db_event)
     return db_event
 
 
 def delete_event(session: Session, db_event: Event) -> None:
+    detached = agent_tool_state.detach_event(session, db_event.id)
+    linked = agent_tool_state.event_pairs(session, db_event.id)
+    agents, tools = churn.event_links(session, db_event.id)
+    removed = churn.counts(db_event.timestamp, db_event.event_type, db_event.severity, agents, tools)
+    churn.apply(session, Counter({key: -count for key, count in removed.items()}))
+    change_failure.retract(session, db_event)
     session.exec(delete(EventAgent).where(EventAgent.event_id == db_event.id))
     session.exec(delete(EventTool).where(EventTool.event_id == db_event.id))
     session.exec(delete(EventTag).where(EventTag.event_id == db_event.id))
-    session.delete(db_event)
+    # Bulk delete: session.delete would first load the link collections just removed
+    session.exec(delete(Event).where(Event.id == db_event.id))
+    agent_tool_state.apply_event(session, None, detached)
+    tool_checkpoint.patch_from(session, db_event.timestamp, linked)
     session.commit()
+    toolchain_drift.invalidate()
 
 
-def _sync_agents(session: Session, event: Event, agent_ids: List[int]):
-    session.exec(delete(EventAgent).where(EventAgent.event_id == event.id))
-    session.flush()
-    for agent_id in agent_ids:
-        session.add(EventAgent(event_id=event.id, agent_id=agent_id))
+def _sync_agents(session: Session, event: Event, agent_ids: List[int], replace: bool = True):
+    if replace:
+        session.exec(delete(EventAgent).where(EventAgent.event_id == event.id))
+        session.flush()
+    if agent_ids:
+        session.exec(insert(EventAgent), params=[
+            {"event_id": event.id, "agent_id": agent_id, "partition_month": event.partition_month}
+            for agent_id in agent_ids
+        ])
 
 
-def _sync_tools(session: Session, event: Event, tool_versions: List[dict]):
-    session.exec(delete(EventTool).where(EventTool.event_id == event.id))
-    session.flush()
-    for tool_data in tool_versions:
-        session.add(EventTool(
-            event_id=event.id,
-            tool_id=tool_data.get("tool_id"),
-            version_from=tool_data.get("version_from"),
-            version_to=tool_data.get("version_to"),
-        ))
+def _sync_tools(session: Session, event: Event, tool_versions: List[dict], replace: bool = True):
+    if replace:
+        session.exec(delete(EventTool).where(EventTool.event_id == event.id))
+        session.flush()
+    if tool_versions:
+        session.exec(insert(EventTool), params=[
+            {
+                "event_id": event.id,
+                "partition_month": event.partition_month,
+                "tool_id": tool_data.get("tool_id"),
+                "version_from": tool_data.get("version_from"),
+                "version_to": tool_data.get("version_to"),
+            }
+            for tool_data in tool_versions
+        ])
 
 
-def _sync_tags(session: Session, event: Event, tag_ids: List[int]):
-    session.exec(delete(EventTag).where(EventTag.event_id == event.id))
-    session.flush()
-    for tag_id in tag_ids:
-        session.add(EventTag(event_id=event.id, tag_id=tag_id))
+def _sync_tags(session: Session, event: Event, tag_ids: List[int], replace: bool = True):
+    if replace:
+        session.exec(delete(EventTag).where(EventTag.event_id == event.id))
+        session.flush()
+    if tag_ids:
+        session.exec(insert(EventTag), params=[
+            {"event_id": event.id, "tag_id": tag_id, "partition_month": event.partition_month}
+            for tag_id in tag_ids
+        ])
+
+
+# Async variants: same helpers, run on an AsyncSession via run_sync
+async def create_event_async(session: AsyncSession, event_in: EventCreate) -> Event:
+    return await session.run_sync(create_event, event_in)
+
+
+async def get_event_async(session: AsyncSession, event_id: int) -> Optional[Event]:
+    return await session.run_sync(get_event, event_id)
+
+
+async def list_events_async(session: AsyncSession, **filters) -> List[Event]:
+    return await session.run_sync(list_events, **filters)
+
+
+async def update_event_async(session: AsyncSession, db_event: Event, event_in: EventUpdate) -> Event:
+    return await session.run_sync(update_event, db_event, event_in)
+
+
+async def delete_event_async(session: AsyncSession, db_event: Event) -> None:
+    return await session.run_sync(delete_event, db_event)
@@ -0,0 +1,70 @@
+"""
+Agent x day heatmap of severity-weighted event counts.
+
+The matrix comes from one grouped query over ``event_agents`` joined to
+``events``; only agents with activity in the window get a row, while every
+day of the window gets a column so clients can index the flat vector directly.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func
+from sqlmodel import Session, select
+
+from app.core.partitions import month_key
+from app.crud.churn import day_of
+from app.models.agent import Agent, EventAgent
+from app.models.enums import EventSeverity, EventType
+from app.models.event import Event
+from app.models.heatmap import Heatmap
+
+
+def _weight(weights: Dict[str, float]):
+    return case(
+        *((Event.severity == severity, weights.get(severity.value, 1.0)) for severity in EventSeverity),
+        else_=1.0,
+    )
+
+
+def agent_heatmap(
+    session: Session,
+    start: date,
+    end: date,
+    weights: Dict[str, float],
+    agent_ids: Optional[List[int]] = None,
+    event_type: Optional[EventType] = None,
+) -> Heatmap:
+    """Weighted counts per agent and day between ``start`` and ``end`` (inclusive)."""
+    after = datetime.combine(start, time.min)
+    until = datetime.combine(end + timedelta(days=1), time.min)
+    day = day_of(session, Event.timestamp)
+    statement = (
+        select(Agent.id, Agent.name, day, func.sum(_weight(weights)))
+        .join(EventAgent, EventAgent.agent_id == Agent.id)
+        .join(Event, Event.id == EventAgent.event_id)
+        .where(
+            Event.timestamp >= after,
+            Event.timestamp < until,
+            *(model.partition_month >= month_key(after) for model in (Event, EventAgent)),
+            *(model.partition_month <= month_key(until) for model in (Event, EventAgent)),
+        )
+    )
+    if agent_ids:
+        statement = statement.where(EventAgent.agent_id.in_(agent_ids))
+    if event_type:
+        statement = statement.where(Event.event_type == event_type)
+    rows = session.exec(statement.group_by(Agent.id, Agent.name, day).order_by(Agent.name, Agent.id)).all()
+
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    columns = {value.isoformat(): column for column, value in enumerate(days)}
+    heatmap = Heatmap(start=start, end=end, days=days)
+    for agent_id, name, day_value, total in rows:
+        if not heatmap.agent_ids or heatmap.agent_ids[-1] != agent_id:
+            heatmap.agent_ids.append(agent_id)
+            heatmap.agents.append(name)
+            heatmap.counts.extend([0] * len(days))
+        # SQLite returns the day as text, other backends as a date
+        column = columns[str(day_value)[:10]]
+        heatmap.counts[(len(heatmap.agent_ids) - 1) * len(days) + column] += total
+    heatmap.counts = [int(count) if float(count).is_integer() else count for count in heatmap.counts]
+    return heatmap
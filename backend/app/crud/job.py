@@ -0,0 +1,36 @@
+"""CRUD helpers for CI jobs and builds."""
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from app.models.job import Build, Job
+
+
+def get_job_by_name(session: Session, name: str) -> Optional[Job]:
+    return session.exec(select(Job).where(Job.name == name)).first()
+
+
+def record_build(
+    session: Session, job_name: str, number: int, status: str, timestamp: datetime, url: Optional[str] = None
+) -> Build:
+    """Create or update the build row for one webhook report; flushed, the caller commits."""
+    job = get_job_by_name(session, job_name)
+    if job is None:
+        job = Job(name=job_name)
+        session.add(job)
+        session.flush()
+        build = None
+    else:
+        build = session.exec(select(Build).where(Build.job_id == job.id, Build.number == number)).first()
+
+    if build is None:
+        build = Build(job_id=job.id, number=number, status=status, url=url, timestamp=timestamp)
+    elif timestamp >= build.timestamp:
+        # Reports can arrive out of order; the latest one sets the status
+        build.status = status
+        build.url = url or build.url
+        build.timestamp = timestamp
+    session.add(build)
+    session.flush()
+    return build
@@ -0,0 +1,127 @@
+"""
+Outage intervals paired from CI build results, and the analytics read from them.
+
+Webhook ingestion calls ``record_build`` for every build event: a failure
+(``OUTAGE``) opens an interval for its job unless one is already open, in
+which case it only counts the failure; a success (``ROLLOUT``) closes the
+open interval. Each build costs one indexed lookup of the job's open
+interval, so ``outage_stats`` reads the (much smaller) interval table and
+never rescans event history.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlmodel import Session, select
+
+from app.core.metrics import percentile
+from app.models.agent import Agent
+from app.models.enums import EventType
+from app.models.event import Event
+from app.models.outage import Outage, OutageStats
+
+
+def open_outage(session: Session, job_name: str) -> Optional[Outage]:
+    return session.exec(
+        select(Outage)
+        .where(Outage.job_name == job_name, Outage.resolved_at.is_(None))
+        .order_by(Outage.started_at.desc())
+    ).first()
+
+
+def record_build(session: Session, job_name: str, event: Event, agent_id: Optional[int] = None) -> Optional[Outage]:
+    """Fold one build event of ``job_name`` into its outage intervals; the caller commits."""
+    if event.event_type not in (EventType.OUTAGE, EventType.ROLLOUT):
+        return None
+    current = open_outage(session, job_name)
+    if event.event_type == EventType.OUTAGE:
+        if current is None:
+            current = Outage(
+                job_name=job_name, agent_id=agent_id, started_at=event.timestamp, failure_event_id=event.id
+            )
+        else:
+            current.failures += 1
+            if event.timestamp < current.started_at:
+                # Out-of-order delivery: the earlier failure is where the outage started
+                current.started_at = event.timestamp
+                current.failure_event_id = event.id
+                current.agent_id = agent_id
+        session.add(current)
+        return current
+    # A success reported before the failure it would resolve (out-of-order delivery) does not close it
+    if current is None or event.timestamp < current.started_at:
+        return None
+    current.resolved_at = event.timestamp
+    current.duration_seconds = (event.timestamp - current.started_at).total_seconds()
+    current.recovery_event_id = event.id
+    session.add(current)
+    return current
+
+
+def _bucket_start(moment: datetime, bucket: str) -> datetime:
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def outage_stats(
+    session: Session,
+    *,
+    group_by: str = "job",
+    bucket: str = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    job_name: Optional[str] = None,
+    agent_id: Optional[int] = None,
+) -> List[OutageStats]:
+    """
+    MTTR, p50/p90 duration and failure counts of outages started in [start, end], per group.
+
+    ``group_by="agent"`` counts each outage once, under the agent of its first
+    failure; later failures on other agents within the same outage are not
+    attributed to them.
+    """
+    statement = select(
+        Outage.job_name, Agent.name, Outage.started_at, Outage.duration_seconds, Outage.failures
+    ).outerjoin(Agent, Agent.id == Outage.agent_id)
+    if start:
+        statement = statement.where(Outage.started_at >= start)
+    if end:
+        statement = statement.where(Outage.started_at <= end)
+    if job_name:
+        statement = statement.where(Outage.job_name == job_name)
+    if agent_id:
+        statement = statement.where(Outage.agent_id == agent_id)
+
+    groups: Dict[str, dict] = {}
+    for job, agent_name, started_at, duration, failures in session.exec(statement).all():
+        if group_by == "agent":
+            key = agent_name or ""
+        elif group_by == "bucket":
+            key = _bucket_start(started_at, bucket).isoformat()
+        else:
+            key = job
+        group = groups.setdefault(key, {"outages": 0, "failures": 0, "durations": []})
+        group["outages"] += 1
+        group["failures"] += failures
+        if duration is not None:
+            group["durations"].append(duration)
+
+    stats = []
+    for key in sorted(groups):
+        group = groups[key]
+        durations = sorted(group["durations"])
+        stats.append(
+            OutageStats(
+                key=key,
+                outages=group["outages"],
+                failures=group["failures"],
+                resolved=len(durations),
+                mttr_seconds=sum(durations) / len(durations) if durations else None,
+                p50_seconds=percentile(durations, 0.50) if durations else None,
+                p90_seconds=percentile(durations, 0.90) if durations else None,
+            )
+        )
+    return stats
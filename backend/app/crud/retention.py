@@ -0,0 +1,83 @@
+"""CRUD helpers for retention policies and the event archive manifest."""
+from datetime import datetime
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from app.models.enums import EventSeverity, EventSource, EventType
+from app.models.retention import EventArchive, RetentionPolicy, RetentionPolicyCreate
+
+MatchKey = Tuple[EventType, EventSeverity, EventSource]
+
+
+def create_policy(session: Session, policy_in: RetentionPolicyCreate) -> RetentionPolicy:
+    db_policy = RetentionPolicy(**policy_in.model_dump())
+    session.add(db_policy)
+    session.commit()
+    session.refresh(db_policy)
+    return db_policy
+
+
+def get_policy(session: Session, policy_id: int) -> Optional[RetentionPolicy]:
+    return session.get(RetentionPolicy, policy_id)
+
+
+def get_matching_policy(session: Session, policy_in: RetentionPolicyCreate) -> Optional[RetentionPolicy]:
+    """The policy with exactly the same match fields, if any."""
+    statement = select(RetentionPolicy).where(
+        RetentionPolicy.event_type == policy_in.event_type,
+        RetentionPolicy.severity == policy_in.severity,
+        RetentionPolicy.source == policy_in.source,
+    )
+    return session.exec(statement).first()
+
+
+def list_policies(session: Session) -> List[RetentionPolicy]:
+    return list(session.exec(select(RetentionPolicy).order_by(RetentionPolicy.id)).all())
+
+
+def delete_policy(session: Session, db_policy: RetentionPolicy) -> None:
+    session.delete(db_policy)
+    session.commit()
+
+
+def resolve_policies(
+    policies: List[RetentionPolicy], default_days: Optional[int] = None
+) -> Dict[MatchKey, Optional[int]]:
+    """
+    Effective retention (days, None = forever) for every event_type/severity/source.
+
+    The policy matching the most fields wins; ties go to the oldest policy.
+    Combinations no policy matches keep ``default_days``.
+    """
+    ranked = sorted(
+        policies,
+        key=lambda p: (-sum(v is not None for v in (p.event_type, p.severity, p.source)), p.id or 0),
+    )
+    resolved: Dict[MatchKey, Optional[int]] = {}
+    for key in product(EventType, EventSeverity, EventSource):
+        resolved[key] = default_days
+        for policy in ranked:
+            if all(want is None or want == have for want, have in zip((policy.event_type, policy.severity, policy.source), key)):
+                resolved[key] = policy.keep_days
+                break
+    return resolved
+
+
+def add_archive(session: Session, path: str, start: datetime, end: datetime, event_count: int) -> EventArchive:
+    archive = EventArchive(path=path, start=start, end=end, event_count=event_count)
+    session.add(archive)
+    return archive
+
+
+def list_archives(
+    session: Session, *, start: Optional[datetime] = None, end: Optional[datetime] = None
+) -> List[EventArchive]:
+    """Archive files whose time range overlaps ``start``/``end``, newest first."""
+    statement = select(EventArchive)
+    if start:
+        statement = statement.where(EventArchive.end >= start)
+    if end:
+        statement = statement.where(EventArchive.start <= end)
+    return list(session.exec(statement.order_by(EventArchive.end.desc())).all())
@@ -1,6 +1,7 @@
 """CRUD helpers for tags."""
 from typing import List, Optional
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.tag import Tag
 
@@ -17,6 +18,15 @@ def get_tag(session: Session, tag_id: int) -> Optional[Tag]:
     return session.get(Tag, tag_id)
 
 
+def missing_tag_ids(session: Session, tag_ids: List[int]) -> List[int]:
+    """Ids from ``tag_ids`` with no tag row, checked in one query."""
+    wanted = set(tag_ids)
+    if not wanted:
+        return []
+    found = set(session.exec(select(Tag.id).where(Tag.id.in_(wanted))).all())
+    return [tag_id for tag_id in tag_ids if tag_id not in found]
+
+
 def get_tag_by_name(session: Session, name: str) -> Optional[Tag]:
     return session.exec(select(Tag).where(Tag.name == name)).first()
 
@@ -29,3 +39,24 @@ def list_tags(session: Session, *, skip: int = 0, limit: int = 100) -> List[Tag]
 def delete_tag(session: Session, db_tag: Tag) -> None:
     session.delete(db_tag)
     session.commit()
+
+
+# Async variants: same helpers, run on an AsyncSession via run_sync
+async def create_tag_async(session: AsyncSession, name: str) -> Tag:
+    return await session.run_sync(create_tag, name)
+
+
+async def get_tag_async(session: AsyncSession, tag_id: int) -> Optional[Tag]:
+    return await session.run_sync(get_tag, tag_id)
+
+
+async def get_tag_by_name_async(session: AsyncSession, name: str) -> Optional[Tag]:
+    return await session.run_sync(get_tag_by_name, name)
+
+
+async def list_tags_async(session: AsyncSession, **filters) -> List[Tag]:
+    return await session.run_sync(list_tags, **filters)
+
+
+async def delete_tag_async(session: AsyncSession, db_tag: Tag) -> None:
+    return await session.run_sync(delete_tag, db_tag)
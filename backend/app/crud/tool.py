@@ -1,7 +1,9 @@
 """CRUD helpers for tools."""
 from typing import List, Optional
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.crud import agent_tool_state, change_failure, churn, toolchain_drift
 from app.models.tool import Tool, ToolCreate, ToolUpdate
 
 
@@ -17,6 +19,15 @@ def get_tool(session: Session, tool_id: int) -> Optional[Tool]:
     return session.get(Tool, tool_id)
 
 
+def missing_tool_ids(session: Session, tool_ids: List[int]) -> List[int]:
+    """Ids from ``tool_ids`` with no tool row, checked in one query."""
+    wanted = set(tool_ids)
+    if not wanted:
+        return []
+    found = set(session.exec(select(Tool.id).where(Tool.id.in_(wanted))).all())
+    return [tool_id for tool_id in tool_ids if tool_id not in found]
+
+
 def get_tool_by_name(session: Session, name: str) -> Optional[Tool]:
     return session.exec(select(Tool).where(Tool.name == name)).first()
 
@@ -43,10 +54,40 @@ def update_tool(session: Session, db_tool: Tool, tool_in: ToolUpdate) -> Tool:
         setattr(db_tool, key, value)
     session.add(db_tool)
     session.commit()
+    toolchain_drift.invalidate()  # names appear in the report
     session.refresh(db_tool)
     return db_tool
 
 
 def delete_tool(session: Session, db_tool: Tool) -> None:
+    agent_tool_state.forget_tool(session, db_tool.id)
+    churn.forget(session, "tool", db_tool.id)
+    change_failure.forget(session, "tool", db_tool.id)
     session.delete(db_tool)
     session.commit()
+    toolchain_drift.invalidate()
+
+
+# Async variants: same helpers, run on an AsyncSession via run_sync
+async def create_tool_async(session: AsyncSession, tool_in: ToolCreate) -> Tool:
+    return await session.run_sync(create_tool, tool_in)
+
+
+async def get_tool_async(session: AsyncSession, tool_id: int) -> Optional[Tool]:
+    return await session.run_sync(get_tool, tool_id)
+
+
+async def get_tool_by_name_async(session: AsyncSession, name: str) -> Optional[Tool]:
+    return await session.run_sync(get_tool_by_name, name)
+
+
+async def list_tools_async(session: AsyncSession, **filters) -> List[Tool]:
+    return await session.run_sync(list_tools, **filters)
+
+
+async def update_tool_async(session: AsyncSession, db_tool: Tool, tool_in: ToolUpdate) -> Tool:
+    return await session.run_sync(update_tool, db_tool, tool_in)
+
+
+async def delete_tool_async(session: AsyncSession, db_tool: Tool) -> None:
+    return await session.run_sync(delete_tool, db_tool)
@@ -0,0 +1,186 @@
+"""
+Point-in-time tool state.
+
+``state_at`` answers "what was installed at T" from the newest checkpoint at
+or before T plus one windowed query over the event tool links between the
+checkpoint and T, so its cost is bounded by the checkpoint interval rather
+than the length of history. Checkpoints are written by the checkpoint job
+(``app.jobs.checkpoints``); event writes dated at or before a checkpoint
+recompute the (agent, tool) rows they touch in it (``patch_from``) so snapshots
+never disagree with history.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.partitions import month_key
+from app.crud.agent_tool_state import Pair, latest_versions
+from app.models.agent import Agent, EventAgent
+from app.models.event import Event
+from app.models.tool import EventTool, Tool
+from app.models.tool_checkpoint import AgentStateRead, ToolStateCheckpoint, ToolVersionAt
+
+State = Dict[Pair, Tuple[str, datetime]]
+
+
+def latest_checkpoint_at(session: Session, at: Optional[datetime] = None) -> Optional[datetime]:
+    """``taken_at`` of the newest checkpoint (at or before ``at``), or None."""
+    statement = select(func.max(ToolStateCheckpoint.taken_at))
+    if at is not None:
+        statement = statement.where(ToolStateCheckpoint.taken_at <= at)
+    return session.exec(statement).one()
+
+
+def state_at(
+    session: Session, at: datetime, agent_ids: Optional[Iterable[int]] = None
+) -> Tuple[Optional[datetime], State]:
+    """Map (agent_id, tool_id) to (version, since) as of ``at``; returns the checkpoint used too."""
+    agent_ids = set(agent_ids) if agent_ids is not None else None
+    checkpoint_at = latest_checkpoint_at(session, at)
+
+    state: State = {}
+    if checkpoint_at is not None:
+        statement = select(
+            ToolStateCheckpoint.agent_id, ToolStateCheckpoint.tool_id, ToolStateCheckpoint.version, ToolStateCheckpoint.since
+        ).where(ToolStateCheckpoint.taken_at == checkpoint_at)
+        if agent_ids is not None:
+            statement = statement.where(ToolStateCheckpoint.agent_id.in_(agent_ids))
+        for agent_id, tool_id, version, since in session.exec(statement).all():
+            state[(agent_id, tool_id)] = (version, since)
+
+    for row in session.exec(latest_versions(agent_ids, after=checkpoint_at, until=at)).all():
+        state[(row.agent_id, row.tool_id)] = (row.version, row.since)
+    return checkpoint_at, state
+
+
+def agent_states(session: Session, at: datetime, agent_ids: Optional[List[int]] = None) -> List[AgentStateRead]:
+    """Tool versions per agent as of ``at`` (every agent when ``agent_ids`` is None)."""
+    checkpoint_at, state = state_at(session, at, agent_ids)
+
+    agents_query = select(Agent.id, Agent.name).order_by(Agent.name)
+    if agent_ids is not None:
+        agents_query = agents_query.where(Agent.id.in_(agent_ids))
+    agents = session.exec(agents_query).all()
+    tool_ids = {tool_id for _, tool_id in state}
+    tool_names = dict(session.exec(select(Tool.id, Tool.name).where(Tool.id.in_(tool_ids))).all()) if tool_ids else {}
+
+    tools_by_agent: Dict[int, List[ToolVersionAt]] = {}
+    for (agent_id, tool_id), (version, since) in state.items():
+        if tool_id in tool_names:
+            tools_by_agent.setdefault(agent_id, []).append(
+                ToolVersionAt(tool_id=tool_id, tool_name=tool_names[tool_id], version=version, since=since)
+            )
+    return [
+        AgentStateRead(
+            agent_id=agent_id,
+            agent_name=name,
+            at=at,
+            checkpoint_at=checkpoint_at,
+            tools=sorted(tools_by_agent.get(agent_id, []), key=lambda tool: tool.tool_name),
+        )
+        for agent_id, name in agents
+    ]
+
+
+def create_checkpoint(session: Session, now: Optional[datetime] = None) -> int:
+    """Snapshot the fleet as of ``now`` and prune old snapshots; returns the rows written."""
+    now = now or datetime.utcnow()
+    _, state = state_at(session, now)
+    rows = [
+        {"taken_at": now, "agent_id": agent_id, "tool_id": tool_id, "version": version, "since": since}
+        for (agent_id, tool_id), (version, since) in state.items()
+    ]
+    if rows:
+        session.exec(insert(ToolStateCheckpoint), params=rows)
+
+    # Keep the newest TOOL_STATE_CHECKPOINT_KEEP snapshots
+    cutoff = session.exec(
+        select(ToolStateCheckpoint.taken_at)
+        .distinct()
+        .order_by(ToolStateCheckpoint.taken_at.desc())
+        .offset(max(settings.TOOL_STATE_CHECKPOINT_KEEP, 1))
+        .limit(1)
+    ).first()
+    if cutoff is not None:
+        session.exec(delete(ToolStateCheckpoint).where(ToolStateCheckpoint.taken_at <= cutoff))
+    session.commit()
+    return len(rows)
+
+
+def patch_from(session: Session, timestamp: datetime, pairs: Iterable[Pair]) -> None:
+    """
+    Recompute ``pairs`` in the checkpoints a change dated ``timestamp`` alters (taken at or after it).
+
+    The rest of each snapshot stays valid, so backdated events keep the
+    checkpoints (the job only ever writes new ones). The pairs are replayed
+    once from the last unaffected checkpoint across every affected one.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return
+    taken = session.exec(
+        select(ToolStateCheckpoint.taken_at)
+        .distinct()
+        .where(ToolStateCheckpoint.taken_at >= timestamp)
+        .order_by(ToolStateCheckpoint.taken_at)
+    ).all()
+    if not taken:
+        return
+
+    # The newest checkpoint before the change still holds: start from its rows
+    base_at = session.exec(
+        select(func.max(ToolStateCheckpoint.taken_at)).where(ToolStateCheckpoint.taken_at < timestamp)
+    ).one()
+    agent_ids = {agent_id for agent_id, _ in pairs}
+    tool_ids = {tool_id for _, tool_id in pairs}
+    rows = session.exec(
+        select(ToolStateCheckpoint).where(
+            ToolStateCheckpoint.taken_at >= (timestamp if base_at is None else base_at),
+            ToolStateCheckpoint.agent_id.in_(agent_ids),
+            ToolStateCheckpoint.tool_id.in_(tool_ids),
+        )
+    ).all()
+    rows = [row for row in rows if (row.agent_id, row.tool_id) in pairs]
+    state: State = {
+        (row.agent_id, row.tool_id): (row.version, row.since) for row in rows if row.taken_at == base_at
+    }
+    stale = [row.id for row in rows if row.taken_at >= timestamp]
+    if stale:
+        session.exec(delete(ToolStateCheckpoint).where(ToolStateCheckpoint.id.in_(stale)))
+
+    partitioned = (Event, EventAgent, EventTool)
+    history = (
+        select(EventAgent.agent_id, EventTool.tool_id, EventTool.version_to, Event.timestamp)
+        .join(EventTool, EventTool.event_id == EventAgent.event_id)
+        .join(Event, Event.id == EventAgent.event_id)
+        .where(
+            EventTool.version_to.is_not(None),
+            EventAgent.agent_id.in_(agent_ids),
+            EventTool.tool_id.in_(tool_ids),
+            Event.timestamp <= taken[-1],
+            *(model.partition_month <= month_key(taken[-1]) for model in partitioned),
+        )
+        .order_by(Event.timestamp, Event.id, EventTool.id)
+    )
+    if base_at is not None:
+        history = history.where(
+            Event.timestamp > base_at, *(model.partition_month >= month_key(base_at) for model in partitioned)
+        )
+    links = session.exec(history).all()
+
+    values, position = [], 0
+    for taken_at in taken:
+        while position < len(links) and links[position].timestamp <= taken_at:
+            agent_id, tool_id, version, since = links[position]
+            if (agent_id, tool_id) in pairs:
+                state[(agent_id, tool_id)] = (version, since)
+            position += 1
+        values.extend(
+            {"taken_at": taken_at, "agent_id": agent_id, "tool_id": tool_id, "version": version, "since": since}
+            for (agent_id, tool_id), (version, since) in state.items()
+        )
+    if values:
+        session.exec(insert(ToolStateCheckpoint), params=values)
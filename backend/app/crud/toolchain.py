@@ -1,8 +1,9 @@
 """CRUD helpers for toolchains."""
 from typing import List, Optional
-from sqlalchemy import delete
+from sqlalchemy import delete, insert
 from sqlmodel import Session, select
 
+from app.crud import change_failure, toolchain_drift
 from app.models.toolchain import Toolchain, ToolchainCreate, ToolchainUpdate, ToolchainTool
 
 
@@ -10,6 +11,7 @@ def create_toolchain(session: Session, tc_in: ToolchainCreate) -> Toolchain:
     db_tc = Toolchain(**tc_in.model_dump())
     session.add(db_tc)
     session.commit()
+    toolchain_drift.invalidate()
     session.refresh(db_tc)
     return db_tc
 
@@ -29,20 +31,24 @@ def update_toolchain(session: Session, db_tc: Toolchain, tc_in: ToolchainUpdate)
         setattr(db_tc, key, value)
     session.add(db_tc)
     session.commit()
+    toolchain_drift.invalidate()
     session.refresh(db_tc)
     return db_tc
 
 
 def delete_toolchain(session: Session, db_tc: Toolchain) -> None:
+    change_failure.forget(session, "toolchain", db_tc.id)
     session.delete(db_tc)
     session.commit()
+    toolchain_drift.invalidate()
 
 
 def set_toolchain_tools(session: Session, db_tc: Toolchain, tool_ids: List[int]) -> Toolchain:
     session.exec(delete(ToolchainTool).where(ToolchainTool.toolchain_id == db_tc.id))
     session.flush()
-    for tool_id in tool_ids:
-        session.add(ToolchainTool(toolchain_id=db_tc.id, tool_id=tool_id))
+    if tool_ids:
+        session.exec(insert(ToolchainTool), params=[{"toolchain_id": db_tc.id, "tool_id": tool_id} for tool_id in tool_ids])
     session.commit()
+    toolchain_drift.invalidate()
     session.refresh(db_tc)
     return db_tc
@@ -0,0 +1,115 @@
+"""
+Toolchain drift: agents missing a toolchain's tools or on divergent versions.
+
+An agent is checked against a toolchain when it has at least one of the
+toolchain's tools (``agent_tool_state``). The expected version of a tool is
+the most common version across the fleet (ties go to the higher version
+string). The whole report is two set-based queries; the result is cached
+per process until a relevant write in that process (events touching tool
+state, inventory or toolchain changes) calls ``invalidate``, and for at most
+``TOOLCHAIN_DRIFT_CACHE_TTL`` seconds otherwise.
+"""
+from typing import Dict, List
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.agent import Agent
+from app.models.agent_tool_state import AgentToolState
+from app.models.tool import Tool
+from app.models.toolchain import AgentDrift, DriftTool, Toolchain, ToolchainDrift, ToolchainTool
+
+drift_cache = TTLCache(maxsize=1, ttl=settings.TOOLCHAIN_DRIFT_CACHE_TTL, name="toolchain_drift")
+_REPORT = "report"
+# Bumped by every invalidation so a report computed across a write is not cached
+_generation = 0
+
+
+def invalidate() -> None:
+    global _generation
+    _generation += 1
+    drift_cache.pop(_REPORT)
+
+
+def _expected_versions():
+    counts = (
+        select(AgentToolState.tool_id, AgentToolState.version, func.count().label("agents"))
+        .group_by(AgentToolState.tool_id, AgentToolState.version)
+        .subquery()
+    )
+    rank = func.row_number().over(
+        partition_by=counts.c.tool_id, order_by=(counts.c.agents.desc(), counts.c.version.desc())
+    )
+    ranked = select(counts.c.tool_id, counts.c.version, rank.label("rank")).subquery()
+    return select(ranked.c.tool_id, ranked.c.version).where(ranked.c.rank == 1).subquery("expected")
+
+
+def compute_drift(session: Session) -> List[ToolchainDrift]:
+    members = select(ToolchainTool.toolchain_id, ToolchainTool.tool_id).distinct().subquery("members")
+    scoped = (
+        select(members.c.toolchain_id, AgentToolState.agent_id)
+        .join(AgentToolState, AgentToolState.tool_id == members.c.tool_id)
+        .distinct()
+        .subquery("scoped")
+    )
+    required = members.alias("required")
+    expected = _expected_versions()
+    state = aliased(AgentToolState)
+
+    findings = session.exec(
+        select(
+            scoped.c.toolchain_id,
+            scoped.c.agent_id,
+            Agent.name,
+            required.c.tool_id,
+            Tool.name,
+            state.version,
+            expected.c.version,
+        )
+        .join(required, required.c.toolchain_id == scoped.c.toolchain_id)
+        .join(Agent, Agent.id == scoped.c.agent_id)
+        .join(Tool, Tool.id == required.c.tool_id)
+        .outerjoin(state, and_(state.agent_id == scoped.c.agent_id, state.tool_id == required.c.tool_id))
+        .outerjoin(expected, expected.c.tool_id == required.c.tool_id)
+        .where(or_(state.version.is_(None), state.version != expected.c.version))
+        .order_by(Agent.name, Tool.name)
+    ).all()
+
+    agents_checked = func.count(scoped.c.agent_id)
+    toolchains = session.exec(
+        select(Toolchain.id, Toolchain.name, agents_checked)
+        .outerjoin(scoped, scoped.c.toolchain_id == Toolchain.id)
+        .group_by(Toolchain.id, Toolchain.name)
+        .order_by(Toolchain.name)
+    ).all()
+
+    drift: Dict[int, Dict[int, AgentDrift]] = {toolchain_id: {} for toolchain_id, _, _ in toolchains}
+    for toolchain_id, agent_id, agent_name, tool_id, tool_name, version, expected_version in findings:
+        agent = drift[toolchain_id].setdefault(
+            agent_id, AgentDrift(agent_id=agent_id, agent_name=agent_name, missing=[], divergent=[])
+        )
+        tool = DriftTool(tool_id=tool_id, tool_name=tool_name, version=version, expected_version=expected_version)
+        (agent.missing if version is None else agent.divergent).append(tool)
+
+    return [
+        ToolchainDrift(
+            toolchain_id=toolchain_id,
+            toolchain_name=name,
+            agents_checked=checked,
+            agents=list(drift[toolchain_id].values()),
+        )
+        for toolchain_id, name, checked in toolchains
+    ]
+
+
+def get_drift(session: Session) -> List[ToolchainDrift]:
+    report = drift_cache.get(_REPORT)
+    if report is None:
+        generation = _generation
+        report = compute_drift(session)
+        if generation == _generation:
+            drift_cache.set(_REPORT, report)
+    return report
@@ -2,9 +2,15 @@
 from typing import Optional
 from datetime import datetime
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.user import User, UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.auth_cache import invalidate_principal
+from app.core.security import (
+    get_password_hash,
+    verify_and_update_password,
+    verify_and_update_password_async,
+)
 
 
 def get_user_by_email(session: Session, email: str) -> Optional[User]:
@@ -37,19 +43,25 @@ def get_user_by_id(session: Session, user_id: int) -> Optional[User]:
     return session.get(User, user_id)
 
 
-def create_user(session: Session, user_create: UserCreate) -> User:
+def create_user(
+    session: Session,
+    user_create: UserCreate,
+    hashed_password: Optional[str] = None,
+) -> User:
     """
     Create a new user.
     
     Args:
         session: Database session
         user_create: User creation data
+        hashed_password: Pre-computed hash (e.g. from the hashing executor)
         
     Returns:
         Created user
     """
     # Hash password
-    hashed_password = get_password_hash(user_create.password)
+    if hashed_password is None:
+        hashed_password = get_password_hash(user_create.password)
     
     # Create user instance
     db_user = User(
@@ -68,7 +80,12 @@ def create_user(session: Session, user_create: UserCreate) -> User:
     return db_user
 
 
-def update_user(session: Session, user: User, user_update: UserUpdate) -> User:
+def update_user(
+    session: Session,
+    user: User,
+    user_update: UserUpdate,
+    hashed_password: Optional[str] = None,
+) -> User:
     """
     Update a user.
     
@@ -76,6 +93,7 @@ def update_user(session: Session, user: User, user_update: UserUpdate) -> User:
         session: Database session
         user: User to update
         user_update: Update data
+        hashed_password: Pre-computed hash of the new password (e.g. from the hashing executor)
         
     Returns:
         Updated user
@@ -85,7 +103,9 @@ def update_user(session: Session, user: User, user_update: UserUpdate) -> User:
     # Handle password update separately
     if "password" in update_data:
         password = update_data.pop("password")
-        update_data["hashed_password"] = get_password_hash(password)
+        if hashed_password is None:
+            hashed_password = get_password_hash(password)
+        update_data["hashed_password"] = hashed_password
     
     # Update fields
     for field, value in update_data.items():
@@ -96,6 +116,7 @@ def update_user(session: Session, user: User, user_update: UserUpdate) -> User:
     session.add(user)
     session.commit()
     session.refresh(user)
+    invalidate_principal(user.id)
     
     return user
 
@@ -116,12 +137,46 @@ def authenticate_user(session: Session, email: str, password: str) -> Optional[U
     if not user:
         return None
     
-    if not verify_password(password, user.hashed_password):
+    is_valid, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not is_valid:
         return None
     
+    if new_hash:
+        _store_rehashed_password(session, user, new_hash)
+    
+    return user
+
+
+async def authenticate_user_async(session: AsyncSession, email: str, password: str) -> Optional[User]:
+    """
+    Authenticate a user by email and password without blocking the event loop.
+    
+    Same semantics as ``authenticate_user``, but queries run on an async
+    session and password verification runs on the bounded hashing executor.
+    """
+    user = await get_user_by_email_async(session, email)
+    if not user:
+        return None
+    
+    is_valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not is_valid:
+        return None
+    
+    if new_hash:
+        await session.run_sync(_store_rehashed_password, user, new_hash)
+    
     return user
 
 
+def _store_rehashed_password(session: Session, user: User, new_hash: str) -> None:
+    """Persist a hash upgraded to the current argon2 parameters."""
+    user.hashed_password = new_hash
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    invalidate_principal(user.id)
+
+
 def delete_user(session: Session, user: User) -> None:
     """
     Delete a user.
@@ -130,5 +185,42 @@ def delete_user(session: Session, user: User) -> None:
         session: Database session
         user: User to delete
     """
+    user_id = user.id
     session.delete(user)
     session.commit()
+    invalidate_principal(user_id)
+
+
+# Async variants: same helpers, run on an AsyncSession via run_sync
+async def get_user_by_email_async(session: AsyncSession, email: str) -> Optional[User]:
+    """Async variant of ``get_user_by_email``."""
+    return await session.run_sync(get_user_by_email, email)
+
+
+async def get_user_by_id_async(session: AsyncSession, user_id: int) -> Optional[User]:
+    """Async variant of ``get_user_by_id``."""
+    return await session.run_sync(get_user_by_id, user_id)
+
+
+async def create_user_async(
+    session: AsyncSession,
+    user_create: UserCreate,
+    hashed_password: Optional[str] = None,
+) -> User:
+    """Async variant of ``create_user`` (pass ``hashed_password`` to keep hashing off the loop)."""
+    return await session.run_sync(create_user, user_create, hashed_password)
+
+
+async def update_user_async(
+    session: AsyncSession,
+    user: User,
+    user_update: UserUpdate,
+    hashed_password: Optional[str] = None,
+) -> User:
+    """Async variant of ``update_user`` (pass ``hashed_password`` to keep hashing off the loop)."""
+    return await session.run_sync(update_user, user, user_update, hashed_password)
+
+
+async def delete_user_async(session: AsyncSession, user: User) -> None:
+    """Async variant of ``delete_user``."""
+    return await session.run_sync(delete_user, user)
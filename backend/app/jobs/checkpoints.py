@@ -0,0 +1,65 @@
+"""
+Periodic tool-state checkpoints.
+
+Every ``TOOL_STATE_CHECKPOINT_INTERVAL`` seconds the leader snapshots the
+fleet's tool versions into ``tool_state_checkpoints`` so point-in-time
+queries (``/api/agents/state``) replay at most one interval of changes.
+"""
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.crud import tool_checkpoint
+
+logger = logging.getLogger(__name__)
+
+
+def run_checkpoint(now: Optional[datetime] = None) -> Optional[int]:
+    """Write a checkpoint unless a recent one exists; returns rows written or None when skipped."""
+    from app.core.database import engine
+
+    now = now or datetime.utcnow()
+    with Session(engine) as session:
+        latest = tool_checkpoint.latest_checkpoint_at(session)
+        # Restarts and leader changes do not add snapshots within one interval
+        if latest is not None and latest > now - timedelta(seconds=settings.TOOL_STATE_CHECKPOINT_INTERVAL):
+            return None
+        return tool_checkpoint.create_checkpoint(session, now)
+
+
+async def _run_checkpoints(stop_event: asyncio.Event, interval_seconds: int):
+    while not stop_event.is_set():
+        try:
+            rows = await asyncio.to_thread(run_checkpoint)
+            if rows is not None:
+                logger.info("Wrote tool-state checkpoint (%d rows)", rows)
+        except Exception:  # pragma: no cover - defensive logging
+            logger.exception("Checkpoint job error")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval_seconds)
+        except asyncio.TimeoutError:
+            continue
+
+
+def start_checkpoint_job(stop_event: asyncio.Event) -> asyncio.Task | None:
+    """Start the checkpoint job if enabled. Returns the task or None when disabled."""
+    if not settings.TOOL_STATE_CHECKPOINT_INTERVAL:
+        logger.info("Tool-state checkpoints disabled (TOOL_STATE_CHECKPOINT_INTERVAL=0)")
+        return None
+    interval = max(settings.TOOL_STATE_CHECKPOINT_INTERVAL, 60)
+    logger.info("Starting tool-state checkpoint job with interval=%ss", interval)
+    return asyncio.create_task(_run_checkpoints(stop_event, interval))
+
+
+async def stop_checkpoint_job(task: asyncio.Task | None, stop_event: asyncio.Event):
+    """Signal stop and await the checkpoint task if running."""
+    stop_event.set()
+    if task:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
@@ -0,0 +1,223 @@
+"""
+Retention job: move expired events into compressed archive files.
+
+Each event's retention comes from the most specific matching
+``RetentionPolicy`` (event_type/severity/source), falling back to
+``RETENTION_DEFAULT_DAYS``. The job selects expired events in chunks of
+``RETENTION_BATCH_SIZE``; every chunk is written to one gzip JSONL file under
+``ARCHIVE_DIR`` (events serialized like ``EventRead``, relations included)
+and then removed with one set-based DELETE per table, in the same
+transaction that records the file in ``event_archives``.
+
+Archived events stay readable through ``read_archived_events``, which scans
+the files whose time range overlaps the query; slower, but nothing is lost.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+from collections import defaultdict
+from contextlib import suppress
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import and_, delete, or_
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.partitions import month_key
+from app.crud import retention as crud_retention
+from app.models.agent import EventAgent
+from app.models.event import Event, EventRead
+from app.models.tag import EventTag
+from app.models.tool import EventTool
+
+logger = logging.getLogger(__name__)
+
+
+def expired_condition(resolved: Dict, now: datetime):
+    """SQL condition matching events past their retention, or None if nothing expires."""
+    grouped = defaultdict(list)
+    for (event_type, severity, source), days in resolved.items():
+        if days is not None:
+            grouped[(days, event_type, severity)].append(source)
+    if not grouped:
+        return None
+    clauses = []
+    for (days, event_type, severity), sources in grouped.items():
+        cutoff = now - timedelta(days=days)
+        clauses.append(and_(
+            Event.partition_month <= month_key(cutoff),
+            Event.timestamp < cutoff,
+            Event.event_type == event_type,
+            Event.severity == severity,
+            Event.source.in_(sources),
+        ))
+    return or_(*clauses)
+
+
+def _write_archive(archive_dir: Path, records: List[dict]) -> str:
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    name = f"events-{datetime.utcnow():%Y%m%dT%H%M%S%f}-{records[0]['id']}.jsonl.gz"
+    tmp = archive_dir / f".{name}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+        for record in records:
+            fh.write(json.dumps(record, separators=(",", ":")))
+            fh.write("\n")
+    os.replace(tmp, archive_dir / name)
+    return name
+
+
+def archive_expired(
+    session: Session,
+    *,
+    now: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+    archive_dir: Optional[str] = None,
+    max_batches: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Archive and delete expired events, at most ``max_batches`` chunks (default: all).
+
+    Returns event/file counts and ``more``: whether expired events remain.
+    """
+    from app.api.events import _attach_relations
+
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    directory = Path(archive_dir or settings.ARCHIVE_DIR)
+    resolved = crud_retention.resolve_policies(
+        crud_retention.list_policies(session), settings.RETENTION_DEFAULT_DAYS
+    )
+    condition = expired_condition(resolved, now)
+    totals = {"events": 0, "files": 0, "more": False}
+    if condition is None:
+        return totals
+
+    while True:
+        # One extra row tells whether another chunk follows, without another query
+        statement = select(Event).where(condition).order_by(Event.timestamp, Event.id).limit(batch_size + 1)
+        events = list(session.exec(statement).all())
+        if not events:
+            break
+        more = len(events) > batch_size
+        events = events[:batch_size]
+        _attach_relations(session, events)
+        records = [EventRead.model_validate(event).model_dump(mode="json") for event in events]
+        ids = [event.id for event in events]
+        name = _write_archive(directory, records)
+        try:
+            for link in (EventAgent, EventTool, EventTag):
+                session.exec(delete(link).where(link.event_id.in_(ids)))
+            session.exec(delete(Event).where(Event.id.in_(ids)))
+            crud_retention.add_archive(session, name, events[0].timestamp, events[-1].timestamp, len(ids))
+            session.commit()
+        except Exception:
+            session.rollback()
+            (directory / name).unlink(missing_ok=True)
+            raise
+        session.expunge_all()
+        totals["events"] += len(ids)
+        totals["files"] += 1
+        metrics.inc("retention.events_archived", len(ids))
+        if not more:
+            break
+        if max_batches is not None and totals["files"] >= max_batches:
+            totals["more"] = True
+            break
+    return totals
+
+
+def _iter_archive(path: Path) -> Iterator[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_archived_events(
+    session: Session,
+    *,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    agent_id: Optional[int] = None,
+    tool_id: Optional[int] = None,
+    event_type: Optional[str] = None,
+    severity: Optional[str] = None,
+    source: Optional[str] = None,
+    search: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    archive_dir: Optional[str] = None,
+) -> List[dict]:
+    """Query archived events with the ``list_events`` filters (newest first)."""
+    directory = Path(archive_dir or settings.ARCHIVE_DIR)
+    needle = search.lower() if search else None
+    matches: List[dict] = []
+    for archive in crud_retention.list_archives(session, start=start, end=end):
+        path = directory / archive.path
+        if not path.exists():
+            logger.warning("Archive file %s is missing", path)
+            continue
+        for record in _iter_archive(path):
+            timestamp = datetime.fromisoformat(record["timestamp"])
+            if (start and timestamp < start) or (end and timestamp > end):
+                continue
+            if event_type and record["event_type"] != event_type:
+                continue
+            if severity and record["severity"] != severity:
+                continue
+            if source and record["source"] != source:
+                continue
+            if agent_id and all(a["id"] != agent_id for a in record.get("agents") or []):
+                continue
+            if tool_id and all(t["id"] != tool_id for t in record.get("tools") or []):
+                continue
+            if needle and needle not in f"{record['title']}\n{record.get('description') or ''}".lower():
+                continue
+            matches.append(record)
+    matches.sort(key=lambda r: r["timestamp"], reverse=True)
+    return matches[skip:skip + limit]
+
+
+def run_retention() -> Dict[str, int]:
+    from app.core.database import engine
+
+    with Session(engine) as session:
+        return archive_expired(session)
+
+
+async def _run_retention(stop_event: asyncio.Event, interval_seconds: int):
+    while not stop_event.is_set():
+        try:
+            totals = await asyncio.to_thread(run_retention)
+            if totals["events"]:
+                logger.info("Archived %d expired events into %d files", totals["events"], totals["files"])
+        except Exception:  # pragma: no cover - defensive logging
+            logger.exception("Retention job error")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval_seconds)
+        except asyncio.TimeoutError:
+            continue
+
+
+def start_retention_job(stop_event: asyncio.Event) -> asyncio.Task | None:
+    """Start the retention job if enabled. Returns the task or None when disabled."""
+    if not settings.RETENTION_ENABLED:
+        logger.info("Retention job disabled (RETENTION_ENABLED=false)")
+        return None
+    interval = max(settings.RETENTION_INTERVAL, 60)
+    logger.info("Starting retention job with interval=%ss", interval)
+    return asyncio.create_task(_run_retention(stop_event, interval))
+
+
+async def stop_retention_job(task: asyncio.Task | None, stop_event: asyncio.Event):
+    """Signal stop and await the retention task if running."""
+    stop_event.set()
+    if task:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
@@ -1,53 +1,99 @@
 """CI Ledger - Infrastructure Change Tracker API"""
 import asyncio
+import sys
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlmodel import Session
 
 from app.core.config import settings
-from app.core.database import create_db_and_tables, get_session
-from app.api import auth, users, tokens, events, agents, tools, toolchains, tags, items, webhooks
+from app.core.database import dispose_async_engine, engine
+from app.core.details_paths import ensure_details_indexes
+from app.core.leader import start_leader_jobs, stop_leader_jobs
+from app.core.migrations import prepare_database
+from app.core.partitions import ensure_partitions
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.read_routing import ReadYourWritesMiddleware
+from app.core.security import shutdown_password_hasher
+from app.core.write_lane import shutdown_write_lane
+from app.api import auth, users, tokens, events, agents, tools, toolchains, tags, items, webhooks, metrics, partitions, retention, analytics, details_paths
 from app.ingestion import poller
+from app.jobs import checkpoints as checkpoint_job
+from app.jobs import retention as retention_job
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan events."""
-    # Startup: create database tables and seed core data
-    create_db_and_tables()
+def prepare_app_database():
+    """Check the schema, create upcoming partitions and seed the admin user (idempotent)."""
+    # Check the schema revision (creating an empty database)
+    prepare_database(engine)
+    # Native partitioning only: pre-create the coming months' partitions
+    ensure_partitions(engine)
+    # Expression indexes for declared details hot paths (no-op once they exist)
+    ensure_details_indexes(engine)
 
     from app.crud import user as crud_user
     from app.models.user import UserCreate
     from app import seeds
 
-    session = next(get_session())
-    admin = crud_user.get_user_by_email(session, settings.FIRST_SUPERUSER_EMAIL)
-    if not admin:
-        admin_create = UserCreate(
-            email=settings.FIRST_SUPERUSER_EMAIL,
-            password=settings.FIRST_SUPERUSER_PASSWORD,
-            full_name="Admin User",
-            is_admin=True,
-            is_active=True,
-        )
-        crud_user.create_user(session, admin_create)
-        print(f"? Created admin user: {settings.FIRST_SUPERUSER_EMAIL}")
-
-    # Optionally seed sample data for local development
-    if settings.SEED_SAMPLE_DATA and settings.ENVIRONMENT == "development":
-        seeds.seed_sample_data(session)
-        print("ⓘ Seeded sample CI Ledger data")
-
-    # Start background pollers (disabled by default)
+    with Session(engine) as session:
+        admin = crud_user.get_user_by_email(session, settings.FIRST_SUPERUSER_EMAIL)
+        if not admin:
+            admin_create = UserCreate(
+                email=settings.FIRST_SUPERUSER_EMAIL,
+                password=settings.FIRST_SUPERUSER_PASSWORD,
+                full_name="Admin User",
+                is_admin=True,
+                is_active=True,
+            )
+            crud_user.create_user(session, admin_create)
+            print(f"? Created admin user: {settings.FIRST_SUPERUSER_EMAIL}")
+
+        # Optionally seed sample data for local development
+        if settings.SEED_SAMPLE_DATA and settings.ENVIRONMENT == "development":
+            seeds.seed_sample_data(session)
+            print("ⓘ Seeded sample CI Ledger data")
+
+
+def start_background_jobs():
+    """Start pollers and scheduled jobs; only called in the elected leader process."""
+    job_stop_event = asyncio.Event()
+    return (
+        job_stop_event,
+        poller.start_pollers(job_stop_event),
+        retention_job.start_retention_job(job_stop_event),
+        checkpoint_job.start_checkpoint_job(job_stop_event),
+    )
+
+
+async def stop_background_jobs(jobs):
+    job_stop_event, poller_task, retention_task, checkpoint_task = jobs
+    await poller.stop_pollers(poller_task, job_stop_event)
+    await retention_job.stop_retention_job(retention_task, job_stop_event)
+    await checkpoint_job.stop_checkpoint_job(checkpoint_task, job_stop_event)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan events."""
+    # Startup: prepare the database and seed core data
+    prepare_app_database()
+
+    # Background pollers/jobs run in one process only (see LEADER_ELECTION)
     stop_event = asyncio.Event()
-    app.state.poller_stop_event = stop_event
-    app.state.poller_task = poller.start_pollers(stop_event)
+    app.state.leader_stop_event = stop_event
+    app.state.leader_task = start_leader_jobs(stop_event, start_background_jobs, stop_background_jobs)
 
     yield
 
-    # Shutdown: cleanup if needed
-    if hasattr(app.state, "poller_task"):
-        await poller.stop_pollers(app.state.poller_task, stop_event)
+    # Shutdown: stop jobs (releasing leadership) and cleanup
+    await stop_leader_jobs(app.state.leader_task, stop_event)
+    shutdown_write_lane()
+    await dispose_async_engine()
+    shutdown_password_hasher()
+    # LDAP is imported on first use; only reset a pool this worker actually opened
+    ldap_module = sys.modules.get("app.core.ldap_service")
+    if ldap_module is not None:
+        ldap_module.ldap_service.reset_pool()
 
 
 # Create FastAPI app
@@ -137,6 +183,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryStatsMiddleware)
 
 # Include routers
 app.include_router(auth.router)
@@ -149,6 +197,11 @@ app.include_router(tools.router)
 app.include_router(toolchains.router)
 app.include_router(tags.router)
 app.include_router(webhooks.router)
+app.include_router(metrics.router)
+app.include_router(partitions.router)
+app.include_router(retention.router)
+app.include_router(analytics.router)
+app.include_router(details_paths.router)
 
 
 @app.get("/")
@@ -8,9 +8,22 @@ from app.models.token import PersonalAccessToken, TokenCreate, TokenResponse, To
 from app.models.item import Item, ItemCreate, ItemUpdate, ItemRead
 from app.models.agent import Agent, AgentCreate, AgentUpdate, AgentRead, EventAgent
 from app.models.tool import Tool, ToolCreate, ToolUpdate, ToolRead, EventTool
-from app.models.toolchain import Toolchain, ToolchainCreate, ToolchainUpdate, ToolchainRead, ToolchainTool
-from app.models.event import Event, EventCreate, EventUpdate, EventRead
+from app.models.toolchain import (
+    Toolchain, ToolchainCreate, ToolchainUpdate, ToolchainRead, ToolchainTool,
+    DriftTool, AgentDrift, ToolchainDrift,
+)
+from app.models.event import CorrelatedEvent, Event, EventCreate, EventUpdate, EventRead
 from app.models.tag import Tag, EventTag
+from app.models.retention import RetentionPolicy, RetentionPolicyCreate, RetentionPolicyRead, EventArchive
+from app.models.lease import Lease
+from app.models.agent_tool_state import AgentToolState, AgentToolRead, ToolVersionCount
+from app.models.tool_checkpoint import ToolStateCheckpoint, ToolVersionAt, AgentStateRead
+from app.models.outage import Outage, OutageStats
+from app.models.churn import ChurnCounter, ChurnEntry
+from app.models.heatmap import Heatmap
+from app.models.change_failure import ChangeOutcome, ChangeFailureCounter, ChangeFailureRate
+from app.models.job import Job, Build
+from app.models.details_path import DetailsHotPath, DetailsHotPathCreate, DetailsHotPathRead
 
 __all__ = [
     # enums
@@ -24,6 +37,21 @@ __all__ = [
     "Agent", "AgentCreate", "AgentUpdate", "AgentRead", "EventAgent",
     "Tool", "ToolCreate", "ToolUpdate", "ToolRead", "EventTool",
     "Toolchain", "ToolchainCreate", "ToolchainUpdate", "ToolchainRead", "ToolchainTool",
-    "Event", "EventCreate", "EventUpdate", "EventRead",
+    "DriftTool", "AgentDrift", "ToolchainDrift",
+    "Event", "EventCreate", "EventUpdate", "EventRead", "CorrelatedEvent",
     "Tag", "EventTag",
+    "Job", "Build",
+    "DetailsHotPath", "DetailsHotPathCreate", "DetailsHotPathRead",
+    # retention/archival
+    "RetentionPolicy", "RetentionPolicyCreate", "RetentionPolicyRead", "EventArchive",
+    # leader election
+    "Lease",
+    # derived inventory state
+    "AgentToolState", "AgentToolRead", "ToolVersionCount",
+    "ToolStateCheckpoint", "ToolVersionAt", "AgentStateRead",
+    # analytics
+    "Outage", "OutageStats",
+    "ChurnCounter", "ChurnEntry",
+    "Heatmap",
+    "ChangeOutcome", "ChangeFailureCounter", "ChangeFailureRate",
 ]
@@ -52,6 +52,7 @@ class EventAgent(SQLModel, table=True):
     __tablename__ = "event_agents"
     id: Optional[int] = Field(default=None, primary_key=True)
     event_id: int = Field(foreign_key="events.id", index=True)
+    partition_month: Optional[int] = Field(default=None, index=True)
     agent_id: int = Field(foreign_key="agents.id", index=True)
 
     event: Optional["Event"] = Relationship(back_populates="agent_links")
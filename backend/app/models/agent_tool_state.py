@@ -0,0 +1,34 @@
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+
+class AgentToolState(SQLModel, table=True):
+    """
+    Current version of each tool on each agent, derived from event tool links.
+
+    Maintained by the event CRUD helpers: the latest event (by timestamp, then
+    id) that links the agent and sets the tool's ``version_to`` wins.
+    ``event_id`` is not a foreign key so state survives archived events.
+    """
+    __tablename__ = "agent_tool_state"
+
+    agent_id: int = Field(foreign_key="agents.id", primary_key=True)
+    tool_id: int = Field(foreign_key="tools.id", primary_key=True, index=True)
+    version: str = Field(max_length=100)
+    since: datetime = Field(description="Timestamp of the event that set this version")
+    event_id: int = Field(index=True, description="Event that set this version")
+
+
+class AgentToolRead(SQLModel):
+    tool_id: int
+    tool_name: str
+    version: str
+    since: datetime
+    event_id: int
+
+
+class ToolVersionCount(SQLModel):
+    version: str
+    agents: int
+    first_seen: datetime = Field(description="Earliest `since` among agents on this version")
+    last_seen: datetime = Field(description="Latest `since` among agents on this version")
@@ -0,0 +1,40 @@
+from datetime import date
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class ChangeOutcome(SQLModel, table=True):
+    """
+    Which counters a change event was counted under, and the outage that failed it.
+
+    One row per (change, counter): the fleet total (``all``/0) and each tool
+    and toolchain the change touched when it was recorded. Retracting a change
+    or an outage reads these rows instead of re-deriving its links, and event
+    ids are not foreign keys so outcomes survive archived events.
+    """
+    __tablename__ = "change_outcomes"
+
+    event_id: int = Field(primary_key=True)
+    kind: str = Field(primary_key=True, max_length=10, description="all, tool or toolchain")
+    entity_id: int = Field(primary_key=True, index=True)
+    day: date
+    failed_by: Optional[int] = Field(default=None, index=True, description="Outage event that failed the change")
+
+
+class ChangeFailureCounter(SQLModel, table=True):
+    """Changes and failed changes per (day of the change, all/tool/toolchain), maintained at write time."""
+    __tablename__ = "change_failure_counters"
+
+    day: date = Field(primary_key=True)
+    kind: str = Field(primary_key=True, max_length=10)
+    entity_id: int = Field(primary_key=True, index=True)
+    changes: int = Field(default=0)
+    failures: int = Field(default=0)
+
+
+class ChangeFailureRate(SQLModel):
+    key: str = Field(description="Tool name, toolchain name or bucket start, depending on `group_by`")
+    id: Optional[int] = Field(default=None, description="Tool or toolchain id")
+    changes: int
+    failures: int
+    rate: Optional[float] = Field(default=None, description="failures / changes")
@@ -0,0 +1,31 @@
+from datetime import date
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+from app.models.enums import EventSeverity, EventType
+
+
+class ChurnCounter(SQLModel, table=True):
+    """
+    Events per (day, agent or tool, event type, severity), maintained at write time.
+
+    The event CRUD helpers add and subtract counts as events and their links
+    change, so leaderboards cost one grouped read over days x entities no
+    matter how many events the window holds. Counts outlive archived or
+    dropped events.
+    """
+    __tablename__ = "churn_counters"
+
+    day: date = Field(primary_key=True)
+    kind: str = Field(primary_key=True, max_length=10, description="agent or tool")
+    entity_id: int = Field(primary_key=True, index=True)
+    event_type: EventType = Field(primary_key=True, max_length=50)
+    severity: EventSeverity = Field(primary_key=True, max_length=50)
+    count: int = Field(default=0)
+
+
+class ChurnEntry(SQLModel):
+    id: int
+    name: str
+    changes: int
+    last_day: Optional[date] = Field(default=None, description="Latest day with a counted event in the window")
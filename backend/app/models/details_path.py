@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Literal, Optional
+from sqlmodel import Field, SQLModel
+
+
+class DetailsHotPathBase(SQLModel):
+    path: str = Field(max_length=40, description="Dotted key path into event details, e.g. jenkins.status")
+    value_type: Literal["string", "number"] = Field(
+        default="string", max_length=10, description="How filters on this path compare (PostgreSQL index shape)"
+    )
+
+
+class DetailsHotPath(DetailsHotPathBase, table=True):
+    """A ``details`` path an admin declared hot; it gets an expression index on ``events``."""
+    __tablename__ = "details_hot_paths"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    path: str = Field(max_length=40, unique=True, index=True)
+    value_type: str = Field(default="string", max_length=10)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class DetailsHotPathCreate(DetailsHotPathBase):
+    pass
+
+
+class DetailsHotPathRead(DetailsHotPathBase):
+    id: int
+    created_at: datetime
+    index_name: Optional[str] = Field(default=None, description="Expression index, if this backend supports one")
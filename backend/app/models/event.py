@@ -1,11 +1,20 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
-from sqlalchemy import Column, Text
+from pydantic import field_validator
+from sqlalchemy import Column, Index, Text, event
 from sqlmodel import Field, Relationship, SQLModel
 
+from app.core.partitions import month_key
 from app.models.enums import EventSeverity, EventSource, EventType
 
 
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored and compared as naive UTC; convert aware values on the way in."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 class EventBase(SQLModel):
     title: str = Field(max_length=255)
     description: Optional[str] = Field(default=None, max_length=4000)
@@ -22,8 +31,13 @@ class EventBase(SQLModel):
 
 class Event(EventBase, table=True):
     __tablename__ = "events"
+    __table_args__ = (Index("ix_events_partition_month_timestamp", "partition_month", "timestamp"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
+    # YYYYMM of timestamp; the partition key (see app.core.partitions)
+    partition_month: Optional[int] = Field(default=None, index=True)
+    # CI build that reported this event (webhook ingestion)
+    build_id: Optional[int] = Field(default=None, foreign_key="builds.id", index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -32,11 +46,19 @@ class Event(EventBase, table=True):
     tag_links: List["EventTag"] = Relationship(back_populates="event")
 
 
+@event.listens_for(Event, "before_insert")
+@event.listens_for(Event, "before_update")
+def _set_partition_month(mapper, connection, target: Event) -> None:
+    target.partition_month = month_key(target.timestamp)
+
+
 class EventCreate(EventBase):
     agent_ids: Optional[List[int]] = None
     tool_versions: Optional[List[Dict[str, Optional[Any]]]] = None  # [{tool_id, version_from, version_to}]
     tag_ids: Optional[List[int]] = None
 
+    _naive_timestamp = field_validator("timestamp")(naive_utc)
+
 
 class EventUpdate(SQLModel):
     title: Optional[str] = Field(default=None, max_length=255)
@@ -50,11 +72,28 @@ class EventUpdate(SQLModel):
     tool_versions: Optional[List[Dict[str, Optional[Any]]]] = None
     tag_ids: Optional[List[int]] = None
 
+    _naive_timestamp = field_validator("timestamp")(naive_utc)
+
 
 class EventRead(EventBase):
     id: int
+    build_id: Optional[int] = None
     created_at: datetime
     updated_at: datetime
     agents: Optional[List[Dict[str, Any]]] = None
     tools: Optional[List[Dict[str, Any]]] = None
     tags: Optional[List[Dict[str, Any]]] = None
+
+
+class CorrelatedEvent(SQLModel):
+    """A change that preceded an event and touched some of the same agents or tools."""
+
+    id: int
+    title: str
+    timestamp: datetime
+    event_type: EventType
+    severity: EventSeverity
+    source: EventSource
+    shared_agents: int
+    shared_tools: int
+    seconds_before: float
@@ -0,0 +1,19 @@
+from datetime import date
+from typing import List, Union
+
+from sqlmodel import Field, SQLModel
+
+
+class Heatmap(SQLModel):
+    """
+    Agent x day activity as parallel arrays.
+
+    ``counts[row * len(days) + column]`` is the weighted event count of
+    ``agents[row]`` on ``days[column]``.
+    """
+    start: date
+    end: date
+    agent_ids: List[int] = Field(default_factory=list)
+    agents: List[str] = Field(default_factory=list, description="Row labels (agent names)")
+    days: List[date] = Field(default_factory=list, description="Column labels, every day from start to end")
+    counts: List[Union[int, float]] = Field(default_factory=list, description="Row-major weighted counts, len(agents) * len(days)")
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class Job(SQLModel, table=True):
+    """A CI job (Jenkins job name), created on first webhook."""
+    __tablename__ = "jobs"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(max_length=255, unique=True, index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class Build(SQLModel, table=True):
+    """
+    One run of a job. Every webhook for the same build number (started, then
+    finished) updates the row, and the events it produced point at it
+    through ``events.build_id``.
+    """
+    __tablename__ = "builds"
+    __table_args__ = (UniqueConstraint("job_id", "number", name="uq_builds_job_id_number"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job_id: int = Field(foreign_key="jobs.id", index=True)
+    number: int
+    status: str = Field(max_length=50, description="Latest reported status, e.g. SUCCESS or FAILURE")
+    url: Optional[str] = Field(default=None, max_length=1000)
+    timestamp: datetime = Field(index=True, description="Time of the latest report for this build")
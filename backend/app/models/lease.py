@@ -0,0 +1,12 @@
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+
+class Lease(SQLModel, table=True):
+    """Named lease held by one process at a time (leader election)."""
+    __tablename__ = "leases"
+
+    name: str = Field(primary_key=True, max_length=100)
+    holder: str = Field(max_length=255, description="host:pid:nonce of the current holder")
+    acquired_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(description="Others may take over after this (UTC)")
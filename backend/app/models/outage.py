@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class Outage(SQLModel, table=True):
+    """
+    One outage interval of a CI job: from its first failing build to the next successful one.
+
+    Maintained incrementally by webhook ingestion (``app.crud.outage``):
+    further failures while the interval is open only bump ``failures``, and
+    a success closes it. Event ids are not foreign keys so intervals survive
+    archived events.
+    """
+    __tablename__ = "outages"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job_name: str = Field(max_length=255, index=True)
+    agent_id: Optional[int] = Field(default=None, index=True, description="Agent of the first failing build")
+    started_at: datetime = Field(index=True)
+    resolved_at: Optional[datetime] = Field(default=None)
+    duration_seconds: Optional[float] = Field(default=None)
+    failures: int = Field(default=1, description="Failing builds while the outage was open")
+    failure_event_id: int = Field(index=True)
+    recovery_event_id: Optional[int] = Field(default=None)
+
+
+class OutageStats(SQLModel):
+    key: str = Field(description="Job name, agent name or bucket start, depending on `group_by`")
+    outages: int
+    failures: int
+    resolved: int
+    mttr_seconds: Optional[float] = Field(default=None, description="Mean duration of resolved outages")
+    p50_seconds: Optional[float] = None
+    p90_seconds: Optional[float] = None
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+from app.models.enums import EventSeverity, EventSource, EventType
+
+
+class RetentionPolicyBase(SQLModel):
+    # Unset match fields are wildcards; the most specific matching policy wins
+    event_type: Optional[EventType] = Field(default=None, max_length=50)
+    severity: Optional[EventSeverity] = Field(default=None, max_length=50)
+    source: Optional[EventSource] = Field(default=None, max_length=50)
+    keep_days: Optional[int] = Field(default=None, ge=1, description="Days to keep events (None = forever)")
+
+
+class RetentionPolicy(RetentionPolicyBase, table=True):
+    __tablename__ = "retention_policies"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class RetentionPolicyCreate(RetentionPolicyBase):
+    pass
+
+
+class RetentionPolicyRead(RetentionPolicyBase):
+    id: int
+    created_at: datetime
+
+
+class EventArchive(SQLModel, table=True):
+    """Manifest entry for one compressed archive file of expired events."""
+    __tablename__ = "event_archives"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    path: str = Field(max_length=1024, description="Archive file, relative to ARCHIVE_DIR")
+    start: datetime = Field(index=True, description="Oldest event timestamp in the file")
+    end: datetime = Field(index=True, description="Newest event timestamp in the file")
+    event_count: int
+    created_at: datetime = Field(default_factory=datetime.utcnow)
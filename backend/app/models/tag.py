@@ -15,6 +15,7 @@ class EventTag(SQLModel, table=True):
     __tablename__ = "event_tags"
     id: Optional[int] = Field(default=None, primary_key=True)
     event_id: int = Field(foreign_key="events.id", index=True)
+    partition_month: Optional[int] = Field(default=None, index=True)
     tag_id: int = Field(foreign_key="tags.id", index=True)
 
     event: Optional["Event"] = Relationship(back_populates="tag_links")
@@ -42,6 +42,7 @@ class EventTool(SQLModel, table=True):
     __tablename__ = "event_tools"
     id: Optional[int] = Field(default=None, primary_key=True)
     event_id: int = Field(foreign_key="events.id", index=True)
+    partition_month: Optional[int] = Field(default=None, index=True)
     tool_id: int = Field(foreign_key="tools.id", index=True)
     version_from: Optional[str] = Field(default=None, max_length=100)
     version_to: Optional[str] = Field(default=None, max_length=100)
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlmodel import Field, SQLModel
+
+
+class ToolStateCheckpoint(SQLModel, table=True):
+    """
+    One (agent, tool, version) row of a fleet snapshot taken at ``taken_at``.
+
+    Point-in-time queries start from the newest snapshot at or before the
+    requested moment and replay only the tool changes after it.
+    """
+    __tablename__ = "tool_state_checkpoints"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    taken_at: datetime = Field(index=True, description="State as of this moment (UTC)")
+    agent_id: int = Field(index=True)
+    tool_id: int
+    version: str = Field(max_length=100)
+    since: datetime = Field(description="Timestamp of the event that set this version")
+
+
+class ToolVersionAt(SQLModel):
+    tool_id: int
+    tool_name: str
+    version: str
+    since: datetime
+
+
+class AgentStateRead(SQLModel):
+    agent_id: int
+    agent_name: str
+    at: datetime
+    checkpoint_at: Optional[datetime] = Field(default=None, description="Snapshot the replay started from")
+    tools: List[ToolVersionAt]
@@ -41,3 +41,24 @@ class ToolchainTool(SQLModel, table=True):
 
     toolchain: Optional[Toolchain] = Relationship(back_populates="tools")
     tool: Optional["Tool"] = Relationship(back_populates="toolchains")
+
+
+class DriftTool(SQLModel):
+    tool_id: int
+    tool_name: str
+    version: Optional[str] = Field(default=None, description="Version on the agent (None = missing)")
+    expected_version: Optional[str] = Field(default=None, description="Most common version across the fleet")
+
+
+class AgentDrift(SQLModel):
+    agent_id: int
+    agent_name: str
+    missing: List[DriftTool]
+    divergent: List[DriftTool]
+
+
+class ToolchainDrift(SQLModel):
+    toolchain_id: int
+    toolchain_name: str
+    agents_checked: int = Field(description="Agents that have at least one of the toolchain's tools")
+    agents: List[AgentDrift] = Field(description="Agents missing toolchain tools or on divergent versions")
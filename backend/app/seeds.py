@@ -2,6 +2,8 @@
 from datetime import datetime, timedelta
 from sqlmodel import Session, select
 
+from app.crud import agent_tool_state, change_failure, churn
+
 from app.models import (
     Agent,
     AgentStatus,
@@ -76,12 +78,16 @@ def seed_sample_data(session: Session) -> None:
     session.refresh(event1)
     session.refresh(event2)
 
-    session.add(EventAgent(event_id=event1.id, agent_id=agent_a.id))
-    session.add(EventTool(event_id=event1.id, tool_id=tool_python.id, version_from="3.10.8", version_to="3.11.2"))
-    session.add(EventTag(event_id=event1.id, tag_id=tag_rollout.id))
+    session.add(EventAgent(event_id=event1.id, partition_month=event1.partition_month, agent_id=agent_a.id))
+    session.add(EventTool(event_id=event1.id, partition_month=event1.partition_month, tool_id=tool_python.id, version_from="3.10.8", version_to="3.11.2"))
+    session.add(EventTag(event_id=event1.id, partition_month=event1.partition_month, tag_id=tag_rollout.id))
 
-    session.add(EventAgent(event_id=event2.id, agent_id=agent_a.id))
-    session.add(EventAgent(event_id=event2.id, agent_id=agent_b.id))
-    session.add(EventTag(event_id=event2.id, tag_id=tag_outage.id))
+    session.add(EventAgent(event_id=event2.id, partition_month=event2.partition_month, agent_id=agent_a.id))
+    session.add(EventAgent(event_id=event2.id, partition_month=event2.partition_month, agent_id=agent_b.id))
+    session.add(EventTag(event_id=event2.id, partition_month=event2.partition_month, tag_id=tag_outage.id))
 
     session.commit()
+    # Links above bypass the event CRUD helpers
+    agent_tool_state.rebuild(session)
+    churn.rebuild(session)
+    change_failure.rebuild(session)
@@ -2,36 +2,87 @@
 Test configuration and fixtures for pytest.
 """
 import os
-from typing import Generator
+from datetime import datetime
+from typing import Dict, Generator, Optional, Union
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import Session, create_engine, SQLModel
-from sqlmodel.pool import StaticPool
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.main import app
+from app.core.auth_cache import clear_auth_caches
+from app.core.database import get_async_read_session, get_async_session, get_read_session
+from app.core.query_stats import add_observer, remove_observer
+from app.crud import toolchain_drift
 from app.core.deps import get_session
 from app.core.security import get_password_hash
 from app.models.user import User
 from app.models.token import PersonalAccessToken
+from app.tests.query_budgets import QUERY_BUDGETS
 
 
-# Use in-memory SQLite for testing
-TEST_DATABASE_URL = "sqlite:///:memory:"
+@pytest.fixture(autouse=True)
+def reset_auth_caches():
+    """Each test gets a fresh database, so cached principals/reports must not leak."""
+    clear_auth_caches()
+    toolchain_drift.invalidate()
+    yield
+    clear_auth_caches()
+    toolchain_drift.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def query_budget():
+    """Fail the test if any /api request runs more SQL statements than its declared budget."""
+    violations = []
+
+    def check(scope, stats):
+        route = scope.get("route")
+        if route is None or not route.path.startswith("/api") or scope["method"] not in route.methods:
+            return
+        budget = QUERY_BUDGETS.get((scope["method"], route.path))
+        if budget is None:
+            violations.append(f"{scope['method']} {route.path}: no budget in app/tests/query_budgets.py")
+        elif stats.count > budget:
+            statements = "\n    ".join(" ".join(s.split()) for s in stats.statements or [])
+            violations.append(f"{scope['method']} {route.path}: {stats.count} queries > {budget}\n    {statements}")
+
+    add_observer(check)
+    yield
+    remove_observer(check)
+    if violations:
+        pytest.fail("Query budget exceeded:\n" + "\n".join(violations), pytrace=False)
+
+
+@pytest.fixture(name="db_path")
+def db_path_fixture(tmp_path) -> str:
+    """Per-test SQLite file shared by the sync and async engines."""
+    return str(tmp_path / "test.db")
 
 
 @pytest.fixture(name="engine")
-def engine_fixture():
+def engine_fixture(db_path: str):
     """Create a test database engine."""
     engine = create_engine(
-        TEST_DATABASE_URL,
+        f"sqlite:///{db_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
+    # WAL so the test session's open reads never block the app's writes
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
     SQLModel.metadata.create_all(engine)
     yield engine
     engine.dispose()
 
 
+@pytest.fixture(name="async_engine")
+def async_engine_fixture(engine, db_path: str):
+    """Async engine on the same database file (NullPool: TestClient runs its own loop)."""
+    return create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+
+
 @pytest.fixture(name="session")
 def session_fixture(engine) -> Generator[Session, None, None]:
     """Create a test database session."""
@@ -40,12 +91,19 @@ def session_fixture(engine) -> Generator[Session, None, None]:
 
 
 @pytest.fixture(name="client")
-def client_fixture(session: Session) -> Generator[TestClient, None, None]:
+def client_fixture(session: Session, async_engine) -> Generator[TestClient, None, None]:
     """Create a test client with overridden dependencies."""
     def get_session_override():
         return session
 
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            yield async_session
+
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
+    app.dependency_overrides[get_async_read_session] = get_async_session_override
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -115,3 +173,30 @@ def auth_headers_fixture(user_token: str) -> dict:
 def admin_headers_fixture(admin_token: str) -> dict:
     """Get authorization headers for admin user."""
     return {"Authorization": f"Bearer {admin_token}"}
+
+
+@pytest.fixture(name="post_event")
+def post_event_fixture(client: TestClient, admin_headers: dict):
+    """
+    Create an event through ``POST /api/events`` as admin; returns the response JSON.
+
+    ``timestamp`` is a datetime or an ISO string sent as is; ``tools`` maps
+    tool id -> ``version_to``; other fields (``severity``, ``source``,
+    ``tag_ids``...) pass through to the payload.
+    """
+    def post_event(timestamp: Union[datetime, str], event_type: str = "tool_update", *, title: Optional[str] = None,
+                   agent_ids=(), tools: Optional[Dict[int, str]] = None, **fields) -> dict:
+        when = timestamp if isinstance(timestamp, str) else timestamp.isoformat()
+        payload = {
+            "title": title or f"{event_type} at {when}",
+            "timestamp": when,
+            "event_type": event_type,
+            "agent_ids": list(agent_ids),
+            "tool_versions": [{"tool_id": tool_id, "version_to": version} for tool_id, version in (tools or {}).items()],
+            **fields,
+        }
+        resp = client.post("/api/events", headers=admin_headers, json=payload)
+        assert resp.status_code == 201, resp.text
+        return resp.json()
+
+    return post_event
@@ -0,0 +1,138 @@
+-- Schema created by create_all in releases before Alembic (revision 202511200001), SQLite
+CREATE TABLE users (
+	email VARCHAR NOT NULL,
+	full_name VARCHAR NOT NULL,
+	is_active BOOLEAN NOT NULL,
+	is_admin BOOLEAN NOT NULL,
+	is_ldap_user BOOLEAN NOT NULL,
+	id INTEGER NOT NULL,
+	hashed_password VARCHAR NOT NULL,
+	created_at DATETIME NOT NULL,
+	updated_at DATETIME,
+	PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+CREATE TABLE agents (
+	name VARCHAR NOT NULL,
+	vm_hostname VARCHAR,
+	labels JSON,
+	os_type VARCHAR,
+	architecture VARCHAR,
+	status VARCHAR(11) NOT NULL,
+	id INTEGER NOT NULL,
+	created_at DATETIME NOT NULL,
+	updated_at DATETIME NOT NULL,
+	PRIMARY KEY (id)
+);
+CREATE INDEX ix_agents_name ON agents (name);
+CREATE TABLE tools (
+	name VARCHAR NOT NULL,
+	type VARCHAR(14) NOT NULL,
+	category VARCHAR(16) NOT NULL,
+	id INTEGER NOT NULL,
+	created_at DATETIME NOT NULL,
+	updated_at DATETIME NOT NULL,
+	PRIMARY KEY (id)
+);
+CREATE INDEX ix_tools_name ON tools (name);
+CREATE TABLE toolchains (
+	name VARCHAR NOT NULL,
+	description VARCHAR,
+	id INTEGER NOT NULL,
+	created_at DATETIME NOT NULL,
+	updated_at DATETIME NOT NULL,
+	PRIMARY KEY (id)
+);
+CREATE INDEX ix_toolchains_name ON toolchains (name);
+CREATE TABLE events (
+	title VARCHAR NOT NULL,
+	description VARCHAR,
+	timestamp DATETIME NOT NULL,
+	event_type VARCHAR(13) NOT NULL,
+	severity VARCHAR(8) NOT NULL,
+	source VARCHAR(9) NOT NULL,
+	metadata TEXT,
+	id INTEGER NOT NULL,
+	created_at DATETIME NOT NULL,
+	updated_at DATETIME NOT NULL,
+	PRIMARY KEY (id)
+);
+CREATE INDEX ix_events_event_type ON events (event_type);
+CREATE INDEX ix_events_timestamp ON events (timestamp);
+CREATE INDEX ix_events_source ON events (source);
+CREATE INDEX ix_events_severity ON events (severity);
+CREATE TABLE tags (
+	id INTEGER NOT NULL,
+	name VARCHAR NOT NULL,
+	PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX ix_tags_name ON tags (name);
+CREATE TABLE personal_access_tokens (
+	id INTEGER NOT NULL,
+	name VARCHAR NOT NULL,
+	token_hash VARCHAR NOT NULL,
+	user_id INTEGER NOT NULL,
+	scopes VARCHAR NOT NULL,
+	expires_at DATETIME,
+	last_used_at DATETIME,
+	created_at DATETIME NOT NULL,
+	is_active BOOLEAN NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE INDEX ix_personal_access_tokens_name ON personal_access_tokens (name);
+CREATE INDEX ix_personal_access_tokens_user_id ON personal_access_tokens (user_id);
+CREATE UNIQUE INDEX ix_personal_access_tokens_token_hash ON personal_access_tokens (token_hash);
+CREATE TABLE items (
+	title VARCHAR NOT NULL,
+	description VARCHAR,
+	status VARCHAR NOT NULL,
+	id INTEGER NOT NULL,
+	owner_id INTEGER NOT NULL,
+	created_at DATETIME NOT NULL,
+	updated_at DATETIME NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(owner_id) REFERENCES users (id)
+);
+CREATE TABLE event_agents (
+	id INTEGER NOT NULL,
+	event_id INTEGER NOT NULL,
+	agent_id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(event_id) REFERENCES events (id),
+	FOREIGN KEY(agent_id) REFERENCES agents (id)
+);
+CREATE INDEX ix_event_agents_agent_id ON event_agents (agent_id);
+CREATE INDEX ix_event_agents_event_id ON event_agents (event_id);
+CREATE TABLE event_tools (
+	id INTEGER NOT NULL,
+	event_id INTEGER NOT NULL,
+	tool_id INTEGER NOT NULL,
+	version_from VARCHAR,
+	version_to VARCHAR,
+	PRIMARY KEY (id),
+	FOREIGN KEY(event_id) REFERENCES events (id),
+	FOREIGN KEY(tool_id) REFERENCES tools (id)
+);
+CREATE INDEX ix_event_tools_tool_id ON event_tools (tool_id);
+CREATE INDEX ix_event_tools_event_id ON event_tools (event_id);
+CREATE TABLE toolchain_tools (
+	id INTEGER NOT NULL,
+	toolchain_id INTEGER NOT NULL,
+	tool_id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(toolchain_id) REFERENCES toolchains (id),
+	FOREIGN KEY(tool_id) REFERENCES tools (id)
+);
+CREATE INDEX ix_toolchain_tools_tool_id ON toolchain_tools (tool_id);
+CREATE INDEX ix_toolchain_tools_toolchain_id ON toolchain_tools (toolchain_id);
+CREATE TABLE event_tags (
+	id INTEGER NOT NULL,
+	event_id INTEGER NOT NULL,
+	tag_id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(event_id) REFERENCES events (id),
+	FOREIGN KEY(tag_id) REFERENCES tags (id)
+);
+CREATE INDEX ix_event_tags_event_id ON event_tags (event_id);
+CREATE INDEX ix_event_tags_tag_id ON event_tags (tag_id);
@@ -0,0 +1,91 @@
+"""
+Declared SQL statement budgets per API route.
+
+Every route under ``/api`` needs an entry; the autouse ``query_budget``
+fixture in conftest fails any test whose request runs more statements than
+declared. Budgets are constants on purpose: a per-item query loop (N+1) shows
+up as soon as a test sends more than a handful of items. Authentication
+(user/token lookup) is included in the count.
+"""
+QUERY_BUDGETS = {
+    # auth
+    ("POST", "/api/auth/register"): 4,
+    ("POST", "/api/auth/login"): 4,
+    ("POST", "/api/auth/logout"): 2,
+    ("POST", "/api/auth/test-token"): 3,
+    ("GET", "/api/auth/me"): 3,
+    ("GET", "/api/auth/ldap/config"): 2,
+    ("GET", "/api/auth/ldap/health"): 2,
+    ("POST", "/api/auth/ldap/cache/flush"): 2,
+    # users and tokens
+    ("GET", "/api/users/"): 2,
+    ("GET", "/api/users/me"): 3,
+    ("PUT", "/api/users/me"): 3,
+    ("POST", "/api/users/me/password"): 3,
+    ("GET", "/api/users/{user_id}"): 3,
+    ("PUT", "/api/users/{user_id}"): 4,
+    ("DELETE", "/api/users/{user_id}"): 4,
+    ("GET", "/api/users/me/tokens"): 3,
+    ("POST", "/api/users/me/tokens"): 4,
+    ("PATCH", "/api/users/me/tokens/{token_id}/deactivate"): 5,
+    ("DELETE", "/api/users/me/tokens/{token_id}"): 4,
+    # events
+    ("GET", "/api/events"): 8,
+    ("GET", "/api/events/archived"): 2,
+    ("GET", "/api/events/{event_id}"): 8,
+    ("GET", "/api/events/{event_id}/correlated"): 4,
+    ("POST", "/api/events"): 24,  # measured 22: backdated write that patches a checkpoint
+    ("PUT", "/api/events/{event_id}"): 30,  # measured 28: relinks and retypes an event
+    ("DELETE", "/api/events/{event_id}"): 25,  # measured 23: deletes an event behind a checkpoint
+    # inventory
+    ("GET", "/api/agents"): 2,
+    ("GET", "/api/agents/{agent_id}"): 2,
+    ("GET", "/api/agents/{agent_id}/tools"): 3,
+    ("GET", "/api/agents/state"): 6,
+    ("GET", "/api/agents/{agent_id}/state"): 6,
+    ("POST", "/api/agents"): 3,
+    ("PUT", "/api/agents/{agent_id}"): 4,
+    ("DELETE", "/api/agents/{agent_id}"): 6,
+    ("GET", "/api/tools"): 2,
+    ("GET", "/api/tools/{tool_id}"): 2,
+    ("GET", "/api/tools/{tool_id}/versions"): 3,
+    ("POST", "/api/tools"): 3,
+    ("PUT", "/api/tools/{tool_id}"): 4,
+    ("DELETE", "/api/tools/{tool_id}"): 8,
+    ("GET", "/api/tags"): 2,
+    ("POST", "/api/tags"): 4,
+    ("DELETE", "/api/tags/{tag_id}"): 4,
+    ("GET", "/api/toolchains"): 2,
+    ("GET", "/api/toolchains/{toolchain_id}"): 2,
+    ("POST", "/api/toolchains"): 3,
+    ("PUT", "/api/toolchains/{toolchain_id}"): 4,
+    ("PUT", "/api/toolchains/{toolchain_id}/tools"): 6,
+    ("GET", "/api/toolchains/drift"): 3,
+    ("DELETE", "/api/toolchains/{toolchain_id}"): 5,
+    # sample items
+    ("GET", "/api/items"): 2,
+    ("GET", "/api/items/{item_id}"): 2,
+    ("POST", "/api/items"): 3,
+    ("PUT", "/api/items/{item_id}"): 3,
+    ("DELETE", "/api/items/{item_id}"): 4,
+    # ingestion
+    ("POST", "/api/webhooks/jenkins"): 38,  # measured 36: new tools and tags, whatever the payload size
+    # admin
+    ("GET", "/api/metrics"): 1,
+    ("GET", "/api/admin/partitions"): 2,
+    ("DELETE", "/api/admin/partitions/{month}"): 6,
+    ("GET", "/api/admin/retention/policies"): 2,
+    ("POST", "/api/admin/retention/policies"): 4,
+    ("DELETE", "/api/admin/retention/policies/{policy_id}"): 3,
+    ("POST", "/api/admin/retention/run"): 14,  # one archive batch per call
+    ("GET", "/api/admin/retention/archives"): 2,
+    ("GET", "/api/admin/details-paths"): 2,
+    ("POST", "/api/admin/details-paths"): 5,
+    ("DELETE", "/api/admin/details-paths/{hot_path_id}"): 5,
+    # analytics
+    ("GET", "/api/analytics/outages"): 3,
+    ("GET", "/api/analytics/churn/tools"): 3,
+    ("GET", "/api/analytics/churn/agents"): 3,
+    ("GET", "/api/analytics/heatmap"): 2,
+    ("GET", "/api/analytics/change-failure-rate"): 2,
+}
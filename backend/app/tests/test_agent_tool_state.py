@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.crud import agent_tool_state
+from app.models.agent_tool_state import AgentToolState
+
+
+def _versions(client: TestClient, admin_headers, agent_id):
+    resp = client.get(f"/api/agents/{agent_id}/tools", headers=admin_headers)
+    assert resp.status_code == 200
+    return {row["tool_name"]: row["version"] for row in resp.json()}
+
+
+def _snapshot(session: Session):
+    session.expire_all()
+    return sorted(
+        (row.agent_id, row.tool_id, row.version, row.event_id) for row in session.exec(select(AgentToolState)).all()
+    )
+
+
+def test_agent_tool_state_follows_event_writes(client: TestClient, admin_headers, session: Session, post_event):
+    agent_a = client.post("/api/agents", headers=admin_headers, json={"name": "agent-a"}).json()["id"]
+    agent_b = client.post("/api/agents", headers=admin_headers, json={"name": "agent-b"}).json()["id"]
+    python = client.post("/api/tools", headers=admin_headers, json={"name": "python", "type": "binary", "category": "language_runtime"}).json()["id"]
+
+    now = datetime.utcnow()
+    first = post_event(now - timedelta(days=3), agent_ids=[agent_a, agent_b], tools={python: "3.10"})["id"]
+    second = post_event(now - timedelta(days=1), agent_ids=[agent_a], tools={python: "3.11"})["id"]
+    older = post_event(now - timedelta(days=2), agent_ids=[agent_a], tools={python: "3.9"})["id"]  # backdated: does not win
+
+    assert _versions(client, admin_headers, agent_a) == {"python": "3.11"}
+    assert _versions(client, admin_headers, agent_b) == {"python": "3.10"}
+    resp = client.get(f"/api/tools/{python}/versions", headers=admin_headers)
+    assert [(row["version"], row["agents"]) for row in resp.json()] == [("3.10", 1), ("3.11", 1)]
+
+    # Moving the winning event back in time hands the pair to the next newest event
+    resp = client.put(
+        f"/api/events/{second}",
+        headers=admin_headers,
+        json={"timestamp": (datetime.utcnow() - timedelta(days=5)).isoformat()},
+    )
+    assert resp.status_code == 200
+    assert _versions(client, admin_headers, agent_a) == {"python": "3.9"}
+
+    assert client.delete(f"/api/events/{older}", headers=admin_headers).status_code == 204
+    assert _versions(client, admin_headers, agent_a) == {"python": "3.10"}
+
+    resp = client.put(f"/api/events/{first}", headers=admin_headers, json={"agent_ids": [agent_b]})
+    assert resp.status_code == 200
+    assert _versions(client, admin_headers, agent_a) == {"python": "3.11"}
+
+    incremental = _snapshot(session)
+    assert agent_tool_state.rebuild(session) == len(incremental)
+    assert _snapshot(session) == incremental
+
+
+def test_agent_tool_state_not_found(client: TestClient, admin_headers):
+    assert client.get("/api/agents/999/tools", headers=admin_headers).status_code == 404
+    assert client.get("/api/tools/999/versions", headers=admin_headers).status_code == 404
+
+
+def test_agent_tool_state_accepts_utc_timestamps(client: TestClient, admin_headers, post_event):
+    agent = client.post("/api/agents", headers=admin_headers, json={"name": "agent-z"}).json()["id"]
+    python = client.post("/api/tools", headers=admin_headers, json={"name": "python", "type": "binary"}).json()["id"]
+
+    def post(timestamp, version):
+        return post_event(timestamp, agent_ids=[agent], tools={python: version})
+
+    # As sent by browsers (toISOString) and Jenkins
+    post("2025-01-01T00:00:00.000Z", "3.10")
+    newest = post("2025-01-02T00:00:00Z", "3.11")
+    post("2025-01-02T01:00:00+02:00", "3.9")  # 2025-01-01T23:00 UTC: older, does not win
+    assert newest["timestamp"] == "2025-01-02T00:00:00"
+    assert _versions(client, admin_headers, agent) == {"python": "3.11"}
+
+    resp = client.put(
+        f"/api/events/{newest['id']}", headers=admin_headers, json={"timestamp": "2024-12-31T00:00:00.000Z"}
+    )
+    assert resp.status_code == 200, resp.text
+    assert _versions(client, admin_headers, agent) == {"python": "3.9"}
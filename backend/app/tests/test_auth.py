@@ -161,3 +161,94 @@ class TestGetCurrentUser:
             headers={"Authorization": "Bearer invalid_token"}
         )
         assert response.status_code == 401
+
+
+class TestPrincipalCache:
+    """Test caching of JWT claims and user lookups."""
+
+    def test_repeat_requests_skip_user_query(
+        self, client: TestClient, auth_headers: dict, engine, test_user: User
+    ):
+        """Steady-state JWT requests should not query the users table."""
+        from sqlalchemy import event
+
+        assert client.get("/api/users/me", headers=auth_headers).status_code == 200
+
+        statements = []
+
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            response = client.get("/api/users/me", headers=auth_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert response.status_code == 200
+        assert response.json()["email"] == test_user.email
+        assert not any("FROM users" in s for s in statements)
+
+    def test_deactivation_invalidates_cached_principal(
+        self, client: TestClient, auth_headers: dict, admin_headers: dict, test_user: User
+    ):
+        """Updating a user must take effect immediately despite the cache."""
+        assert client.get("/api/users/me", headers=auth_headers).status_code == 200
+
+        response = client.put(
+            f"/api/users/{test_user.id}",
+            headers=admin_headers,
+            json={"is_active": False},
+        )
+        assert response.status_code == 200
+
+        response = client.get("/api/users/me", headers=auth_headers)
+        assert response.status_code == 401
+
+
+class TestPasswordHashing:
+    """Test the offloaded password hashing path."""
+
+    def test_login_rehashes_outdated_parameters(self, client: TestClient, session: Session):
+        """Hashes made with old argon2 parameters are upgraded on login."""
+        from passlib.context import CryptContext
+
+        legacy = CryptContext(schemes=["argon2"], argon2__time_cost=1, argon2__memory_cost=1024)
+        user = User(
+            email="legacy@example.com",
+            full_name="Legacy User",
+            hashed_password=legacy.hash("LegacyPass123"),
+        )
+        session.add(user)
+        session.commit()
+        old_hash = user.hashed_password
+
+        response = client.post(
+            "/api/auth/login",
+            data={"username": "legacy@example.com", "password": "LegacyPass123"},
+        )
+        assert response.status_code == 200
+
+        session.refresh(user)
+        assert user.hashed_password != old_hash
+        assert ",t=3," in user.hashed_password
+
+    def test_login_rejected_when_hash_queue_full(self, client: TestClient, test_user: User, monkeypatch):
+        """Logins beyond the hashing queue limit get 503 instead of queueing."""
+        from app.core import security
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "PASSWORD_HASH_QUEUE_LIMIT", -security._hash_workers())
+        response = client.post(
+            "/api/auth/login",
+            data={"username": test_user.email, "password": "testpassword123"},
+        )
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+    def test_hash_latency_reported_in_metrics(self, client: TestClient, admin_headers: dict):
+        """Login hashing latency shows up on the admin metrics endpoint."""
+        response = client.get("/api/metrics", headers=admin_headers)
+        assert response.status_code == 200
+        timers = response.json()["timers"]
+        assert timers["password_hash.verify_ms"]["count"] >= 1
@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.crud import change_failure
+from app.models.change_failure import ChangeFailureCounter, ChangeOutcome
+
+
+def _rates(client: TestClient, headers, **params):
+    params = {"start": "2025-03-01", "end": "2025-03-31", **params}
+    resp = client.get("/api/analytics/change-failure-rate", headers=headers, params=params)
+    assert resp.status_code == 200, resp.text
+    return [(row["key"], row["changes"], row["failures"]) for row in resp.json()]
+
+
+def _stored(session: Session):
+    session.expire_all()
+    outcomes = sorted(
+        (row.event_id, row.kind, row.entity_id, row.day, row.failed_by)
+        for row in session.exec(select(ChangeOutcome)).all()
+    )
+    counters = sorted(
+        (row.day, row.kind, row.entity_id, row.changes, row.failures)
+        for row in session.exec(select(ChangeFailureCounter)).all()
+        if row.changes or row.failures
+    )
+    return outcomes, counters
+
+
+def test_change_failure_rate_follows_changes_and_outages(
+    client: TestClient, admin_headers, auth_headers, session: Session, post_event
+):
+    agent_a = client.post("/api/agents", headers=admin_headers, json={"name": "agent-a"}).json()["id"]
+    agent_b = client.post("/api/agents", headers=admin_headers, json={"name": "agent-b"}).json()["id"]
+    python = client.post("/api/tools", headers=admin_headers, json={"name": "python", "type": "binary"}).json()["id"]
+    node = client.post("/api/tools", headers=admin_headers, json={"name": "node", "type": "binary"}).json()["id"]
+    toolchain = client.post("/api/toolchains", headers=admin_headers, json={"name": "web"}).json()["id"]
+    resp = client.put(f"/api/toolchains/{toolchain}/tools", headers=admin_headers, json={"tool_ids": [python, node]})
+    assert resp.status_code == 200, resp.text
+
+    update_a = post_event(datetime(2025, 3, 3, 10), "tool_update", agent_ids=[agent_a], tools={python: "1"})["id"]
+    post_event(datetime(2025, 3, 3, 11), "patch", agent_ids=[agent_b], tools={node: "1"})
+    post_event(datetime(2025, 3, 12, 9), "rollout", agent_ids=[agent_a], tools={python: "1", node: "1"})
+    post_event(datetime(2025, 3, 12, 9), "config_change", agent_ids=[agent_a], tools={python: "1"})  # not a change type
+    assert _rates(client, auth_headers, group_by="tool") == [("node", 2, 0), ("python", 2, 0)]
+
+    # Within 24h on agent-a fails the tool update only; agent-b's patch shares no agent
+    outage = post_event(datetime(2025, 3, 4, 8), "outage", agent_ids=[agent_a])["id"]
+    assert _rates(client, auth_headers, group_by="tool") == [("node", 2, 0), ("python", 2, 1)]
+    assert _rates(client, auth_headers) == [("web", 3, 1)]
+    assert _rates(client, auth_headers, group_by="bucket", bucket="week") == [
+        ("2025-03-03", 2, 1), ("2025-03-10", 1, 0)
+    ]
+    # A second outage in the window does not count the change twice
+    post_event(datetime(2025, 3, 4, 9), "outage", agent_ids=[agent_a, agent_b])
+    assert _rates(client, auth_headers, group_by="bucket", bucket="month") == [("2025-03-01", 3, 2)]
+    assert _rates(client, auth_headers, group_by="tool", toolchain_id=toolchain) == [
+        ("node", 2, 1), ("python", 2, 1)
+    ]
+
+    # A change recorded after its outage is failed on arrival
+    post_event(datetime(2025, 3, 4, 7), "patch", agent_ids=[agent_b])
+    assert _rates(client, auth_headers, group_by="bucket", bucket="month") == [("2025-03-01", 4, 3)]
+
+    # Deleting the first outage leaves the tool update failed by the second one
+    before = _stored(session)
+    assert client.delete(f"/api/events/{outage}", headers=admin_headers).status_code == 204
+    assert _rates(client, auth_headers, group_by="bucket", bucket="month") == [("2025-03-01", 4, 3)]
+    # Moving the change out of the window un-fails it
+    resp = client.put(
+        f"/api/events/{update_a}", headers=admin_headers, json={"timestamp": datetime(2025, 3, 1, 8).isoformat()}
+    )
+    assert resp.status_code == 200, resp.text
+    assert _rates(client, auth_headers, group_by="tool", tool_id=python) == [("python", 2, 0)]
+    assert _rates(client, auth_headers, group_by="bucket", bucket="day", tool_id=python) == [
+        ("2025-03-01", 1, 0), ("2025-03-12", 1, 0)
+    ]
+
+    # Incremental state matches a rebuild from history
+    incremental = _stored(session)
+    assert incremental != before
+    change_failure.rebuild(session)
+    assert _stored(session) == incremental
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.crud import churn
+from app.models.churn import ChurnCounter
+
+
+def _board(client: TestClient, headers, kind, **params):
+    params = {"start": "2025-03-01", "end": "2025-03-31", **params}
+    resp = client.get(f"/api/analytics/churn/{kind}", headers=headers, params=params)
+    assert resp.status_code == 200, resp.text
+    return [(row["name"], row["changes"]) for row in resp.json()]
+
+
+def _counters(session: Session):
+    session.expire_all()
+    return sorted(
+        (row.day, row.kind, row.entity_id, row.event_type, row.severity, row.count)
+        for row in session.exec(select(ChurnCounter)).all()
+        if row.count
+    )
+
+
+def test_churn_leaderboards_follow_event_writes(
+    client: TestClient, admin_headers, auth_headers, session: Session, post_event
+):
+    agent_a = client.post("/api/agents", headers=admin_headers, json={"name": "agent-a"}).json()["id"]
+    agent_b = client.post("/api/agents", headers=admin_headers, json={"name": "agent-b"}).json()["id"]
+    python = client.post("/api/tools", headers=admin_headers, json={"name": "python", "type": "binary"}).json()["id"]
+    node = client.post("/api/tools", headers=admin_headers, json={"name": "node", "type": "binary"}).json()["id"]
+
+    post_event(datetime(2025, 3, 1, 12), "tool_update", agent_ids=[agent_a, agent_b], tools={python: "1"})
+    post_event(datetime(2025, 3, 2, 12), "tool_update", agent_ids=[agent_a], tools={python: "1", node: "1"})
+    patch = post_event(
+        datetime(2025, 3, 3, 12), "patch", agent_ids=[agent_b], tools={node: "1"}, severity="warning"
+    )["id"]
+    outage = post_event(datetime(2025, 3, 4, 12), "outage", agent_ids=[agent_b], severity="critical")["id"]
+
+    assert _board(client, auth_headers, "tools") == [("node", 2), ("python", 2)]
+    assert _board(client, auth_headers, "tools", event_type="tool_update") == [("python", 2), ("node", 1)]
+    assert _board(client, auth_headers, "agents") == [("agent-b", 3), ("agent-a", 2)]
+    assert _board(client, auth_headers, "agents", severity="critical") == [("agent-b", 1)]
+    assert _board(client, auth_headers, "agents", end="2025-03-02", limit=1) == [("agent-a", 2)]
+
+    # Updates move counts between days, types and entities; deletes remove them
+    resp = client.put(
+        f"/api/events/{patch}", headers=admin_headers, json={"event_type": "tool_update", "agent_ids": [agent_a]}
+    )
+    assert resp.status_code == 200, resp.text
+    assert client.delete(f"/api/events/{outage}", headers=admin_headers).status_code == 204
+    assert _board(client, auth_headers, "agents") == [("agent-a", 3), ("agent-b", 1)]
+    assert _board(client, auth_headers, "tools", event_type="tool_update") == [("node", 2), ("python", 2)]
+
+    incremental = _counters(session)
+    churn.rebuild(session)
+    assert _counters(session) == incremental
@@ -0,0 +1,288 @@
+"""Tests for database engine configuration."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import exc as sa_exc
+from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import database, write_lane
+from app.core.config import settings
+from app.core.database import InstrumentedQueuePool, build_engine, engine_options, pool_stats
+from app.core.metrics import metrics
+from app.core.token_security import generate_token, hash_token
+from app.core.write_lane import WriteLane
+from app.models.tag import Tag
+from app.models.token import PersonalAccessToken
+
+
+@pytest.fixture
+def pool_settings(monkeypatch):
+    """Reset pool settings to their unset defaults."""
+    for name in ("DATABASE_POOL_SIZE", "DATABASE_MAX_OVERFLOW", "DATABASE_POOL_PRE_PING", "DATABASE_POOL_RECYCLE"):
+        monkeypatch.setattr(settings, name, None)
+    monkeypatch.setattr(settings, "DATABASE_ECHO", False)
+    return monkeypatch
+
+
+class TestEngineOptions:
+    def test_sqlite_defaults(self, pool_settings):
+        options = engine_options("sqlite:///./app.db")
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert options["pool_size"] == 5
+        assert options["pool_pre_ping"] is False
+        assert options["pool_recycle"] == -1
+        assert options["connect_args"] == {"check_same_thread": False}
+        assert options["echo"] is False
+
+    def test_server_defaults(self, pool_settings):
+        options = engine_options("postgresql://u:p@db/ledger")
+        assert options["pool_size"] == 10
+        assert options["max_overflow"] == 20
+        assert options["pool_pre_ping"] is True
+        assert options["pool_recycle"] == 1800
+        assert "connect_args" not in options
+
+    def test_explicit_settings_win(self, pool_settings):
+        pool_settings.setattr(settings, "DATABASE_POOL_SIZE", 3)
+        pool_settings.setattr(settings, "DATABASE_POOL_PRE_PING", True)
+        pool_settings.setattr(settings, "DATABASE_ECHO", True)
+        options = engine_options("sqlite:///./app.db")
+        assert options["pool_size"] == 3
+        assert options["pool_pre_ping"] is True
+        assert options["echo"] is True
+
+    def test_memory_sqlite_keeps_default_pool(self, pool_settings):
+        options = engine_options("sqlite:///:memory:")
+        assert "poolclass" not in options
+        assert "pool_size" not in options
+
+    def test_echo_off_in_development(self, pool_settings):
+        pool_settings.setattr(settings, "ENVIRONMENT", "development")
+        assert engine_options("sqlite:///./app.db")["echo"] is False
+
+
+class TestPoolMetrics:
+    def test_checkout_wait_and_saturation(self, pool_settings, tmp_path):
+        pool_settings.setattr(settings, "DATABASE_POOL_SIZE", 1)
+        pool_settings.setattr(settings, "DATABASE_MAX_OVERFLOW", 0)
+        pool_settings.setattr(settings, "DATABASE_POOL_TIMEOUT", 0.05)
+        engine = build_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+        metrics.reset()
+        try:
+            held = engine.connect()
+            stats = pool_stats(engine.pool)
+            assert stats["checked_out"] == 1
+            assert stats["saturation"] == 1.0
+
+            with pytest.raises(sa_exc.TimeoutError):
+                engine.connect()
+            held.close()
+
+            snapshot = metrics.snapshot()
+            assert snapshot["counters"]["db.pool.timeouts"] == 1
+            assert snapshot["timers"]["db.pool.checkout_wait_ms"]["count"] == 2
+            assert pool_stats(engine.pool)["checked_out"] == 0
+        finally:
+            engine.dispose()
+
+    def test_metrics_endpoint_reports_pool(self, client, admin_headers):
+        response = client.get("/api/metrics", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.json()["db_pool"]["pool"] == type(database.engine.pool).__name__
+
+
+class TestSQLiteProfile:
+    def test_tuned_pragmas_applied(self, pool_settings, tmp_path):
+        pool_settings.setattr(settings, "SQLITE_TUNED", True)
+        pool_settings.setattr(settings, "SQLITE_BUSY_TIMEOUT_MS", 1234)
+        engine = build_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+        try:
+            with engine.connect() as conn:
+                assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+                assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+                assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 1234
+                assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2  # MEMORY
+        finally:
+            engine.dispose()
+
+    def test_profile_is_opt_in(self, pool_settings, tmp_path):
+        pool_settings.setattr(settings, "SQLITE_TUNED", False)
+        engine = build_engine(f"sqlite:///{tmp_path / 'plain.db'}")
+        try:
+            with engine.connect() as conn:
+                assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "delete"
+        finally:
+            engine.dispose()
+
+
+@pytest.fixture
+def lane_engine(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'lane.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+class TestWriteLane:
+    def test_group_commits_concurrent_writes(self, lane_engine):
+        lane = WriteLane(lane_engine, max_batch=32, max_wait=0.05)
+        metrics.reset()
+        try:
+            futures = [lane.submit(lambda s, i=i: _add_tag(s, f"tag-{i}")) for i in range(40)]
+            ids = [f.result(timeout=5) for f in futures]
+        finally:
+            lane.stop()
+
+        assert len(set(ids)) == 40
+        with Session(lane_engine) as session:
+            assert len(session.exec(select(Tag)).all()) == 40
+        # 40 jobs, batches of up to 32: far fewer commits than writes
+        assert metrics.counter("write_lane.jobs") == 40
+        assert metrics.counter("write_lane.commits") < 40
+
+    def test_failing_job_does_not_sink_batch(self, lane_engine):
+        lane = WriteLane(lane_engine, max_batch=8, max_wait=0.05)
+        try:
+            good = lane.submit(lambda s: _add_tag(s, "good"))
+            bad = lane.submit(lambda s: _add_tag(s, "good"))  # unique name clash
+            other = lane.submit(lambda s: _add_tag(s, "other"))
+            assert good.result(timeout=5)
+            assert other.result(timeout=5)
+            with pytest.raises(sa_exc.IntegrityError):
+                bad.result(timeout=5)
+        finally:
+            lane.stop()
+
+        with Session(lane_engine) as session:
+            assert sorted(t.name for t in session.exec(select(Tag)).all()) == ["good", "other"]
+
+    def test_webhook_and_pat_writes_use_lane(self, client, engine, test_user, monkeypatch):
+        lane = WriteLane(engine, max_wait=0)
+        monkeypatch.setattr(write_lane, "get_write_lane", lambda: lane)
+        metrics.reset()
+        try:
+            response = client.post("/api/webhooks/jenkins", json={
+                "job_name": "build", "build_number": 1, "status": "SUCCESS", "agent": "agent-1",
+            })
+            assert response.status_code == 202
+            assert response.json()["agents"][0]["name"] == "agent-1"
+
+            token = generate_token()
+            with Session(engine) as session:
+                session.add(PersonalAccessToken(
+                    user_id=test_user.id, name="lane", token_hash=hash_token(token), scopes="read",
+                ))
+                session.commit()
+            assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+        finally:
+            lane.stop()
+
+        assert metrics.counter("write_lane.jobs") == 2
+        with Session(engine) as session:
+            pat = session.exec(select(PersonalAccessToken).where(PersonalAccessToken.name == "lane")).one()
+            assert pat.last_used_at is not None
+
+
+def _add_tag(session: Session, name: str) -> int:
+    tag = Tag(name=name)
+    session.add(tag)
+    session.commit()
+    return tag.id
+
+
+class TestAsyncEngine:
+    def test_async_url_uses_async_driver(self, monkeypatch):
+        monkeypatch.setattr(settings, "DATABASE_ASYNC_URL", None)
+        assert database.async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+        assert database.async_database_url("postgresql://u:p@db/ledger") == "postgresql+asyncpg://u:p@db/ledger"
+        assert database.async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+        with pytest.raises(ValueError):
+            database.async_database_url("oracle://u:p@db/ledger")
+
+    def test_explicit_async_url(self, monkeypatch):
+        monkeypatch.setattr(settings, "DATABASE_ASYNC_URL", "postgresql+psycopg://u:p@db/ledger")
+        assert database.async_database_url() == "postgresql+psycopg://u:p@db/ledger"
+
+    @pytest.mark.asyncio
+    async def test_async_crud_round_trip(self, async_engine):
+        from app.crud import agent as crud_agent, event as crud_event, tag as crud_tag, user as crud_user
+        from app.models.agent import AgentCreate
+        from app.models.enums import EventType
+        from app.models.event import EventCreate, EventUpdate
+        from app.models.user import UserCreate
+
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            agent = await crud_agent.create_agent_async(session, AgentCreate(name="agent-a"))
+            tag = await crud_tag.create_tag_async(session, "deploy")
+            event = await crud_event.create_event_async(session, EventCreate(
+                title="Upgrade", timestamp=datetime(2025, 1, 1), event_type=EventType.ROLLOUT,
+                agent_ids=[agent.id], tag_ids=[tag.id],
+            ))
+            user = await crud_user.create_user_async(
+                session,
+                UserCreate(email="async@example.com", full_name="Async", password="Passw0rd!"),
+                hashed_password="hashed",
+            )
+
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            assert (await crud_agent.get_agent_by_name_async(session, "agent-a")).id == agent.id
+            assert [e.id for e in await crud_event.list_events_async(session, agent_id=agent.id)] == [event.id]
+            assert (await crud_user.get_user_by_email_async(session, "async@example.com")).id == user.id
+
+            db_event = await crud_event.get_event_async(session, event.id)
+            updated = await crud_event.update_event_async(session, db_event, EventUpdate(title="Upgraded"))
+            assert updated.title == "Upgraded"
+
+            await crud_event.delete_event_async(session, updated)
+            assert await crud_event.get_event_async(session, event.id) is None
+
+
+@pytest.fixture
+def replica(client, engine, tmp_path, monkeypatch):
+    """Route get_read_session to a separate 'replica' database holding one agent."""
+    from app.main import app
+    from app.models.agent import Agent
+
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica_engine = build_engine(replica_url)
+    SQLModel.metadata.create_all(replica_engine)
+    with Session(replica_engine) as replica_session:
+        replica_session.add(Agent(name="replica-agent"))
+        replica_session.commit()
+    replica_engine.dispose()
+
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", replica_url)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "_read_engine", None)
+    # The replica's pool collector must not outlive the engine
+    monkeypatch.setattr(metrics, "_collectors", dict(metrics._collectors))
+    app.dependency_overrides.pop(database.get_read_session, None)
+    yield
+    if database._read_engine is not None:
+        database._read_engine.dispose()
+
+
+class TestReadReplica:
+    def test_reads_go_to_replica(self, client, replica, admin_headers):
+        client.cookies.clear()  # logging in is a write too
+        response = client.get("/api/agents", headers=admin_headers)
+        assert [a["name"] for a in response.json()] == ["replica-agent"]
+
+    def test_header_forces_primary(self, client, replica, admin_headers):
+        response = client.get("/api/agents", headers={**admin_headers, "X-Read-Primary": "true"})
+        assert response.json() == []
+
+    def test_read_your_writes_after_write(self, client, replica, admin_headers):
+        created = client.post("/api/agents", json={"name": "fresh"}, headers=admin_headers)
+        assert created.status_code == 201
+        assert "read_primary_until=" in created.headers["set-cookie"]
+
+        # The client now carries the cookie, so the next read sees its own write
+        response = client.get("/api/agents", headers=admin_headers)
+        assert [a["name"] for a in response.json()] == ["fresh"]
+
+    def test_no_cookie_without_replica(self, client, admin_headers):
+        created = client.post("/api/agents", json={"name": "fresh"}, headers=admin_headers)
+        assert created.status_code == 201
+        assert "set-cookie" not in created.headers
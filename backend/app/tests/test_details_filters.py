@@ -0,0 +1,102 @@
+import json
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core import details_paths
+
+EVENTS = [
+    ("long outage", "outage", {"duration_minutes": 45, "suspected": True}),
+    ("short outage", "outage", {"duration_minutes": 5, "suspected": False}),
+    ("odd duration", "outage", {"duration_minutes": "unknown"}),
+    ("jenkins failure", "rollout", {"jenkins": {"job_name": "build-api", "status": "FAILURE"}}),
+    ("no details", "patch", None),
+]
+
+
+def _seed(client: TestClient, admin_headers):
+    for title, event_type, details in EVENTS:
+        resp = client.post(
+            "/api/events",
+            headers=admin_headers,
+            json={
+                "title": title,
+                "timestamp": datetime(2025, 3, 1, 12).isoformat(),
+                "event_type": event_type,
+                "details": json.dumps(details) if details is not None else None,
+            },
+        )
+        assert resp.status_code == 201, resp.text
+
+
+def _titles(client: TestClient, headers, params):
+    resp = client.get("/api/events", headers=headers, params=params)
+    assert resp.status_code == 200, resp.text
+    return sorted(event["title"] for event in resp.json())
+
+
+def test_details_path_filters(client: TestClient, admin_headers, auth_headers):
+    _seed(client, admin_headers)
+
+    assert _titles(client, auth_headers, {"details.duration_minutes": "45"}) == ["long outage"]
+    assert _titles(client, auth_headers, {"details.duration_minutes__gte": "10"}) == ["long outage"]
+    assert _titles(client, auth_headers, {"details.duration_minutes__lt": "45.5"}) == ["long outage", "short outage"]
+    assert _titles(client, auth_headers, {"details.duration_minutes": "unknown"}) == ["odd duration"]
+    assert _titles(client, auth_headers, {"details.suspected": "true"}) == ["long outage"]
+    assert _titles(client, auth_headers, {"details.jenkins.status": "FAILURE"}) == ["jenkins failure"]
+    assert _titles(
+        client, auth_headers, [("details.duration_minutes__gt", "1"), ("details.duration_minutes__lte", "5")]
+    ) == ["short outage"]
+    assert _titles(client, auth_headers, {"details.jenkins.status": "FAILURE", "event_type": "outage"}) == []
+
+    for params in ({"details.a b": "1"}, {"details.duration_minutes__like": "4"}, {"details.": "x"}):
+        assert client.get("/api/events", headers=auth_headers, params=params).status_code == 400
+
+
+def test_hot_paths_get_expression_indexes(client: TestClient, admin_headers, auth_headers, session: Session):
+    _seed(client, admin_headers)
+    resp = client.post("/api/admin/details-paths", headers=admin_headers, json={"path": "jenkins.status"})
+    assert resp.status_code == 201, resp.text
+    hot_path = resp.json()
+    assert hot_path["index_name"] == details_paths.index_name("jenkins.status")
+    assert client.post("/api/admin/details-paths", headers=admin_headers, json={"path": "jenkins.status"}).status_code == 409
+    assert client.post("/api/admin/details-paths", headers=admin_headers, json={"path": "a;drop"}).status_code == 400
+    assert client.post("/api/admin/details-paths", headers=auth_headers, json={"path": "x"}).status_code == 403
+
+    plan = session.exec(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM events WHERE json_extract(events.metadata, '$.jenkins.status') = 'FAILURE'"
+    )).all()
+    assert any(hot_path["index_name"] in row[-1] for row in plan)
+    assert _titles(client, auth_headers, {"details.jenkins.status": "FAILURE"}) == ["jenkins failure"]
+    assert [p["path"] for p in client.get("/api/admin/details-paths", headers=admin_headers).json()] == ["jenkins.status"]
+
+    assert client.delete(f"/api/admin/details-paths/{hot_path['id']}", headers=admin_headers).status_code == 204
+    indexes = session.exec(text("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix_events_details_%'")).all()
+    assert indexes == []
+    assert client.delete(f"/api/admin/details-paths/{hot_path['id']}", headers=admin_headers).status_code == 404
+
+
+def _plan(session: Session, path: str):
+    return " ".join(row[-1] for row in session.exec(text(
+        f"EXPLAIN QUERY PLAN SELECT id FROM events WHERE json_extract(events.metadata, '$.{path}') = 5"
+    )).all())
+
+
+def test_hot_paths_with_similar_names_get_their_own_index(
+    client: TestClient, admin_headers, session: Session, monkeypatch
+):
+    underscored = client.post("/api/admin/details-paths", headers=admin_headers, json={"path": "a__b"}).json()
+    dotted = client.post("/api/admin/details-paths", headers=admin_headers, json={"path": "a.b"}).json()
+    assert underscored["index_name"] != dotted["index_name"]
+    assert dotted["index_name"] in _plan(session, "a.b")
+    assert underscored["index_name"] in _plan(session, "a__b")
+
+    assert client.delete(f"/api/admin/details-paths/{underscored['id']}", headers=admin_headers).status_code == 204
+    assert dotted["index_name"] in _plan(session, "a.b")
+
+    # A path whose index name is taken is refused rather than silently left unindexed
+    monkeypatch.setattr(details_paths, "index_name", lambda path: "ix_events_details_same")
+    resp = client.post("/api/admin/details-paths", headers=admin_headers, json={"path": "c"})
+    assert resp.status_code == 409 and "'a.b'" in resp.json()["detail"]
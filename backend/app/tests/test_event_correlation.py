@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+NOW = datetime(2025, 3, 1, 12, 0)
+
+
+def _before(hours: int) -> datetime:
+    return NOW - timedelta(hours=hours)
+
+
+def test_correlated_changes_ranked_by_overlap_then_distance(client: TestClient, admin_headers, auth_headers, post_event):
+    agent_a = client.post("/api/agents", headers=admin_headers, json={"name": "agent-a"}).json()["id"]
+    agent_b = client.post("/api/agents", headers=admin_headers, json={"name": "agent-b"}).json()["id"]
+    agent_c = client.post("/api/agents", headers=admin_headers, json={"name": "agent-c"}).json()["id"]
+    java = client.post("/api/tools", headers=admin_headers, json={"name": "java", "type": "binary"}).json()["id"]
+
+    outage = post_event(NOW, "outage", agent_ids=[agent_a, agent_b], tools={java: "1"})["id"]
+    both = post_event(_before(5), title="both agents", agent_ids=[agent_a, agent_b])["id"]
+    near = post_event(_before(1), "config_change", title="one agent, close", agent_ids=[agent_a])["id"]
+    far = post_event(_before(4), "patch", title="one agent, far", agent_ids=[agent_b])["id"]
+    tool_only = post_event(_before(2), title="java on another agent", agent_ids=[agent_c], tools={java: "1"})["id"]
+    post_event(_before(1), title="unrelated", agent_ids=[agent_c])
+    post_event(_before(7), title="too early", agent_ids=[agent_a])
+    post_event(_before(-1), title="after the outage", agent_ids=[agent_a])
+    post_event(_before(3), "outage", title="earlier outage", agent_ids=[agent_a])
+
+    resp = client.get(f"/api/events/{outage}/correlated", headers=auth_headers)
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert [row["id"] for row in body] == [both, near, tool_only, far]
+    assert (body[0]["shared_agents"], body[0]["shared_tools"], body[0]["seconds_before"]) == (2, 0, 5 * 3600)
+    assert (body[2]["shared_agents"], body[2]["shared_tools"]) == (0, 1)
+
+    resp = client.get(f"/api/events/{outage}/correlated", headers=auth_headers, params={"window": "3h", "limit": 1})
+    assert [row["id"] for row in resp.json()] == [near]
+
+
+def test_correlated_validation(client: TestClient, auth_headers, post_event):
+    outage = post_event(NOW, "outage")["id"]
+    assert client.get(f"/api/events/{outage}/correlated", headers=auth_headers).json() == []
+    for window in ("6 hours", "0x", "8d"):
+        resp = client.get(f"/api/events/{outage}/correlated", headers=auth_headers, params={"window": window})
+        assert resp.status_code == 400
+    assert client.get("/api/events/999/correlated", headers=auth_headers).status_code == 404
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+
+def test_heatmap_returns_weighted_parallel_arrays(client: TestClient, admin_headers, auth_headers, post_event):
+    agent_a = client.post("/api/agents", headers=admin_headers, json={"name": "agent-a"}).json()["id"]
+    agent_b = client.post("/api/agents", headers=admin_headers, json={"name": "agent-b"}).json()["id"]
+    client.post("/api/agents", headers=admin_headers, json={"name": "idle"})
+
+    post_event(datetime(2025, 3, 1, 9), agent_ids=[agent_a, agent_b])
+    post_event(datetime(2025, 3, 1, 23, 59), agent_ids=[agent_a], severity="warning")
+    post_event(datetime(2025, 3, 3, 0, 0), "outage", agent_ids=[agent_b], severity="critical")
+    # Outside the window (month boundary on both sides)
+    post_event(datetime(2025, 2, 28, 23, 59), agent_ids=[agent_a])
+    post_event(datetime(2025, 3, 4, 0, 0), agent_ids=[agent_a])
+
+    params = {"start": "2025-03-01", "end": "2025-03-03"}
+    resp = client.get("/api/analytics/heatmap", headers=auth_headers, params=params)
+    assert resp.status_code == 200, resp.text
+    heatmap = resp.json()
+    assert heatmap["agents"] == ["agent-a", "agent-b"]
+    assert heatmap["agent_ids"] == [agent_a, agent_b]
+    assert heatmap["days"] == ["2025-03-01", "2025-03-02", "2025-03-03"]
+    # info=1, warning=3, critical=10 by default
+    assert heatmap["counts"] == [4, 0, 0, 1, 0, 10]
+
+    resp = client.get(
+        "/api/analytics/heatmap", headers=auth_headers, params={**params, "agent_id": agent_b, "event_type": "outage"}
+    )
+    assert resp.json()["agents"] == ["agent-b"]
+    assert resp.json()["counts"] == [0, 0, 10]
+
+
+def test_heatmap_rejects_bad_windows(client: TestClient, auth_headers):
+    resp = client.get("/api/analytics/heatmap", headers=auth_headers, params={"start": "2025-03-02", "end": "2025-03-01"})
+    assert resp.status_code == 400
+    resp = client.get("/api/analytics/heatmap", headers=auth_headers, params={"start": "2024-01-01", "end": "2025-03-01"})
+    assert resp.status_code == 400
+
+    resp = client.get("/api/analytics/heatmap", headers=auth_headers)
+    assert resp.status_code == 200
+    assert len(resp.json()["days"]) == 90
+    assert resp.json()["counts"] == []
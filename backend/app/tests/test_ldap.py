@@ -2,11 +2,66 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from fastapi.testclient import TestClient
+from ldap3 import MOCK_SYNC
 
 from app.main import app
 from app.core.ldap_service import LDAPService, LDAPConfig
 
 
+SEARCH_BASE = "DC=test,DC=com"
+SERVICE_DN = "CN=svc,DC=test,DC=com"
+JANE_DN = "CN=Jane,OU=Users,DC=test,DC=com"
+
+
+def _mock_service(servers):
+    """LDAPService wired to in-memory ldap3 MOCK_SYNC directories (one per server)."""
+    service = LDAPService(client_strategy=MOCK_SYNC)
+    config = service.config
+    config.enabled = True
+    config.server = servers[0]
+    config.server_list = list(servers)
+    config.bind_dn = SERVICE_DN
+    config.bind_password = "svcpass"
+    config.search_base = SEARCH_BASE
+    config.admin_groups = ["Admins"]
+    config.allowed_groups = []
+
+    for server in service._get_server_pool().ordered():
+        seed = service._create_connection(server=server)
+        seed.strategy.add_entry(SEARCH_BASE, {"objectClass": "domain", "dc": "test"})
+        seed.strategy.add_entry(SERVICE_DN, {"objectClass": "person", "userPassword": "svcpass"})
+        seed.strategy.add_entry(JANE_DN, {
+            "objectClass": "person",
+            "userPassword": "Secret123",
+            "sAMAccountName": "jane",
+            "mail": "jane@test.com",
+            "displayName": "Jane Doe",
+            "memberOf": ["CN=Admins,OU=Groups,DC=test,DC=com"],
+        })
+        seed.strategy.add_entry("CN=Admins,OU=Groups,DC=test,DC=com", {
+            "objectClass": "group",
+            "cn": "Admins",
+            "member": [JANE_DN],
+        })
+    return service
+
+
+@pytest.fixture(name="mock_directory")
+def mock_directory_fixture():
+    """Single-server mock directory."""
+    service = _mock_service(["mock-dc"])
+    yield service
+    service.reset_pool()
+
+
+@pytest.fixture(name="mock_directories")
+def mock_directories_fixture():
+    """Two-server mock directory for failover tests."""
+    service = _mock_service(["dc1", "dc2"])
+    yield service
+    service.reset_pool()
+
+
 class TestLDAPConfig:
     """Test LDAP configuration."""
     
@@ -57,6 +112,16 @@ class TestLDAPConfig:
             assert is_valid is True
             assert error is None
     
+    def test_server_list_overrides_single_server(self):
+        """LDAP_SERVERS lists every server in failover order."""
+        config = LDAPConfig()
+        config.server = "ldap://dc0"
+        config.server_list = config._parse_list("ldap://dc1, ldaps://dc2:636")
+        assert config.servers == ["ldap://dc1", "ldaps://dc2:636"]
+        
+        config.server_list = []
+        assert config.servers == ["ldap://dc0"]
+    
     def test_parse_list_empty(self):
         """Test parsing empty string to list."""
         config = LDAPConfig()
@@ -204,12 +269,168 @@ class TestLDAPService:
                         assert error is None
 
 
+class TestLDAPConnectionPool:
+    """Test pooled service-account connections against a mock directory."""
+    
+    def test_service_connection_reused_across_logins(self, mock_directory):
+        """Repeated logins reuse one bound service connection."""
+        for _ in range(3):
+            success, user_info, error = mock_directory.authenticate("jane", "Secret123")
+            assert success is True
+            assert user_info["is_admin"] is True
+        
+        assert mock_directory.get_user_groups(JANE_DN) == ["Admins"]
+        stats = mock_directory._get_pool().stats()
+        assert stats["created"] == 1
+        assert stats["idle"] == 1
+    
+    def test_user_bind_stays_live(self, mock_directory):
+        """A wrong password fails even though the lookup is pooled."""
+        assert mock_directory.authenticate("jane", "Secret123")[0] is True
+        success, user_info, error = mock_directory.authenticate("jane", "wrong")
+        assert success is False
+        assert error == "Invalid credentials"
+    
+    def test_expired_connection_recycled(self, mock_directory):
+        """Connections older than the max age are replaced on checkout."""
+        mock_directory.health_check()
+        pool = mock_directory._get_pool()
+        pool.max_age = 0
+        
+        result = mock_directory.health_check()
+        assert result["healthy"] is True
+        assert result["pool"]["recycled"] == 1
+        assert result["pool"]["created"] == 2
+
+
+class TestLDAPLookupCache:
+    """Test caching of directory lookups."""
+    
+    def test_user_lookup_cached_but_bind_live(self, mock_directory):
+        """Second login skips the user search but still binds."""
+        assert mock_directory.authenticate("jane", "Secret123")[0] is True
+        
+        with patch.object(mock_directory, '_search_user', wraps=mock_directory._search_user) as search:
+            assert mock_directory.authenticate("jane", "Secret123")[0] is True
+            assert mock_directory.authenticate("jane", "wrong")[0] is False
+            search.assert_not_called()
+        
+        stats = mock_directory.cache_stats()["users"]
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+    
+    def test_unknown_user_negatively_cached(self, mock_directory):
+        """Unknown users are cached as misses to spare the directory."""
+        with patch.object(mock_directory, '_search_user', wraps=mock_directory._search_user) as search:
+            assert mock_directory._find_user("ghost") == (None, None)
+            assert mock_directory._find_user("ghost") == (None, None)
+            assert search.call_count == 1
+    
+    def test_group_lookup_cached_until_flush(self, mock_directory):
+        """Group lookups are served from cache until flushed."""
+        assert mock_directory.get_user_groups(JANE_DN) == ["Admins"]
+        assert mock_directory.get_user_groups(JANE_DN) == ["Admins"]
+        assert mock_directory.cache_stats()["groups"]["hits"] == 1
+        
+        assert mock_directory.flush_cache() == 1
+        assert mock_directory.get_user_groups(JANE_DN) == ["Admins"]
+        assert mock_directory.cache_stats()["groups"]["misses"] == 1
+    
+    def test_flush_endpoint_requires_admin(self, client, auth_headers, admin_headers):
+        """Only admins may flush the LDAP cache."""
+        response = client.post("/api/auth/ldap/cache/flush", headers=auth_headers)
+        assert response.status_code == 403
+        
+        response = client.post("/api/auth/ldap/cache/flush", headers=admin_headers)
+        assert response.status_code == 200
+        assert "users" in response.json()["previous"]
+
+
+class TestLDAPServerFailover:
+    """Test multi-server selection and failover."""
+    
+    @staticmethod
+    def _take_down(service, host):
+        """Make every bind against ``host`` fail like an unreachable server."""
+        from ldap3.core.exceptions import LDAPSocketOpenError
+        
+        create = service._create_connection
+        attempts = []
+        
+        def _create(user_dn=None, password=None, server=None):
+            conn = create(user_dn, password, server=server)
+            if conn.server.host == host:
+                attempts.append(conn)
+                conn.bind = Mock(side_effect=LDAPSocketOpenError("connection refused"))
+            return conn
+        
+        service._create_connection = _create
+        return attempts
+    
+    def test_fails_over_when_primary_down(self, mock_directories):
+        """Logins succeed via the secondary and skip the dead primary."""
+        attempts = self._take_down(mock_directories, "dc1")
+        
+        success, user_info, error = mock_directories.authenticate("jane", "Secret123")
+        assert success is True
+        assert len(attempts) == 1
+        
+        mock_directories.flush_cache()
+        assert mock_directories.authenticate("jane", "Secret123")[0] is True
+        assert len(attempts) == 1  # dc1 is cooling down, not retried
+        
+        health = {s["server"]: s for s in mock_directories.health_check()["servers"]}
+        assert health["ldap://dc1:389"]["healthy"] is False
+        assert health["ldap://dc2:389"]["healthy"] is True
+    
+    def test_failed_server_retried_after_cooldown(self, mock_directories):
+        """A server comes back into rotation once its cooldown expires."""
+        servers = mock_directories._get_server_pool()
+        dc1, dc2 = servers.ordered()
+        servers.cooldown = 0
+        servers.record_failure(dc1)
+        assert servers.is_available(dc1)
+    
+    def test_routes_to_fastest_server(self, mock_directories):
+        """New connections go to the server with the lowest recent latency."""
+        servers = mock_directories._get_server_pool()
+        dc1, dc2 = servers.ordered()
+        servers.record_success(dc1, 250.0)
+        servers.record_success(dc2, 5.0)
+        assert servers.ordered() == [dc2, dc1]
+        
+        assert mock_directories.authenticate("jane", "Secret123")[0] is True
+        conn, _, _ = mock_directories._get_pool()._idle[0]
+        assert conn.server is dc2
+    
+    def test_health_reports_preferred_server_with_server_list_only(self, mock_directories):
+        """With only LDAP_SERVERS set, health names the server currently preferred."""
+        mock_directories.config.server = None
+        servers = mock_directories._get_server_pool()
+        dc1, dc2 = servers.ordered()
+        servers.record_success(dc1, 250.0)
+        servers.record_success(dc2, 5.0)
+        
+        health = mock_directories.health_check()
+        assert health["healthy"] is True
+        assert health["server"] == "ldap://dc2:389"
+    
+    def test_all_servers_down_reports_unreachable(self, mock_directories):
+        """When every server is down the login fails fast with a clear error."""
+        self._take_down(mock_directories, "dc1")
+        self._take_down(mock_directories, "dc2")
+        
+        health = mock_directories.health_check()
+        assert health["healthy"] is False
+        assert "Cannot connect" in health["message"]
+
+
 class TestLDAPEndpoints:
     """Test LDAP API endpoints."""
     
     def test_ldap_health_check_disabled(self):
         """Test health check endpoint when LDAP is disabled."""
-        with patch('app.api.auth.ldap_service.health_check') as mock_health:
+        with patch('app.core.ldap_service.ldap_service.health_check') as mock_health:
             mock_health.return_value = {
                 'status': 'disabled',
                 'message': 'LDAP authentication is disabled',
@@ -223,7 +444,7 @@ class TestLDAPEndpoints:
     
     def test_ldap_health_check_unhealthy(self):
         """Test health check endpoint when LDAP is unhealthy."""
-        with patch('app.api.auth.ldap_service.health_check') as mock_health:
+        with patch('app.core.ldap_service.ldap_service.health_check') as mock_health:
             mock_health.return_value = {
                 'status': 'error',
                 'message': 'Connection failed',
@@ -252,7 +473,7 @@ class TestLDAPEndpoints:
         """Test that login falls back to local auth when LDAP fails."""
         mock_settings.LDAP_ENABLED = True
         
-        with patch('app.api.auth.ldap_service.authenticate') as mock_ldap_auth:
+        with patch('app.core.ldap_service.ldap_service.authenticate') as mock_ldap_auth:
             mock_ldap_auth.return_value = (False, None, "User not found")
             
             client = TestClient(app)
@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlmodel import SQLModel
+
+from app.core.leader import DatabaseLease, FileLease, start_leader_jobs, stop_leader_jobs
+from app.models.lease import Lease
+
+
+@pytest.fixture(name="lease_engine")
+def lease_engine_fixture(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'leases.db'}")
+    SQLModel.metadata.create_all(engine, tables=[Lease.__table__])
+    yield engine
+    engine.dispose()
+
+
+def test_database_lease_single_holder_and_takeover(lease_engine):
+    first = DatabaseLease(lease_engine, lease_seconds=30, holder="a")
+    second = DatabaseLease(lease_engine, lease_seconds=30, holder="b")
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    assert first.try_acquire()  # renew
+
+    # Leader stalls past its lease: a follower takes over and the old leader steps down
+    with lease_engine.begin() as connection:
+        connection.execute(update(Lease).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+    assert second.try_acquire()
+    assert not first.try_acquire()
+
+    # Clean shutdown hands over immediately
+    second.release()
+    assert first.try_acquire()
+
+
+def test_file_lease_is_exclusive(tmp_path):
+    path = str(tmp_path / "leader.lock")
+    first, second = FileLease(path), FileLease(path)
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    first.release()
+    assert second.try_acquire()
+    second.release()
+
+
+class _FlakyElector:
+    retry_seconds = 0.01
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.released = False
+
+    def try_acquire(self):
+        return self.answers.pop(0) if self.answers else True
+
+    def release(self):
+        self.released = True
+
+
+@pytest.mark.asyncio
+async def test_supervisor_starts_jobs_only_while_leader():
+    events = []
+
+    def start_jobs():
+        events.append("start")
+        return "jobs"
+
+    async def stop_jobs(jobs):
+        events.append(f"stop {jobs}")
+
+    elector = _FlakyElector([False, True, True, False, True])
+    stop_event = asyncio.Event()
+    task = start_leader_jobs(stop_event, start_jobs, stop_jobs, elector=elector)
+    while len(elector.answers):
+        await asyncio.sleep(0.01)
+    await stop_leader_jobs(task, stop_event)
+
+    assert events == ["start", "stop jobs", "start", "stop jobs"]
+    assert elector.released
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.outage import Outage
+
+DAY = datetime(2025, 3, 3, 8, 0)  # a Monday
+
+
+def _build(client: TestClient, job, number, status, minutes, agent="agent-1"):
+    resp = client.post(
+        "/api/webhooks/jenkins",
+        json={
+            "job_name": job,
+            "build_number": number,
+            "status": status,
+            "agent": agent,
+            "timestamp": (DAY + timedelta(minutes=minutes)).isoformat(),
+        },
+    )
+    assert resp.status_code == 202, resp.text
+
+
+def _stats(client: TestClient, headers, **params):
+    resp = client.get("/api/analytics/outages", headers=headers, params=params)
+    assert resp.status_code == 200, resp.text
+    return {row["key"]: row for row in resp.json()}
+
+
+def test_failures_pair_with_next_success_per_job(client: TestClient, auth_headers, session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_HMAC_SECRET", None)
+    _build(client, "api", 1, "FAILURE", 0)
+    _build(client, "web", 1, "FAILURE", 5, agent="agent-2")
+    _build(client, "api", 2, "FAILURE", 10)  # still the same outage
+    _build(client, "api", 3, "SUCCESS", 30)
+    _build(client, "api", 4, "SUCCESS", 40)  # nothing open: ignored
+    _build(client, "api", 5, "FAILURE", 24 * 60)
+    _build(client, "api", 6, "ABORTED", 24 * 60 + 5)  # neither failure nor recovery
+    _build(client, "api", 7, "SUCCESS", 24 * 60 + 90)
+    _build(client, "web", 2, "UNSTABLE", 60, agent="agent-2")  # web stays open
+
+    outages = session.exec(select(Outage).order_by(Outage.started_at)).all()
+    assert [(o.job_name, o.failures, o.duration_seconds) for o in outages] == [
+        ("api", 2, 30 * 60.0),
+        ("web", 1, None),
+        ("api", 1, 90 * 60.0),
+    ]
+
+    by_job = _stats(client, auth_headers)
+    assert by_job["api"] == {
+        "key": "api", "outages": 2, "failures": 3, "resolved": 2,
+        "mttr_seconds": 60 * 60.0, "p50_seconds": 30 * 60.0, "p90_seconds": 90 * 60.0,
+    }
+    assert (by_job["web"]["outages"], by_job["web"]["resolved"], by_job["web"]["mttr_seconds"]) == (1, 0, None)
+
+    assert set(_stats(client, auth_headers, group_by="agent")) == {"agent-1", "agent-2"}
+    by_day = _stats(client, auth_headers, group_by="bucket", job="api")
+    assert {key: row["failures"] for key, row in by_day.items()} == {
+        "2025-03-03T00:00:00": 2,
+        "2025-03-04T00:00:00": 1,
+    }
+    by_week = _stats(client, auth_headers, group_by="bucket", bucket="week")
+    assert list(by_week) == ["2025-03-03T00:00:00"] and by_week["2025-03-03T00:00:00"]["outages"] == 3
+
+    later = _stats(client, auth_headers, start=(DAY + timedelta(hours=12)).isoformat())
+    assert list(later) == ["api"] and later["api"]["outages"] == 1
+
+    assert client.get("/api/analytics/outages", headers=auth_headers, params={"group_by": "tool"}).status_code == 422
+
+
+def test_failure_delivered_late_moves_outage_start(client: TestClient, auth_headers, session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_HMAC_SECRET", None)
+    _build(client, "api", 2, "FAILURE", 10, agent="agent-2")
+    _build(client, "api", 1, "FAILURE", 0)  # delivered after build 2
+    _build(client, "api", 3, "SUCCESS", 30)
+
+    [outage] = session.exec(select(Outage)).all()
+    first_failure = client.get("/api/events", headers=auth_headers, params={"job": "api", "build": 1}).json()
+    assert (outage.started_at, outage.failures, outage.duration_seconds) == (DAY, 2, 30 * 60.0)
+    assert outage.failure_event_id == first_failure[0]["id"]
+    assert set(_stats(client, auth_headers, group_by="agent")) == {"agent-1"}
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.partitions import add_months, month_bounds, month_key
+from app.models.agent import EventAgent
+from app.models.event import Event
+
+
+def _create_agent(client: TestClient, admin_headers, name="agent-1"):
+    resp = client.post("/api/agents", headers=admin_headers, json={"name": name})
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def test_month_helpers():
+    assert month_key(datetime(2025, 3, 31, 23, 59)) == 202503
+    assert add_months(202512, 1) == 202601
+    assert add_months(202501, -1) == 202412
+    assert add_months(202511, 14) == 202701
+    assert month_bounds(202512) == (202512, 202601)
+
+
+def test_events_and_links_carry_partition_month(client: TestClient, admin_headers, session: Session, post_event):
+    agent = _create_agent(client, admin_headers)
+    event = post_event(datetime(2025, 1, 15), "outage", agent_ids=[agent["id"]])
+
+    db_event = session.get(Event, event["id"])
+    link = session.exec(select(EventAgent).where(EventAgent.event_id == event["id"])).one()
+    assert db_event.partition_month == 202501
+    assert link.partition_month == 202501
+
+    # Moving the event to another month moves its links too
+    resp = client.put(
+        f"/api/events/{event['id']}", headers=admin_headers, json={"timestamp": datetime(2025, 2, 1).isoformat()}
+    )
+    assert resp.status_code == 200, resp.text
+    session.expire_all()
+    assert session.get(Event, event["id"]).partition_month == 202502
+    link = session.exec(select(EventAgent).where(EventAgent.event_id == event["id"])).one()
+    assert link.partition_month == 202502
+
+
+def test_list_events_prunes_by_month(client: TestClient, admin_headers, post_event):
+    agent = _create_agent(client, admin_headers)
+    post_event(datetime(2025, 1, 31, 23, 0), "outage", title="event 2025-01-31", agent_ids=[agent["id"]])
+    post_event(datetime(2025, 2, 1, 1, 0), "outage", title="event 2025-02-01", agent_ids=[agent["id"]])
+    post_event(datetime(2025, 3, 10), "outage", title="event 2025-03-10", agent_ids=[agent["id"]])
+
+    resp = client.get(
+        "/api/events",
+        headers=admin_headers,
+        params={"start": "2025-01-31T00:00:00", "end": "2025-02-28T00:00:00", "agent_id": agent["id"]},
+    )
+    assert resp.status_code == 200
+    titles = [e["title"] for e in resp.json()]
+    assert titles == ["event 2025-02-01", "event 2025-01-31"]
+
+
+def test_drop_partition(client: TestClient, admin_headers, session: Session, post_event):
+    agent = _create_agent(client, admin_headers)
+    old = post_event(datetime(2024, 11, 5), "outage", agent_ids=[agent["id"]])
+    post_event(datetime(2024, 11, 20), "outage")
+    kept = post_event(datetime(2024, 12, 1), "outage", agent_ids=[agent["id"]])
+
+    resp = client.get("/api/admin/partitions", headers=admin_headers)
+    assert resp.status_code == 200
+    assert [(p["month"], p["events"]) for p in resp.json()] == [(202411, 2), (202412, 1)]
+
+    resp = client.delete("/api/admin/partitions/202411", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json() == {"month": 202411, "events_removed": 2}
+
+    session.expire_all()
+    assert session.get(Event, old["id"]) is None
+    assert session.get(Event, kept["id"]) is not None
+    links = session.exec(select(EventAgent)).all()
+    assert [link.event_id for link in links] == [kept["id"]]
+
+
+def test_drop_partition_validation(client: TestClient, admin_headers, auth_headers):
+    resp = client.delete("/api/admin/partitions/202413", headers=admin_headers)
+    assert resp.status_code == 400
+
+    resp = client.delete("/api/admin/partitions/202411", headers=auth_headers)
+    assert resp.status_code == 403
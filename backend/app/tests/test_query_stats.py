@@ -0,0 +1,121 @@
+import logging
+from datetime import datetime, timedelta
+
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlmodel import Session, text
+
+from app.core.config import settings
+from app.core.query_stats import redact_parameters, track_queries
+from app.main import app
+from app.tests.query_budgets import QUERY_BUDGETS
+
+
+def test_every_api_route_has_a_query_budget():
+    routes = {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.path.startswith("/api")
+        for method in route.methods
+    }
+    assert routes - QUERY_BUDGETS.keys() == set()
+    assert QUERY_BUDGETS.keys() - routes == set(), "stale budgets"
+
+
+def test_server_timing_header(client: TestClient, admin_headers):
+    resp = client.get("/api/events", headers=admin_headers)
+    assert resp.status_code == 200
+    db, total = resp.headers["server-timing"].split(", ")
+    assert db.startswith("db;dur=") and 'desc="' in db and db.endswith(' queries"')
+    assert total.startswith("app;dur=")
+
+
+def test_track_queries_counts_statements(session: Session):
+    with track_queries(record_statements=True) as stats:
+        session.exec(text("SELECT 1"))
+        session.exec(text("SELECT 2"))
+    assert stats.count == 2
+    assert stats.statements == ["SELECT 1", "SELECT 2"]
+
+
+def test_slow_query_log_redacts_parameters(session: Session, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-9)
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        session.exec(text("SELECT :secret"), params={"secret": "hunter2"})
+    assert "Slow query" in caplog.text
+    assert "params=(<str>)" in caplog.text
+    assert "hunter2" not in caplog.text
+
+    assert redact_parameters({"password": "x"}) == "{password: <str>}"
+    assert redact_parameters([("a",), ("b",)]) == "[2 parameter sets]"
+
+
+def test_list_and_write_paths_stay_within_budget_as_data_grows(client: TestClient, admin_headers):
+    """Budgets are per-route constants, so per-item query loops fail here."""
+    agent_ids = [client.post("/api/agents", headers=admin_headers, json={"name": f"agent-{i}"}).json()["id"] for i in range(10)]
+    tool_ids = [
+        client.post("/api/tools", headers=admin_headers, json={"name": f"tool-{i}", "type": "binary", "category": "other"}).json()["id"]
+        for i in range(10)
+    ]
+    tag_ids = [client.post("/api/tags", headers=admin_headers, json={"name": f"tag-{i}"}).json()["id"] for i in range(10)]
+
+    for i in range(15):
+        resp = client.post(
+            "/api/events",
+            headers=admin_headers,
+            json={
+                "title": f"event {i}",
+                "timestamp": (datetime.utcnow() - timedelta(hours=i)).isoformat(),
+                "event_type": "tool_update",
+                "agent_ids": agent_ids,
+                "tool_versions": [{"tool_id": tool_id, "version_to": "1.0"} for tool_id in tool_ids],
+                "tag_ids": tag_ids,
+            },
+        )
+        assert resp.status_code == 201, resp.text
+
+    resp = client.get("/api/events", headers=admin_headers)
+    assert len(resp.json()) == 15
+    assert len(resp.json()[0]["agents"]) == 10
+
+    toolchain = client.post("/api/toolchains", headers=admin_headers, json={"name": "ci"}).json()
+    resp = client.put(f"/api/toolchains/{toolchain['id']}/tools", headers=admin_headers, json={"tool_ids": tool_ids})
+    assert resp.status_code == 200
+
+    # Validation reports the first missing id
+    resp = client.put(
+        f"/api/toolchains/{toolchain['id']}/tools", headers=admin_headers, json={"tool_ids": [tool_ids[0], 9999]}
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Tool 9999 not found"
+    resp = client.post(
+        "/api/events",
+        headers=admin_headers,
+        json={"title": "bad", "timestamp": datetime.utcnow().isoformat(), "event_type": "patch", "tag_ids": [tag_ids[0], 424242]},
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Tag 424242 not found"
+
+
+def test_inventory_routes_within_budget(client: TestClient, admin_headers, test_user):
+    tool = client.post("/api/tools", headers=admin_headers, json={"name": "git", "type": "binary", "category": "other"}).json()
+    assert client.get("/api/tools", headers=admin_headers).status_code == 200
+    assert client.get(f"/api/tools/{tool['id']}", headers=admin_headers).status_code == 200
+    assert client.put(f"/api/tools/{tool['id']}", headers=admin_headers, json={"description": "scm"}).status_code == 200
+    assert client.delete(f"/api/tools/{tool['id']}", headers=admin_headers).status_code == 204
+
+    tag = client.post("/api/tags", headers=admin_headers, json={"name": "rollout"}).json()
+    assert client.get("/api/tags", headers=admin_headers).status_code == 200
+    assert client.delete(f"/api/tags/{tag['id']}", headers=admin_headers).status_code == 204
+
+    toolchain = client.post("/api/toolchains", headers=admin_headers, json={"name": "ci"}).json()
+    assert client.get(f"/api/toolchains/{toolchain['id']}", headers=admin_headers).status_code == 200
+    assert client.put(f"/api/toolchains/{toolchain['id']}", headers=admin_headers, json={"name": "ci-2"}).status_code == 200
+    assert client.delete(f"/api/toolchains/{toolchain['id']}", headers=admin_headers).status_code == 204
+
+    item = client.post("/api/items", headers=admin_headers, json={"title": "thing"}).json()
+    assert client.get(f"/api/items/{item['id']}", headers=admin_headers).status_code == 200
+    assert client.delete(f"/api/items/{item['id']}", headers=admin_headers).status_code == 204
+
+    assert client.get(f"/api/users/{test_user.id}", headers=admin_headers).status_code == 200
+    assert client.post("/api/auth/test-token", headers=admin_headers).status_code == 200
@@ -0,0 +1,120 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.crud.retention import resolve_policies
+from app.models.enums import EventSeverity, EventSource, EventType
+from app.models.retention import RetentionPolicy
+
+
+@pytest.fixture(name="archive_dir")
+def archive_dir_fixture(tmp_path, monkeypatch):
+    directory = tmp_path / "archive"
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(directory))
+    monkeypatch.setattr(settings, "RETENTION_BATCH_SIZE", 1)
+    return directory
+
+
+def _ago(days: int) -> datetime:
+    return datetime.utcnow() - timedelta(days=days)
+
+
+def test_resolve_policies_most_specific_wins():
+    policies = [
+        RetentionPolicy(id=1, severity=EventSeverity.INFO, keep_days=30),
+        RetentionPolicy(id=2, severity=EventSeverity.INFO, source=EventSource.WEBHOOK, keep_days=90),
+        RetentionPolicy(id=3, event_type=EventType.OUTAGE, severity=EventSeverity.CRITICAL, keep_days=None),
+    ]
+    resolved = resolve_policies(policies, default_days=365)
+
+    assert resolved[(EventType.ROLLOUT, EventSeverity.INFO, EventSource.WEBHOOK)] == 90
+    assert resolved[(EventType.ROLLOUT, EventSeverity.INFO, EventSource.MANUAL)] == 30
+    assert resolved[(EventType.OUTAGE, EventSeverity.CRITICAL, EventSource.WEBHOOK)] is None
+    assert resolved[(EventType.PATCH, EventSeverity.WARNING, EventSource.MANUAL)] == 365
+
+
+def test_retention_archives_expired_events(client: TestClient, admin_headers, archive_dir, post_event):
+    resp = client.post("/api/agents", headers=admin_headers, json={"name": "agent-1"})
+    agent = resp.json()
+
+    for policy in (
+        {"severity": "info", "source": "webhook", "keep_days": 90},
+        {"event_type": "outage", "severity": "critical", "keep_days": None},
+    ):
+        resp = client.post("/api/admin/retention/policies", headers=admin_headers, json=policy)
+        assert resp.status_code == 201, resp.text
+
+    expired_a = post_event(_ago(120), "rollout", title="old webhook", source="webhook", agent_ids=[agent["id"]])
+    expired_b = post_event(_ago(200), "rollout", title="older webhook", source="webhook")
+    post_event(_ago(10), "rollout", title="recent webhook", source="webhook")
+    post_event(_ago(900), "outage", title="ancient outage", severity="critical")
+    post_event(_ago(400), "rollout", title="old manual")  # no policy, no default: kept
+
+    # One batch (RETENTION_BATCH_SIZE=1 here) per call
+    resp = client.post("/api/admin/retention/run", headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json() == {"events": 1, "files": 1, "more": True}
+    resp = client.post("/api/admin/retention/run", headers=admin_headers)
+    assert resp.json() == {"events": 1, "files": 1, "more": False}
+
+    remaining = [e["title"] for e in client.get("/api/events", headers=admin_headers).json()]
+    assert sorted(remaining) == ["ancient outage", "old manual", "recent webhook"]
+
+    archives = client.get("/api/admin/retention/archives", headers=admin_headers).json()
+    assert [a["event_count"] for a in archives] == [1, 1]
+    with gzip.open(archive_dir / archives[-1]["path"], "rt") as fh:
+        assert [json.loads(line)["id"] for line in fh] == [expired_b["id"]]
+
+    # Archived events stay queryable through the slow path
+    resp = client.get("/api/events/archived", headers=admin_headers)
+    assert resp.status_code == 200
+    assert [e["title"] for e in resp.json()] == ["old webhook", "older webhook"]
+
+    resp = client.get("/api/events/archived", headers=admin_headers, params={"agent_id": agent["id"]})
+    archived = resp.json()
+    assert [e["id"] for e in archived] == [expired_a["id"]]
+    assert archived[0]["agents"] == [{"id": agent["id"], "name": "agent-1"}]
+
+    # Running again finds nothing new
+    resp = client.post("/api/admin/retention/run", headers=admin_headers)
+    assert resp.json() == {"events": 0, "files": 0, "more": False}
+
+
+def test_retention_default_days(client: TestClient, admin_headers, archive_dir, monkeypatch, post_event):
+    monkeypatch.setattr(settings, "RETENTION_DEFAULT_DAYS", 30)
+    post_event(_ago(45), "rollout", title="old manual")
+    post_event(_ago(5), "rollout", title="fresh manual")
+
+    resp = client.post("/api/admin/retention/run", headers=admin_headers)
+    assert resp.json() == {"events": 1, "files": 1, "more": False}
+
+
+def test_retention_policy_management(client: TestClient, admin_headers, auth_headers):
+    policy = {"event_type": "patch", "keep_days": 30}
+    resp = client.post("/api/admin/retention/policies", headers=admin_headers, json=policy)
+    assert resp.status_code == 201
+    policy_id = resp.json()["id"]
+
+    resp = client.post("/api/admin/retention/policies", headers=admin_headers, json=policy)
+    assert resp.status_code == 409
+
+    resp = client.get("/api/admin/retention/policies", headers=auth_headers)
+    assert resp.status_code == 403
+
+    resp = client.delete(f"/api/admin/retention/policies/{policy_id}", headers=admin_headers)
+    assert resp.status_code == 204
+    assert client.get("/api/admin/retention/policies", headers=admin_headers).json() == []
+
+
+def test_scheduled_retention_archives_every_batch(archive_dir, session, monkeypatch, post_event):
+    from app.jobs.retention import archive_expired
+
+    monkeypatch.setattr(settings, "RETENTION_DEFAULT_DAYS", 30)
+    for age in (40, 50, 60):
+        post_event(_ago(age), "rollout", title=f"old {age}")
+
+    assert archive_expired(session) == {"events": 3, "files": 3, "more": False}
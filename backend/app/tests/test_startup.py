@@ -0,0 +1,81 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.migrations import SchemaOutOfDate, current_revision, head_revision, prepare_database
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def test_import_does_not_load_optional_auth_dependencies():
+    code = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('ldap3', 'jose', 'passlib', 'argon2', 'alembic') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_prepare_database_creates_then_checks_head(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'boot.db'}")
+    assert prepare_database(engine) == "created"
+    with engine.connect() as connection:
+        assert current_revision(connection) == head_revision()
+    assert prepare_database(engine) == "current"
+
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE alembic_version SET version_num = '202511200001'"))
+    with pytest.raises(SchemaOutOfDate, match="alembic upgrade head"):
+        prepare_database(engine)
+
+
+def test_prepare_database_upgrades_legacy_schema(tmp_path):
+    from sqlmodel import Session
+
+    from app.crud.event import list_events
+
+    # Tables as releases before Alembic created them, unstamped, with history
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    raw = engine.raw_connection()
+    raw.executescript((Path(__file__).parent / "legacy_schema.sql").read_text())
+    raw.close()
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO agents (id, name, status, created_at, updated_at) "
+            "VALUES (1, 'agent-1', 'ACTIVE', '2024-01-01', '2024-01-01')"
+        ))
+        connection.execute(text(
+            "INSERT INTO events (id, title, timestamp, event_type, severity, source, metadata, created_at, updated_at) "
+            "VALUES (1, 'deploy #7', '2024-03-05 10:00:00', 'ROLLOUT', 'INFO', 'WEBHOOK', "
+            "'{\"jenkins\": {\"job_name\": \"deploy\", \"build_number\": 7, \"status\": \"success\"}}', "
+            "'2024-03-05', '2024-03-05')"
+        ))
+        connection.execute(text("INSERT INTO event_agents (event_id, agent_id) VALUES (1, 1)"))
+
+    assert prepare_database(engine) == "legacy"
+    with engine.connect() as connection:
+        assert current_revision(connection) == head_revision()
+    assert prepare_database(engine) == "current"
+
+    with Session(engine) as session:
+        [event] = list_events(session, agent_id=1, job="deploy", build=7)
+    assert event.title == "deploy #7"
+    assert event.partition_month == 202403
+
+
+def test_prepare_database_incomplete_legacy_and_auto_create_off(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY)"))
+    with pytest.raises(SchemaOutOfDate, match="alembic stamp 202511200001"):
+        prepare_database(engine)
+    with engine.connect() as connection:
+        assert current_revision(connection) is None
+
+    monkeypatch.setattr(settings, "DATABASE_AUTO_CREATE", False)
+    with pytest.raises(SchemaOutOfDate, match="empty"):
+        prepare_database(create_engine(f"sqlite:///{tmp_path / 'empty.db'}"))
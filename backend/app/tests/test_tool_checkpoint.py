@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.crud import tool_checkpoint
+from app.models.tool_checkpoint import ToolStateCheckpoint
+
+
+def _ago(days: float) -> str:
+    return (datetime.utcnow() - timedelta(days=days)).isoformat()
+
+
+def _state(client: TestClient, admin_headers, agent_id, days_ago: float):
+    resp = client.get(f"/api/agents/{agent_id}/state", headers=admin_headers, params={"at": _ago(days_ago)})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    return body["checkpoint_at"], {tool["tool_name"]: tool["version"] for tool in body["tools"]}
+
+
+def test_point_in_time_state_from_checkpoint_and_replay(client: TestClient, admin_headers, session: Session, post_event):
+    agent_a = client.post("/api/agents", headers=admin_headers, json={"name": "agent-a"}).json()["id"]
+    agent_b = client.post("/api/agents", headers=admin_headers, json={"name": "agent-b"}).json()["id"]
+    python = client.post("/api/tools", headers=admin_headers, json={"name": "python", "type": "binary"}).json()["id"]
+    node = client.post("/api/tools", headers=admin_headers, json={"name": "node", "type": "binary"}).json()["id"]
+
+    post_event(_ago(10), agent_ids=[agent_a, agent_b], tools={python: "3.9"})
+    post_event(_ago(6), agent_ids=[agent_a], tools={python: "3.10"})
+    post_event(_ago(2), agent_ids=[agent_b], tools={node: "18"})
+
+    # No checkpoint yet: full replay
+    assert _state(client, admin_headers, agent_a, 8) == (None, {"python": "3.9"})
+    assert _state(client, admin_headers, agent_a, 12) == (None, {})
+
+    assert tool_checkpoint.create_checkpoint(session, datetime.utcnow() - timedelta(days=4)) == 2
+    checkpoint_at, versions = _state(client, admin_headers, agent_a, 3)
+    assert checkpoint_at is not None and versions == {"python": "3.10"}
+
+    # Later moments start from the snapshot: prove it by marking the snapshot row
+    session.exec(
+        update(ToolStateCheckpoint).where(ToolStateCheckpoint.agent_id == agent_b).values(version="from-checkpoint")
+    )
+    session.commit()
+    assert _state(client, admin_headers, agent_b, 1)[1] == {"node": "18", "python": "from-checkpoint"}
+    # ...while earlier moments still replay from the start
+    assert _state(client, admin_headers, agent_b, 5) == (None, {"python": "3.9"})
+
+    # A backdated change patches the pairs it touches in snapshots taken after it
+    post_event(_ago(5), agent_ids=[agent_b], tools={python: "3.8"})
+    assert _state(client, admin_headers, agent_b, 1) == (checkpoint_at, {"node": "18", "python": "3.8"})
+
+    resp = client.get("/api/agents/state", headers=admin_headers, params={"at": _ago(4)})
+    assert [(s["agent_name"], [t["version"] for t in s["tools"]]) for s in resp.json()] == [
+        ("agent-a", ["3.10"]),
+        ("agent-b", ["3.8"]),
+    ]
+    resp = client.get("/api/agents/state", headers=admin_headers, params={"agent_id": agent_b})
+    assert [s["agent_id"] for s in resp.json()] == [agent_b]
+
+    assert client.get("/api/agents/999/state", headers=admin_headers).status_code == 404
+
+
+def test_backdated_events_keep_checkpoints(client: TestClient, admin_headers, session: Session, post_event):
+    agent = client.post("/api/agents", headers=admin_headers, json={"name": "agent-a"}).json()["id"]
+    python = client.post("/api/tools", headers=admin_headers, json={"name": "python", "type": "binary"}).json()["id"]
+    node = client.post("/api/tools", headers=admin_headers, json={"name": "node", "type": "binary"}).json()["id"]
+    git = client.post("/api/tools", headers=admin_headers, json={"name": "git", "type": "binary"}).json()["id"]
+    post_event(_ago(10), agent_ids=[agent], tools={python: "3.9"})
+    post_event(_ago(10), agent_ids=[agent], tools={git: "2.40"})
+    for days_ago in (6, 4, 2):
+        tool_checkpoint.create_checkpoint(session, datetime.utcnow() - timedelta(days=days_ago))
+    # Untouched pairs keep their snapshot rows: mark them
+    session.exec(update(ToolStateCheckpoint).where(ToolStateCheckpoint.tool_id == git).values(version="from-checkpoint"))
+    session.commit()
+
+    def versions():
+        return [_state(client, admin_headers, agent, days_ago) for days_ago in (5.5, 3, 1)]
+
+    checkpoints = [at for at, _ in versions()]
+    assert None not in checkpoints and len(set(checkpoints)) == 3
+
+    # Backdated before the last two snapshots, with a pair they had not seen
+    event_id = post_event(_ago(5), agent_ids=[agent], tools={python: "3.10"})["id"]
+    post_event(_ago(5), agent_ids=[agent], tools={node: "18"})
+    assert versions() == [
+        (checkpoints[0], {"git": "from-checkpoint", "python": "3.9"}),
+        (checkpoints[1], {"git": "from-checkpoint", "node": "18", "python": "3.10"}),
+        (checkpoints[2], {"git": "from-checkpoint", "node": "18", "python": "3.10"}),
+    ]
+
+    # Moved before every snapshot, then deleted
+    resp = client.put(f"/api/events/{event_id}", headers=admin_headers, json={"timestamp": _ago(7)})
+    assert resp.status_code == 200, resp.text
+    assert [state["python"] for _, state in versions()] == ["3.10", "3.10", "3.10"]
+    assert client.delete(f"/api/events/{event_id}", headers=admin_headers).status_code == 204
+    assert [state["python"] for _, state in versions()] == ["3.9", "3.9", "3.9"]
+    assert [at for at, _ in versions()] == checkpoints
+    assert session.exec(select(func.count()).select_from(ToolStateCheckpoint)).one() == 8
+
+
+def test_checkpoints_are_pruned(client: TestClient, admin_headers, session: Session, monkeypatch, post_event):
+    monkeypatch.setattr(settings, "TOOL_STATE_CHECKPOINT_KEEP", 2)
+    agent = client.post("/api/agents", headers=admin_headers, json={"name": "agent-a"}).json()["id"]
+    tool = client.post("/api/tools", headers=admin_headers, json={"name": "git", "type": "binary"}).json()["id"]
+    post_event(_ago(10), agent_ids=[agent], tools={tool: "2.40"})
+
+    for days_ago in (3, 2, 1):
+        tool_checkpoint.create_checkpoint(session, datetime.utcnow() - timedelta(days=days_ago))
+
+    taken = session.exec(select(func.count(func.distinct(ToolStateCheckpoint.taken_at)))).one()
+    assert taken == 2
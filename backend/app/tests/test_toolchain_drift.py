@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+YESTERDAY = datetime.utcnow() - timedelta(days=1)
+
+
+def _drift(client: TestClient, admin_headers, **params):
+    resp = client.get("/api/toolchains/drift", headers=admin_headers, params=params)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def _summary(report):
+    return {
+        agent["agent_name"]: (
+            [tool["tool_name"] for tool in agent["missing"]],
+            [(tool["tool_name"], tool["version"], tool["expected_version"]) for tool in agent["divergent"]],
+        )
+        for agent in report["agents"]
+    }
+
+
+def test_toolchain_drift_report(client: TestClient, admin_headers, post_event):
+    agents = {
+        name: client.post("/api/agents", headers=admin_headers, json={"name": name}).json()["id"]
+        for name in ("agent-a", "agent-b", "agent-c", "agent-d")
+    }
+    python = client.post("/api/tools", headers=admin_headers, json={"name": "python", "type": "binary"}).json()["id"]
+    node = client.post("/api/tools", headers=admin_headers, json={"name": "node", "type": "binary"}).json()["id"]
+    toolchain = client.post("/api/toolchains", headers=admin_headers, json={"name": "web"}).json()
+    resp = client.put(f"/api/toolchains/{toolchain['id']}/tools", headers=admin_headers, json={"tool_ids": [python, node]})
+    assert resp.status_code == 200, resp.text
+    other = client.post("/api/toolchains", headers=admin_headers, json={"name": "empty"}).json()
+
+    post_event(YESTERDAY, agent_ids=[agents["agent-a"], agents["agent-b"], agents["agent-c"]], tools={python: "3.11"})
+    post_event(YESTERDAY, agent_ids=[agents["agent-d"]], tools={python: "3.9"})
+    post_event(YESTERDAY, agent_ids=[agents["agent-a"], agents["agent-b"], agents["agent-d"]], tools={node: "20"})
+
+    report = _drift(client, admin_headers)
+    assert [entry["toolchain_name"] for entry in report] == ["empty", "web"]
+    web = report[1]
+    assert web["toolchain_id"] == toolchain["id"]
+    assert web["agents_checked"] == 4
+    assert _summary(web) == {
+        "agent-c": (["node"], []),
+        "agent-d": ([], [("python", "3.9", "3.11")]),
+    }
+    assert report[0] == {"toolchain_id": other["id"], "toolchain_name": "empty", "agents_checked": 0, "agents": []}
+
+    assert [entry["toolchain_name"] for entry in _drift(client, admin_headers, toolchain_id=toolchain["id"])] == ["web"]
+
+    # A write that changes tool state refreshes the cached report
+    post_event(YESTERDAY, agent_ids=[agents["agent-c"]], tools={node: "20"})
+    assert _summary(_drift(client, admin_headers, toolchain_id=toolchain["id"])[0]) == {
+        "agent-d": ([], [("python", "3.9", "3.11")]),
+    }
+
+    # ...and so does a toolchain change
+    resp = client.put(f"/api/toolchains/{toolchain['id']}/tools", headers=admin_headers, json={"tool_ids": [node]})
+    assert resp.status_code == 200, resp.text
+    assert _drift(client, admin_headers, toolchain_id=toolchain["id"])[0]["agents"] == []
+
+
+def test_toolchain_drift_requires_admin(client: TestClient, auth_headers):
+    assert client.get("/api/toolchains/drift", headers=auth_headers).status_code == 403
@@ -46,6 +46,36 @@ class TestUserProfile:
         )
         assert response.status_code == 200
 
+    def test_change_password_hashes_on_executor(
+        self, client: TestClient, auth_headers: dict, admin_headers: dict, monkeypatch
+    ):
+        """The new password is hashed on the bounded executor, not on the event loop."""
+        from app.crud import user as crud_user
+
+        def hashed_on_loop(password):
+            raise AssertionError("password hashed on the event loop")
+
+        def hashes():
+            timers = client.get("/api/metrics", headers=admin_headers).json()["timers"]
+            return timers.get("password_hash.hash_ms", {}).get("count", 0)
+
+        monkeypatch.setattr(crud_user, "get_password_hash", hashed_on_loop)
+        before = hashes()
+        response = client.post(
+            "/api/users/me/password",
+            headers=auth_headers,
+            params={
+                "current_password": "testpassword123",
+                "new_password": "NewSecurePass456"
+            }
+        )
+        assert response.status_code == 200
+        assert hashes() == before + 1
+
+        response = client.put("/api/users/me", headers=auth_headers, json={"password": "OtherSecurePass789"})
+        assert response.status_code == 200
+        assert hashes() == before + 2
+
     def test_change_password_wrong_current(self, client: TestClient, auth_headers: dict):
         """Test changing password with wrong current password fails."""
         response = client.post(
@@ -4,8 +4,10 @@ import json
 from datetime import datetime
 
 from fastapi import status
+from sqlmodel import select
 
 from app.core.config import settings
+from app.models.job import Build, Job
 
 
 def _signature(secret: str, body: bytes) -> str:
@@ -59,3 +61,82 @@ def test_ingests_jenkins_webhook_and_creates_event(client, admin_headers, sessio
     events = list_resp.json()
     assert len(events) == 1
     assert events[0]["source"] == "webhook"
+
+
+def test_webhooks_populate_jobs_and_builds(client, admin_headers, session, monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_HMAC_SECRET", None)
+
+    def report(job, number, result, minute):
+        response = client.post(
+            "/api/webhooks/jenkins",
+            json={
+                "job_name": job,
+                "build_number": number,
+                "status": result,
+                "full_url": f"https://ci.example/{job}/{number}",
+                "timestamp": datetime(2025, 3, 1, 12, minute).isoformat(),
+            },
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        return response.json()
+
+    started = report("build-api", 41, "STARTED", 0)
+    finished = report("build-api", 41, "FAILURE", 5)
+    assert started["build_id"] == finished["build_id"]
+    report("build-api", 42, "SUCCESS", 10)
+    report("build-web", 41, "SUCCESS", 15)
+
+    builds = session.exec(select(Build).join(Job).order_by(Job.name, Build.number)).all()
+    assert [(b.number, b.status) for b in builds] == [(41, "FAILURE"), (42, "SUCCESS"), (41, "SUCCESS")]
+
+    def titles(**params):
+        response = client.get("/api/events", headers=admin_headers, params=params)
+        assert response.status_code == 200, response.text
+        return [event["title"] for event in response.json()]
+
+    assert titles(job="build-api") == [
+        "Jenkins build-api #42 success",
+        "Jenkins build-api #41 failure",
+        "Jenkins build-api #41 started",
+    ]
+    assert titles(job="build-api", build=41) == ["Jenkins build-api #41 failure", "Jenkins build-api #41 started"]
+    assert titles(job="missing") == []
+    assert client.get("/api/events", headers=admin_headers, params={"build": 41}).status_code == 400
+
+
+def test_build_reports_with_utc_timestamps_collapse(client, session, monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_HMAC_SECRET", None)
+    for result, timestamp in (("STARTED", "2025-01-01T00:00:00Z"), ("SUCCESS", "2025-01-01T00:10:00Z")):
+        response = client.post(
+            "/api/webhooks/jenkins",
+            json={"job_name": "deploy", "build_number": 7, "status": result, "timestamp": timestamp},
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED, response.text
+
+    build = session.exec(select(Build).join(Job).where(Job.name == "deploy")).one()
+    assert (build.number, build.status, build.timestamp) == (7, "SUCCESS", datetime(2025, 1, 1, 0, 10))
+
+
+def test_webhook_statements_do_not_grow_with_payload(client, session, monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_HMAC_SECRET", None)
+
+    def report(number, count):
+        response = client.post(
+            "/api/webhooks/jenkins",
+            json={
+                "job_name": "matrix",
+                "build_number": number,
+                "status": "SUCCESS",
+                "agent": "agent-1",
+                "tools": [{"name": f"tool-{i}", "version": "1.0"} for i in range(count)],
+                "tags": [f"tag-{i}" for i in range(count)],
+            },
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED, response.text
+        return response.json()
+
+    # Budgeted in query_budgets.py: a per-item loop would exceed it here
+    report(1, 2)
+    event = report(2, 12)  # two existing tools/tags, ten new ones
+    assert sorted(tool["name"] for tool in event["tools"]) == sorted(f"tool-{i}" for i in range(12))
+    assert len(event["tags"]) == 12
@@ -0,0 +1,242 @@
+"""
+Authentication benchmark.
+
+Drives the real ``get_current_user`` / ``get_current_user_async``
+dependencies and the ``/api/auth/login`` endpoint through both the
+synchronous ``TestClient`` and an async httpx client, for six paths:
+
+- ``jwt``: ``GET /api/auth/me`` (``get_current_user_async``) with a JWT bearer token
+- ``pat``: ``GET /api/auth/me`` (``get_current_user_async``) with a personal access token
+- ``jwt-sync``: ``GET /api/users/me`` (sync ``get_current_user``) with a JWT bearer token
+- ``pat-sync``: ``GET /api/users/me`` (sync ``get_current_user``) with a personal access token
+- ``password``: ``POST /api/auth/login`` against the local user table
+- ``ldap``: ``POST /api/auth/login`` against an in-memory ldap3 MOCK_SYNC
+  directory seeded with thousands of users and groups
+
+Each run reports throughput and p50/p95/p99 latency so changes to the
+auth caches, hashing executor or LDAP pool can be compared before/after.
+
+Usage (from backend/)::
+
+    python -m benchmarks.bench_auth
+    python -m benchmarks.bench_auth --paths jwt pat jwt-sync pat-sync --requests 2000 --concurrency 32
+    python -m benchmarks.bench_auth --paths ldap --ldap-users 10000 --json
+"""
+import argparse
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import httpx
+from fastapi.testclient import TestClient
+from ldap3 import MOCK_SYNC
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.core.ldap_service as ldap_module
+from app.core.auth_cache import clear_auth_caches
+from app.core.config import settings
+from app.core.database import build_async_engine, build_engine, get_async_session, get_session
+from app.core.ldap_service import LDAPService
+from app.core.security import get_password_hash
+from app.main import app
+from app.models.user import User
+
+from benchmarks.harness import report, run_async, run_sync
+
+PATHS = ("jwt", "pat", "jwt-sync", "pat-sync", "password", "ldap")
+# Token paths -> the route whose auth dependency they exercise
+TOKEN_ROUTES = {
+    "jwt": "/api/auth/me",  # get_current_user_async
+    "pat": "/api/auth/me",
+    "jwt-sync": "/api/users/me",  # get_current_user
+    "pat-sync": "/api/users/me",
+}
+LOCAL_EMAIL = "bench@example.com"
+LOCAL_PASSWORD = "BenchPass123!"
+SEARCH_BASE = "DC=bench,DC=local"
+SERVICE_DN = "CN=svc,DC=bench,DC=local"
+LDAP_PASSWORD = "LdapPass123!"
+
+
+def build_directory(users: int, groups: int, groups_per_user: int = 3) -> LDAPService:
+    """LDAPService backed by a MOCK_SYNC directory with ``users`` accounts."""
+    service = LDAPService(client_strategy=MOCK_SYNC)
+    config = service.config
+    config.enabled = True
+    config.server = "bench-dc"
+    config.server_list = ["bench-dc"]
+    config.bind_dn = SERVICE_DN
+    config.bind_password = "svcpass"
+    config.search_base = SEARCH_BASE
+    config.admin_groups = ["Group0"]
+    config.allowed_groups = []
+
+    group_dns = [f"CN=Group{g},OU=Groups,{SEARCH_BASE}" for g in range(groups)]
+    members: Dict[str, List[str]] = {dn: [] for dn in group_dns}
+
+    seed = service._create_connection(server=service._get_server_pool().ordered()[0])
+    seed.strategy.add_entry(SEARCH_BASE, {"objectClass": "domain", "dc": "bench"})
+    seed.strategy.add_entry(SERVICE_DN, {"objectClass": "person", "userPassword": "svcpass"})
+    for i in range(users):
+        user_dn = f"CN=User{i},OU=Users,{SEARCH_BASE}"
+        member_of = [group_dns[(i + k) % groups] for k in range(min(groups_per_user, groups))]
+        for dn in member_of:
+            members[dn].append(user_dn)
+        seed.strategy.add_entry(user_dn, {
+            "objectClass": "person",
+            "userPassword": LDAP_PASSWORD,
+            "sAMAccountName": f"user{i}",
+            "mail": f"user{i}@bench.local",
+            "displayName": f"Bench User {i}",
+            "memberOf": member_of,
+        })
+    for g, dn in enumerate(group_dns):
+        seed.strategy.add_entry(dn, {"objectClass": "group", "cn": f"Group{g}", "member": members[dn]})
+    return service
+
+
+def setup_database(workdir: Path, concurrency: int):
+    """File-backed SQLite database with one local user; overrides the session dependencies."""
+    url = f"sqlite:///{workdir / 'bench.db'}"
+    # Every in-flight request holds a session, so size the pool to match
+    settings.DATABASE_POOL_SIZE = max(5, concurrency)
+    engine = build_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(
+            email=LOCAL_EMAIL,
+            hashed_password=get_password_hash(LOCAL_PASSWORD),
+            full_name="Bench User",
+            is_active=True,
+        ))
+        session.commit()
+
+    async_engine = build_async_engine(url)
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    return engine
+
+
+def issue_credentials(client: TestClient) -> Dict[str, str]:
+    """Log the local user in and mint a PAT; returns bearer tokens by path."""
+    response = client.post("/api/auth/login", data={"username": LOCAL_EMAIL, "password": LOCAL_PASSWORD})
+    response.raise_for_status()
+    jwt = response.json()["access_token"]
+    response = client.post(
+        "/api/users/me/tokens",
+        json={"name": "bench", "scopes": "read"},
+        headers={"Authorization": f"Bearer {jwt}"},
+    )
+    response.raise_for_status()
+    return {"jwt": jwt, "pat": response.json()["token"]}
+
+
+def request_for(path: str, credentials: Dict[str, str], ldap_active: int) -> Callable[[int], dict]:
+    """Return a factory producing ``client.request`` kwargs for the i-th call."""
+    if path in TOKEN_ROUTES:
+        headers = {"Authorization": f"Bearer {credentials[path.split('-')[0]]}"}
+        url = TOKEN_ROUTES[path]
+        return lambda i: {"method": "GET", "url": url, "headers": headers}
+    if path == "password":
+        form = {"username": LOCAL_EMAIL, "password": LOCAL_PASSWORD}
+        return lambda i: {"method": "POST", "url": "/api/auth/login", "data": form}
+    return lambda i: {
+        "method": "POST",
+        "url": "/api/auth/login",
+        "data": {"username": f"user{i % ldap_active}", "password": LDAP_PASSWORD},
+    }
+
+
+def bench_path(
+    path: str,
+    make_request: Callable[[int], dict],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> List[dict]:
+    client = TestClient(app)
+    for i in range(warmup):
+        client.request(**make_request(i)).raise_for_status()
+
+    counter = iter(range(10**9))
+
+    def sync_call():
+        client.request(**make_request(next(counter))).raise_for_status()
+
+    rows = [{"name": path, "client": "sync", **run_sync(sync_call, requests)}]
+
+    async_client = httpx.AsyncClient(app=app, base_url="http://bench")
+
+    async def async_call():
+        response = await async_client.request(**make_request(next(counter)))
+        response.raise_for_status()
+
+    try:
+        rows.append({"name": path, "client": "async", **run_async(async_call, requests, concurrency)})
+    finally:
+        asyncio.run(async_client.aclose())
+    return rows
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+    parser.add_argument("--requests", type=int, default=500, help="Requests per path and client")
+    parser.add_argument("--password-requests", type=int, default=50,
+                        help="Requests for the password path (each one runs a full Argon2 verify)")
+    parser.add_argument("--concurrency", type=int, default=16, help="In-flight requests for the async client")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--ldap-users", type=int, default=5000)
+    parser.add_argument("--ldap-groups", type=int, default=500)
+    parser.add_argument("--ldap-active", type=int, default=200,
+                        help="Distinct directory users cycled through by LDAP logins")
+    parser.add_argument("--json", action="store_true", help="Emit JSON lines instead of a table")
+    args = parser.parse_args(argv)
+
+    original_ldap_enabled = settings.LDAP_ENABLED
+    original_ldap_service = ldap_module.ldap_service
+    rows: List[dict] = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = setup_database(Path(workdir), args.concurrency)
+        try:
+            settings.LDAP_ENABLED = False
+            credentials = issue_credentials(TestClient(app))
+
+            for path in args.paths:
+                clear_auth_caches()
+                if path == "ldap":
+                    settings.LDAP_ENABLED = True
+                    ldap_module.ldap_service = build_directory(args.ldap_users, args.ldap_groups)
+                    warmup = max(args.warmup, min(args.ldap_active, args.ldap_users))
+                else:
+                    settings.LDAP_ENABLED = False
+                    warmup = args.warmup
+                make_request = request_for(path, credentials, min(args.ldap_active, args.ldap_users))
+                requests = args.password_requests if path == "password" else args.requests
+                rows.extend(bench_path(path, make_request, requests, args.concurrency, warmup))
+        finally:
+            if ldap_module.ldap_service is not original_ldap_service:
+                ldap_module.ldap_service.reset_pool()
+            ldap_module.ldap_service = original_ldap_service
+            settings.LDAP_ENABLED = original_ldap_enabled
+            app.dependency_overrides.pop(get_session, None)
+            app.dependency_overrides.pop(get_async_session, None)
+            engine.dispose()
+
+    report(rows, as_json=args.json)
+
+
+if __name__ == "__main__":
+    main()
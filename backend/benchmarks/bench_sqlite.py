@@ -0,0 +1,160 @@
+"""
+SQLite write-throughput benchmark.
+
+Runs a mixed webhook workload against a file-backed SQLite database from
+many threads and compares three setups:
+
+- ``default``: plain engine, every request session commits on its own
+- ``tuned``: ``SQLITE_TUNED`` pragmas (WAL, synchronous=NORMAL, busy_timeout, ...)
+- ``tuned+lane``: tuned pragmas plus the single-writer lane with group commit
+
+Each request ingests a Jenkins webhook (event + agent/tool/tag links) and
+touches a PAT's ``last_used_at``, while ``--readers`` threads list recent
+events at a steady pace. Errors are mostly "database is locked".
+
+Usage (from backend/)::
+
+    python -m benchmarks.bench_sqlite
+    python -m benchmarks.bench_sqlite --requests 2000 --concurrency 32 --json
+"""
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import update
+from sqlmodel import Session, SQLModel, select
+
+from app.api.webhooks import JenkinsWebhookPayload, _ingest_jenkins
+from app.core.config import settings
+from app.core.database import build_engine
+from app.core.write_lane import WriteLane
+from app.models.event import Event
+from app.models.token import PersonalAccessToken
+from app.models.user import User
+
+from benchmarks.harness import report, run_threads
+
+PROFILES = ("default", "tuned", "tuned+lane")
+
+
+def _prepare(engine) -> int:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(email="bench@example.com", hashed_password="x", full_name="Bench")
+        session.add(user)
+        session.flush()
+        token = PersonalAccessToken(user_id=user.id, name="bench", token_hash="bench", scopes="read")
+        session.add(token)
+        session.commit()
+        return token.id
+
+
+def _workload(token_id: int, agents: int):
+    counter = iter(range(10**9))
+    lock = threading.Lock()
+
+    def write(session: Session) -> int:
+        with lock:
+            n = next(counter)
+        payload = JenkinsWebhookPayload(
+            job_name=f"job-{n % 50}",
+            build_number=n,
+            status="FAILURE" if n % 7 == 0 else "SUCCESS",
+            agent=f"agent-{n % agents}",
+            tools=[{"name": "python", "version": "3.11"}],
+            tags=["bench"],
+        )
+        event_id = _ingest_jenkins(session, payload)
+        session.execute(
+            update(PersonalAccessToken)
+            .where(PersonalAccessToken.id == token_id)
+            .values(last_used_at=datetime.utcnow())
+        )
+        session.commit()
+        return event_id
+
+    return write
+
+
+def bench_profile(profile: str, workdir: Path, args) -> List[dict]:
+    settings.SQLITE_TUNED = profile != "default"
+    engine = build_engine(f"sqlite:///{workdir / (profile.replace('+', '_') + '.db')}")
+    token_id = _prepare(engine)
+    write = _workload(token_id, args.agents)
+    lane = WriteLane(engine, max_batch=settings.SQLITE_WRITE_BATCH_MAX,
+                     max_wait=settings.SQLITE_WRITE_BATCH_WAIT_MS / 1000) if profile.endswith("lane") else None
+
+    def write_request():
+        if lane is not None:
+            lane.run(write)
+            return
+        with Session(engine) as session:
+            write(session)
+
+    stop = threading.Event()
+    reads = 0
+
+    def reader():
+        nonlocal reads
+        while not stop.is_set():
+            try:
+                with Session(engine) as session:
+                    session.exec(select(Event).order_by(Event.timestamp.desc()).limit(50)).all()
+                reads += 1
+            except Exception:
+                pass
+            stop.wait(args.read_interval_ms / 1000)
+
+    readers = [threading.Thread(target=reader, daemon=True) for _ in range(args.readers)]
+    for thread in readers:
+        thread.start()
+    try:
+        result = run_threads(write_request, args.requests, args.concurrency)
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join()
+        if lane is not None:
+            lane.stop()
+        engine.dispose()
+
+    return [{
+        "name": profile,
+        "client": "threads",
+        **result,
+        "reads_per_s": round(reads / result["elapsed_s"], 1) if result["elapsed_s"] else 0.0,
+    }]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES))
+    parser.add_argument("--requests", type=int, default=1000, help="Webhook writes per profile")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent writer threads")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads")
+    parser.add_argument("--read-interval-ms", type=float, default=5,
+                        help="Pause between reads per reader (0 = saturate; starves writers of the GIL)")
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Emit JSON lines instead of a table")
+    args = parser.parse_args(argv)
+
+    settings.DATABASE_POOL_SIZE = args.concurrency + args.readers + 1
+    original_tuned = settings.SQLITE_TUNED
+    rows: List[dict] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            for profile in args.profiles:
+                rows.extend(bench_profile(profile, Path(workdir), args))
+        finally:
+            settings.SQLITE_TUNED = original_tuned
+
+    report(rows, as_json=args.json)
+    if not args.json:
+        print("reads/s:", ", ".join(f"{r['name']}={r['reads_per_s']}" for r in rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Worker cold-start benchmark.
+
+Every sample runs in a fresh interpreter (as a new uvicorn/gunicorn worker
+would) against a temporary SQLite database and times:
+
+- ``import``: ``import app.main``
+- ``startup``: the FastAPI lifespan up to ``yield`` (schema check, admin seed,
+  background task start)
+
+The first sample boots an empty database (schema created), the rest boot an
+existing one. A ``python -X importtime`` run then attributes import time to
+top-level packages and lists which optional heavy dependencies (LDAP, JWT,
+password hashing) were loaded eagerly.
+
+Exits non-zero when the median cold start exceeds ``--budget-ms``, so it can
+gate CI.
+
+Usage (from backend/)::
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --samples 10 --budget-ms 1500 --top 15
+    python -m benchmarks.bench_startup --json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+from app.core.metrics import summarize
+
+from benchmarks.harness import report
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+LAZY_MODULES = ("ldap3", "jose", "passlib", "argon2", "alembic")
+
+CHILD = """
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+loaded = [name for name in %r if name in sys.modules]
+
+async def boot():
+    async with app.main.lifespan(app.main.app):
+        return time.perf_counter()
+
+t2 = asyncio.run(boot())
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "startup_ms": (t2 - t1) * 1000,
+    "loaded": loaded,
+}))
+""" % (LAZY_MODULES,)
+
+
+def _env(database: Path) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{database}",
+        "JENKINS_POLL_ENABLED": "false",
+        "RETENTION_ENABLED": "false",
+        "SEED_SAMPLE_DATA": "false",
+    })
+    return env
+
+
+def cold_start(database: Path) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=BACKEND_DIR, env=_env(database),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_breakdown(database: Path) -> Dict[str, float]:
+    """Self import time (ms) summed per top-level package."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=BACKEND_DIR, env=_env(database),
+        capture_output=True, text=True, check=True,
+    )
+    totals: Dict[str, float] = defaultdict(float)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us) / 1000
+    return dict(totals)
+
+
+def _row(name: str, totals: List[float]) -> dict:
+    summary = summarize(totals)
+    return {
+        "name": name,
+        "client": "subprocess",
+        "requests": summary["count"],
+        **{f"{key}_ms": summary[key] for key in ("p50", "p95", "p99", "max")},
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--samples", type=int, default=5, help="Cold starts to time (first one on an empty database)")
+    parser.add_argument("--budget-ms", type=float, default=2000, help="Fail if the median import+startup exceeds this")
+    parser.add_argument("--top", type=int, default=10, help="Packages to list in the import breakdown")
+    parser.add_argument("--json", action="store_true", help="Emit JSON lines instead of a table")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database = Path(workdir) / "startup.db"
+        samples = [cold_start(database) for _ in range(args.samples)]
+        breakdown = import_breakdown(database)
+
+    totals: List[float] = [s["import_ms"] + s["startup_ms"] for s in samples]
+    rows = [_row("empty database", totals[:1]), _row("existing database", totals[1:] or totals[:1])]
+    median = summarize(totals)["p50"]
+    loaded = sorted({name for s in samples for name in s["loaded"]})
+    top = sorted(breakdown.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    if args.json:
+        report(rows, as_json=True)
+        print(json.dumps({"median_ms": median, "budget_ms": args.budget_ms, "loaded": loaded, "imports_ms": dict(top)}))
+    else:
+        report(rows, as_json=False)
+        print(f"import {summarize([s['import_ms'] for s in samples])['p50']:.0f} ms, "
+              f"startup {summarize([s['startup_ms'] for s in samples])['p50']:.0f} ms (medians)")
+        print("slowest imports (self ms by package):")
+        for name, ms in top:
+            print(f"  {name:<24} {ms:8.1f}")
+        print("lazy dependencies loaded by import:", ", ".join(loaded) or "none")
+        print(f"median cold start {median:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    if median > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
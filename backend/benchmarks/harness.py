@@ -0,0 +1,103 @@
+"""Shared timing and reporting helpers for the benchmark scripts."""
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List
+
+from app.core.metrics import summarize
+
+
+def run_sync(operation: Callable[[], Any], requests: int) -> Dict[str, Any]:
+    """Call ``operation`` sequentially ``requests`` times and time each call."""
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        operation()
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return _result(latencies, time.perf_counter() - started, concurrency=1)
+
+
+def run_async(
+    operation: Callable[[], Awaitable[Any]],
+    requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """Await ``operation`` ``requests`` times with at most ``concurrency`` in flight."""
+
+    async def _main() -> Dict[str, Any]:
+        latencies: List[float] = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one():
+            async with semaphore:
+                t0 = time.perf_counter()
+                await operation()
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_one() for _ in range(requests)))
+        return _result(latencies, time.perf_counter() - started, concurrency=concurrency)
+
+    return asyncio.run(_main())
+
+
+def run_threads(operation: Callable[[], Any], requests: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Call ``operation`` ``requests`` times from ``concurrency`` threads.
+
+    Exceptions are counted as errors (their latency is not sampled) so
+    contention failures such as "database is locked" show up in the report.
+    """
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def _one(_):
+        nonlocal errors
+        t0 = time.perf_counter()
+        try:
+            operation()
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        with lock:
+            latencies.append(elapsed_ms)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(_one, range(requests)))
+    return _result(latencies, time.perf_counter() - started, concurrency=concurrency, errors=errors)
+
+
+def _result(latencies: List[float], elapsed: float, concurrency: int, errors: int = 0) -> Dict[str, Any]:
+    summary = summarize(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": summary["p50"],
+        "p95_ms": summary["p95"],
+        "p99_ms": summary["p99"],
+        "max_ms": summary["max"],
+    }
+
+
+def report(rows: List[Dict[str, Any]], as_json: bool = False) -> None:
+    """Print benchmark rows as an aligned table (or JSON lines)."""
+    if as_json:
+        for row in rows:
+            print(json.dumps(row))
+        return
+
+    columns = ["name", "client", "requests", "errors", "concurrency", "rps", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns))
@@ -0,0 +1,54 @@
+"""
+Multi-process launcher for CI Ledger.
+
+Prepares the database once (schema check, partitions, admin user) and then
+starts uvicorn with several worker processes. Pollers and scheduled jobs run
+in exactly one of them, chosen by leader election:
+
+- with ``--workers`` > 1 and ``LEADER_ELECTION=none`` the launcher switches
+  the workers to ``file`` (a lock file on this host);
+- for several hosts behind a load balancer set ``LEADER_ELECTION=database``
+  (or ``--leader-election database``) on every host.
+
+Usage (from backend/)::
+
+    python serve.py --workers 4
+    python serve.py --workers 8 --port 8080 --leader-election database
+"""
+import argparse
+import logging
+import os
+
+logger = logging.getLogger("serve")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--leader-election", choices=("none", "file", "database"),
+                        help="Override LEADER_ELECTION for the workers")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    from app.core.config import settings
+
+    leader_election = args.leader_election or settings.LEADER_ELECTION
+    if args.workers > 1 and leader_election == "none":
+        leader_election = "file"
+        logger.info("Using LEADER_ELECTION=file (%s) so one of %d workers runs background jobs",
+                    settings.LEADER_LOCK_FILE, args.workers)
+    # Workers are fresh interpreters and read their settings from the environment
+    os.environ["LEADER_ELECTION"] = leader_election
+
+    # Once, before forking: avoids workers racing to create the schema or the admin user
+    from app.main import prepare_app_database
+    prepare_app_database()
+
+    import uvicorn
+    uvicorn.run("app.main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()